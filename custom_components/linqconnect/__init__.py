@@ -8,26 +8,49 @@ from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import Platform
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
+import homeassistant.helpers.config_validation as cv
+from homeassistant.helpers.typing import ConfigType
 
 from .api import LinqConnectApiClient
+from .broker import async_get_broker
 from .const import (
     CONF_BUILDING_ID,
+    CONF_CACHE_MAX_AGE,
+    CONF_CALENDAR_DAYS,
+    CONF_CALENDAR_LINE_BREAK,
     CONF_DISTRICT_ID,
     CONF_MENU_PLANS,
+    CONF_RAW_RETENTION,
     CONF_UPDATE_INTERVAL,
+    DATA_BROKER,
+    DEFAULT_CACHE_MAX_AGE,
+    DEFAULT_CALENDAR_DAYS,
+    DEFAULT_CALENDAR_LINE_BREAK,
+    DEFAULT_RAW_RETENTION,
     DEFAULT_UPDATE_INTERVAL,
     DOMAIN,
 )
 from .coordinator import LinqConnectDataUpdateCoordinator
+from .services import async_setup_services
+from .store import LinqConnectMenuStore, build_cache_key
 
 _LOGGER = logging.getLogger(__name__)
 
 PLATFORMS: list[Platform] = [Platform.SENSOR, Platform.CALENDAR]
 
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
+
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    """Set up the LinqConnect services."""
+    async_setup_services(hass)
+    return True
+
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up LinqConnect from a config entry."""
     hass.data.setdefault(DOMAIN, {})
+    broker = async_get_broker(hass)
 
     district_id = entry.data[CONF_DISTRICT_ID]
     building_id = entry.data[CONF_BUILDING_ID]
@@ -35,6 +58,7 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     update_interval = entry.options.get(
         CONF_UPDATE_INTERVAL, DEFAULT_UPDATE_INTERVAL
     )
+    cache_max_age = entry.options.get(CONF_CACHE_MAX_AGE, DEFAULT_CACHE_MAX_AGE)
 
     session = async_get_clientsession(hass)
     client = LinqConnectApiClient(
@@ -48,10 +72,29 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         client=client,
         update_interval=timedelta(minutes=update_interval),
         selected_menu_plans=selected_menu_plans,
+        store=LinqConnectMenuStore(
+            hass,
+            entry.entry_id,
+            build_cache_key(district_id, building_id, selected_menu_plans),
+        ),
+        cache_max_age=timedelta(hours=cache_max_age),
+        raw_retention=entry.options.get(CONF_RAW_RETENTION, DEFAULT_RAW_RETENTION),
+        line_break=entry.options.get(
+            CONF_CALENDAR_LINE_BREAK, DEFAULT_CALENDAR_LINE_BREAK
+        ),
+        broker=broker,
+        fetch_days=entry.options.get(CONF_CALENDAR_DAYS, DEFAULT_CALENDAR_DAYS),
     )
+    entry.async_on_unload(broker.async_register(coordinator))
 
-    # Fetch initial data
-    await coordinator.async_config_entry_first_refresh()
+    # Serve cached menus right away and refresh in the background; only block
+    # on the API when there is nothing usable on disk
+    if await coordinator.async_load_cache():
+        entry.async_create_background_task(
+            hass, coordinator.async_refresh(), f"{DOMAIN} initial refresh"
+        )
+    else:
+        await coordinator.async_config_entry_first_refresh()
 
     hass.data[DOMAIN][entry.entry_id] = coordinator
 
@@ -60,14 +103,6 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     # Register update listener for options changes
     entry.async_on_unload(entry.add_update_listener(async_reload_entry))
 
-    # Register force update service
-    async def async_force_update(call):
-        """Handle force update service call."""
-        _LOGGER.info("Force update requested")
-        await coordinator.async_request_refresh()
-
-    hass.services.async_register(DOMAIN, "force_update", async_force_update)
-
     return True
 
 
@@ -76,10 +111,24 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     if unload_ok := await hass.config_entries.async_unload_platforms(entry, PLATFORMS):
         hass.data[DOMAIN].pop(entry.entry_id)
 
+        # The broker unregisters coordinators through entry.async_on_unload,
+        # which runs after this returns, so check for other entries instead
+        if not any(
+            other.entry_id in hass.data[DOMAIN]
+            for other in hass.config_entries.async_entries(DOMAIN)
+        ):
+            hass.data[DOMAIN].pop(DATA_BROKER, None)
+
     return unload_ok
 
 
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove the menu cache when a config entry is deleted."""
+    await LinqConnectMenuStore(hass, entry.entry_id, "").async_remove()
+
+
 async def async_reload_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
     """Reload config entry."""
-    await async_unload_entry(hass, entry)
-    await async_setup_entry(hass, entry)
+    # Reloading through the config entries runs the entry's unload callbacks,
+    # which remove the old coordinator's listeners and broker registration
+    await hass.config_entries.async_reload(entry.entry_id)
@@ -2,17 +2,174 @@
 from __future__ import annotations
 
 import asyncio
-from datetime import datetime, timedelta
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+import hashlib
+from http import HTTPStatus
 import logging
-from typing import Any
+import random
+from time import monotonic
+from typing import Any, Callable, NamedTuple
 
 import aiohttp
 import async_timeout
 
-from .const import API_FAMILY_MENU
+try:
+    from orjson import loads as default_json_loads
+except ImportError:  # pragma: no cover - orjson ships with Home Assistant
+    from json import loads as default_json_loads
+
+from .const import (
+    API_FAMILY_MENU,
+    CIRCUIT_FAILURE_THRESHOLD,
+    CIRCUIT_RESET_TIMEOUT,
+    DECODE_EXECUTOR_MIN_BYTES,
+    DEFAULT_CALENDAR_DAYS,
+    MAX_RETRIES,
+    REQUEST_TIMEOUT,
+    RETRY_BACKOFF_BASE,
+    RETRY_BACKOFF_MAX,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
+JsonLoads = Callable[[bytes], Any]
+
+# FamilyMenu fields the coordinator consumes. Keys map to the fields to keep
+# inside that value (applied to every element of a list), None keeps the value
+# as-is. Everything else is dropped as soon as the response is decoded.
+FAMILY_MENU_FIELDS: dict[str, Any] = {
+    "FamilyMenuSessions": {
+        "ServingSession": None,
+        "ServingSessionId": None,
+        "ServingSessionKey": None,
+        "MenuPlans": {
+            "MenuPlanName": None,
+            "Days": {
+                "Date": None,
+                "MenuMeals": {
+                    "MenuMealName": None,
+                    "Name": None,
+                    "RecipeCategories": {
+                        "CategoryName": None,
+                        "Recipes": {
+                            "RecipeName": None,
+                            "ServingSize": None,
+                            "RecipeIdentifier": None,
+                            "Nutrients": {"Name": None, "Value": None, "Unit": None},
+                            "Allergens": None,
+                            "DietaryRestrictions": None,
+                            "ReligiousRestrictions": None,
+                        },
+                    },
+                },
+            },
+        },
+    },
+}
+
+
+def project_fields(value: Any, fields: dict[str, Any] | None) -> Any:
+    """Return value reduced to the given field tree."""
+    if fields is None:
+        return value
+    if isinstance(value, list):
+        return [project_fields(item, fields) for item in value]
+    if isinstance(value, dict):
+        return {
+            key: project_fields(value[key], subfields)
+            for key, subfields in fields.items()
+            if key in value
+        }
+    return value
+
+
+@dataclass(slots=True)
+class MenuResponse:
+    """A decoded FamilyMenu response.
+
+    When not_modified is set the menus are unchanged since the previous
+    response passed to the request, and data is None.
+    """
+
+    data: dict[str, Any] | None
+    sha256: str
+    size: int
+    etag: str | None = None
+    last_modified: str | None = None
+    not_modified: bool = False
+
+
+class _RawResponse(NamedTuple):
+    """Undecoded response body and cache validators."""
+
+    status: int
+    body: bytes
+    etag: str | None
+    last_modified: str | None
+
+
+class CircuitBreaker:
+    """Stop calling an API that keeps failing until it has had time to recover.
+
+    The circuit opens after failure_threshold consecutive failed requests.
+    While open, requests fail immediately. Once reset_timeout has passed the
+    circuit is half open: a single trial request is let through, closing the
+    circuit on success and reopening it on failure, and other requests keep
+    failing until it finishes.
+    """
+
+    def __init__(self, failure_threshold: int, reset_timeout: float) -> None:
+        """Initialize the circuit breaker."""
+        self._failure_threshold = failure_threshold
+        self._reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at: float | None = None
+        self._trial_pending = False
+
+    @property
+    def is_open(self) -> bool:
+        """Return True if requests are currently being refused."""
+        return self._opened_at is not None and (
+            self._trial_pending
+            or monotonic() - self._opened_at < self._reset_timeout
+        )
+
+    def before_request(self) -> bool:
+        """Raise CircuitOpenError if requests are currently being refused.
+
+        Returns True for the trial request of a half open circuit, which
+        must be passed to after_request once it has finished.
+        """
+        if self.is_open:
+            raise CircuitOpenError("LinqConnect API is unavailable, not retrying yet")
+        if self._opened_at is None:
+            return False
+        self._trial_pending = True
+        return True
+
+    def after_request(self, trial: bool) -> None:
+        """Let another trial request through once a trial has finished."""
+        if trial:
+            self._trial_pending = False
+
+    def record_success(self) -> None:
+        """Close the circuit after a successful request."""
+        self._failures = 0
+        self._opened_at = None
+
+    def record_failure(self) -> None:
+        """Count a failed request, opening the circuit at the threshold."""
+        self._failures += 1
+        if self._failures >= self._failure_threshold:
+            if self._opened_at is None:
+                _LOGGER.warning(
+                    "LinqConnect API failed %d times in a row, pausing requests for %s",
+                    self._failures,
+                    timedelta(seconds=self._reset_timeout),
+                )
+            self._opened_at = monotonic()
+
 
 class LinqConnectApiClient:
     """API client for LinqConnect school menus."""
@@ -22,22 +179,141 @@ class LinqConnectApiClient:
         district_id: str,
         building_id: str,
         session: aiohttp.ClientSession,
+        json_loads: JsonLoads = default_json_loads,
+        api_url: str = API_FAMILY_MENU,
+        timeout: float = REQUEST_TIMEOUT,
+        max_retries: int = MAX_RETRIES,
+        backoff_base: float = RETRY_BACKOFF_BASE,
+        backoff_max: float = RETRY_BACKOFF_MAX,
+        circuit_breaker: CircuitBreaker | None = None,
     ) -> None:
-        """Initialize the API client."""
+        """Initialize the API client.
+
+        Timeouts, connection errors, 429 and 5xx responses are retried up to
+        max_retries times with exponential backoff and full jitter.
+        """
         self._district_id = district_id
         self._building_id = building_id
         self._session = session
+        self._json_loads = json_loads
+        self._api_url = api_url
+        self._timeout = timeout
+        self._max_retries = max_retries
+        self._backoff_base = backoff_base
+        self._backoff_max = backoff_max
+        self._circuit_breaker = circuit_breaker or CircuitBreaker(
+            CIRCUIT_FAILURE_THRESHOLD, CIRCUIT_RESET_TIMEOUT.total_seconds()
+        )
+
+    @property
+    def district_id(self) -> str:
+        """Return the district ID."""
+        return self._district_id
+
+    @property
+    def building_id(self) -> str:
+        """Return the building ID."""
+        return self._building_id
+
+    @property
+    def circuit_open(self) -> bool:
+        """Return True if requests are paused after repeated failures."""
+        return self._circuit_breaker.is_open
 
     async def async_get_menu(
         self,
-        start_date: datetime | None = None,
-        end_date: datetime | None = None,
+        start_date: date | None = None,
+        end_date: date | None = None,
+        project: bool = False,
     ) -> dict[str, Any]:
         """Get menu data from the API."""
+        response = await self.async_fetch_menu(start_date, end_date, project=project)
+        return response.data
+
+    async def async_fetch_menu(
+        self,
+        start_date: date | None = None,
+        end_date: date | None = None,
+        project: bool = False,
+        previous: MenuResponse | None = None,
+    ) -> MenuResponse:
+        """Fetch menu data along with a digest of the response body.
+
+        With project set, only the fields listed in FAMILY_MENU_FIELDS are
+        returned so the rest of the decoded payload can be freed immediately.
+
+        Given the previous response for the same window, the request is made
+        conditional on its ETag or Last-Modified when the server sent them.
+        A 304, or a body with the same digest, returns a not_modified
+        response without decoding anything.
+        """
+        headers = {}
+        if previous is not None:
+            if previous.etag:
+                headers["If-None-Match"] = previous.etag
+            if previous.last_modified:
+                headers["If-Modified-Since"] = previous.last_modified
+
+        raw = await self._async_request(start_date, end_date, headers)
+
+        if previous is not None and (
+            raw.status == HTTPStatus.NOT_MODIFIED
+            or hashlib.sha256(raw.body).hexdigest() == previous.sha256
+        ):
+            _LOGGER.debug("Menu data unchanged since the previous fetch")
+            return MenuResponse(
+                data=None,
+                sha256=previous.sha256,
+                size=previous.size,
+                etag=raw.etag or previous.etag,
+                last_modified=raw.last_modified or previous.last_modified,
+                not_modified=True,
+            )
+
+        try:
+            if len(raw.body) >= DECODE_EXECUTOR_MIN_BYTES:
+                # Keep large responses from blocking the event loop
+                data = await asyncio.get_running_loop().run_in_executor(
+                    None, self._decode, raw.body, project
+                )
+            else:
+                data = self._decode(raw.body, project)
+        except Exception as exception:
+            _LOGGER.error("Unexpected error decoding menu data: %s", exception)
+            raise ApiClientError("Unexpected error") from exception
+
+        _LOGGER.debug("Successfully fetched menu data (%d bytes)", len(raw.body))
+        return MenuResponse(
+            data=data,
+            sha256=hashlib.sha256(raw.body).hexdigest(),
+            size=len(raw.body),
+            etag=raw.etag,
+            last_modified=raw.last_modified,
+        )
+
+    def _decode(self, body: bytes, project: bool) -> Any:
+        """Decode a response body, keeping only the projected fields if asked.
+
+        Projection copies the kept fields out of the fully decoded payload.
+        That shrinks what stays resident once the payload is freed, but the
+        peak while decoding is the full payload plus the projected copy.
+        """
+        data = self._json_loads(body)
+        if project:
+            data = project_fields(data, FAMILY_MENU_FIELDS)
+        return data
+
+    async def _async_request(
+        self,
+        start_date: date | None,
+        end_date: date | None,
+        headers: dict[str, str] | None = None,
+    ) -> _RawResponse:
+        """Request menus for a date range and return the undecoded response."""
         if start_date is None:
             start_date = datetime.now()
         if end_date is None:
-            end_date = start_date + timedelta(days=30)
+            end_date = start_date + timedelta(days=DEFAULT_CALENDAR_DAYS)
 
         params = {
             "districtId": self._district_id,
@@ -46,36 +322,84 @@ class LinqConnectApiClient:
             "endDate": end_date.strftime("%-m-%-d-%Y"),
         }
 
+        trial = self._circuit_breaker.before_request()
         try:
-            async with async_timeout.timeout(10):
-                response = await self._session.get(
-                    API_FAMILY_MENU,
-                    params=params,
+            return await self._async_request_with_retries(params, headers)
+        finally:
+            self._circuit_breaker.after_request(trial)
+
+    async def _async_request_with_retries(
+        self, params: dict[str, str], headers: dict[str, str] | None
+    ) -> _RawResponse:
+        """Make a request, retrying transient failures with backoff."""
+        cause: Exception | None = None
+        for attempt in range(self._max_retries + 1):
+            if attempt:
+                delay = random.uniform(
+                    0, min(self._backoff_max, self._backoff_base * 2 ** (attempt - 1))
                 )
-                response.raise_for_status()
-                data = await response.json()
-                _LOGGER.debug("Successfully fetched menu data")
-                return data
-        except asyncio.TimeoutError as exception:
-            _LOGGER.error("Timeout error fetching menu data: %s", exception)
-            raise ApiClientError("Timeout connecting to LinqConnect API") from exception
-        except aiohttp.ClientError as exception:
-            _LOGGER.error("Error fetching menu data: %s", exception)
-            raise ApiClientError("Error connecting to LinqConnect API") from exception
-        except Exception as exception:
-            _LOGGER.error("Unexpected error fetching menu data: %s", exception)
-            raise ApiClientError("Unexpected error") from exception
+                _LOGGER.debug(
+                    "Retrying menu request in %.1f s (%d of %d): %s",
+                    delay,
+                    attempt,
+                    self._max_retries,
+                    cause,
+                )
+                await asyncio.sleep(delay)
+
+            try:
+                async with async_timeout.timeout(self._timeout):
+                    response = await self._session.get(
+                        self._api_url,
+                        params=params,
+                        headers=headers,
+                    )
+                    response.raise_for_status()
+                    raw = _RawResponse(
+                        response.status,
+                        await response.read(),
+                        response.headers.get("ETag"),
+                        response.headers.get("Last-Modified"),
+                    )
+            except asyncio.TimeoutError as exception:
+                cause = exception
+                error = ApiClientError("Timeout connecting to LinqConnect API")
+            except aiohttp.ClientResponseError as exception:
+                if not _is_retryable_status(exception.status):
+                    # The API answered, so this doesn't count against the circuit
+                    _LOGGER.error("Error fetching menu data: %s", exception)
+                    raise ApiClientError(
+                        f"LinqConnect API returned {exception.status}"
+                    ) from exception
+                cause = exception
+                error = ApiClientError("Error connecting to LinqConnect API")
+            except aiohttp.ClientError as exception:
+                cause = exception
+                error = ApiClientError("Error connecting to LinqConnect API")
+            except Exception as exception:
+                _LOGGER.error("Unexpected error fetching menu data: %s", exception)
+                raise ApiClientError("Unexpected error") from exception
+            else:
+                self._circuit_breaker.record_success()
+                return raw
+
+        self._circuit_breaker.record_failure()
+        _LOGGER.error(
+            "Error fetching menu data after %d attempts: %s",
+            self._max_retries + 1,
+            cause,
+        )
+        raise error from cause
 
-    async def async_validate_credentials(self) -> bool:
-        """Validate that the district and building IDs are valid."""
-        try:
-            # Try to fetch a small date range to validate credentials
-            end_date = datetime.now() + timedelta(days=1)
-            await self.async_get_menu(end_date=end_date)
-            return True
-        except ApiClientError:
-            return False
+
+def _is_retryable_status(status: int) -> bool:
+    """Return True if a response status indicates a transient failure."""
+    return status == 429 or status >= 500
 
 
 class ApiClientError(Exception):
     """Exception to indicate a general API error."""
+
+
+class CircuitOpenError(ApiClientError):
+    """Exception to indicate requests are paused after repeated failures."""
@@ -0,0 +1,214 @@
+"""Shared menu fetching for LinqConnect config entries."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Iterable
+from datetime import date
+import logging
+from time import monotonic
+from typing import TYPE_CHECKING
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+
+from .api import LinqConnectApiClient, MenuResponse
+from .const import BROKER_RESULT_TTL, DATA_BROKER, DOMAIN
+
+if TYPE_CHECKING:
+    from .coordinator import LinqConnectDataUpdateCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+# (district ID, building ID)
+SchoolKey = tuple[str, str]
+# (district ID, building ID, start date, end date, projected, previous digest)
+FetchKey = tuple[str, str, date, date, bool, str | None]
+# (district ID, building ID, start date, end date)
+ForceKey = tuple[str, str, date | None, date | None]
+
+
+class LinqConnectFetchBroker:
+    """Coalesce menu fetches for the same school across config entries.
+
+    Several config entries can track the same district and building, for
+    example one per student. Identical requests that are in flight are
+    shared, results are reused for a short time, and entries for the same
+    school are nudged to refresh together so their polls line up.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the broker."""
+        self._hass = hass
+        self._inflight: dict[FetchKey, asyncio.Task[MenuResponse]] = {}
+        self._results: dict[FetchKey, tuple[float, MenuResponse]] = {}
+        self._coordinators: dict[
+            SchoolKey, set[LinqConnectDataUpdateCoordinator]
+        ] = {}
+        self._aligned_at: dict[SchoolKey, float] = {}
+        self._forced: dict[ForceKey, asyncio.Task[None]] = {}
+
+    @callback
+    def async_register(
+        self, coordinator: LinqConnectDataUpdateCoordinator
+    ) -> CALLBACK_TYPE:
+        """Register a coordinator for schedule alignment."""
+        school = _school_key(coordinator.client)
+        self._coordinators.setdefault(school, set()).add(coordinator)
+
+        @callback
+        def _unregister() -> None:
+            coordinators = self._coordinators.get(school)
+            if coordinators is None:
+                return
+            coordinators.discard(coordinator)
+            if not coordinators:
+                del self._coordinators[school]
+                self._aligned_at.pop(school, None)
+
+        return _unregister
+
+    async def async_fetch_menu(
+        self,
+        client: LinqConnectApiClient,
+        start_date: date,
+        end_date: date,
+        project: bool,
+        requester: LinqConnectDataUpdateCoordinator | None = None,
+        previous: MenuResponse | None = None,
+    ) -> MenuResponse:
+        """Fetch menus, sharing identical requests and recent results.
+
+        Conditional requests are only shared between callers holding the
+        same previous response, since a not modified result is relative to it.
+        """
+        key: FetchKey = (
+            client.district_id,
+            client.building_id,
+            start_date,
+            end_date,
+            project,
+            previous.sha256 if previous is not None else None,
+        )
+        now = monotonic()
+        self._results = {
+            result_key: result
+            for result_key, result in self._results.items()
+            if now - result[0] < BROKER_RESULT_TTL.total_seconds()
+        }
+        if (result := self._results.get(key)) is not None:
+            _LOGGER.debug("Reusing menu fetch for %s to %s", start_date, end_date)
+            return result[1]
+
+        if (task := self._inflight.get(key)) is None:
+            task = self._inflight[key] = self._hass.async_create_background_task(
+                self._async_fetch(key, client, requester, previous),
+                f"{DOMAIN} menu fetch {start_date} to {end_date}",
+            )
+        else:
+            _LOGGER.debug(
+                "Joining in-flight menu fetch for %s to %s", start_date, end_date
+            )
+
+        return await asyncio.shield(task)
+
+    async def async_force_refresh(
+        self,
+        coordinators: Iterable[LinqConnectDataUpdateCoordinator],
+        start_date: date | None = None,
+        end_date: date | None = None,
+    ) -> None:
+        """Refetch menus now for the schools of the given coordinators.
+
+        Every coordinator for a school is refreshed, as a fetch would align
+        them anyway, so each school is fetched once. Calls for a school and
+        date range that is already being refreshed wait for that refresh.
+        """
+        tasks = []
+        for school in dict.fromkeys(
+            _school_key(coordinator.client) for coordinator in coordinators
+        ):
+            key: ForceKey = (*school, start_date, end_date)
+            if (task := self._forced.get(key)) is None:
+                task = self._forced[key] = self._hass.async_create_background_task(
+                    self._async_force_refresh(key),
+                    f"{DOMAIN} forced refresh {school[0]}/{school[1]}",
+                )
+            else:
+                _LOGGER.debug("Joining forced refresh of %s/%s", *school)
+            tasks.append(task)
+
+        await asyncio.gather(*(asyncio.shield(task) for task in tasks))
+
+    async def _async_force_refresh(self, key: ForceKey) -> None:
+        """Refresh every coordinator for a school, bypassing recent results."""
+        school: SchoolKey = key[:2]
+        try:
+            self._results = {
+                result_key: result
+                for result_key, result in self._results.items()
+                if result_key[:2] != school
+            }
+            # All of them are refreshed here, so fetches need not align them
+            self._aligned_at[school] = monotonic()
+            await asyncio.gather(
+                *(
+                    coordinator.async_force_refresh(key[2], key[3])
+                    for coordinator in self._coordinators.get(school, ())
+                )
+            )
+        finally:
+            del self._forced[key]
+
+    async def _async_fetch(
+        self,
+        key: FetchKey,
+        client: LinqConnectApiClient,
+        requester: LinqConnectDataUpdateCoordinator | None,
+        previous: MenuResponse | None,
+    ) -> MenuResponse:
+        """Fetch menus from the API and share the result."""
+        try:
+            response = await client.async_fetch_menu(
+                key[2], key[3], project=key[4], previous=previous
+            )
+        finally:
+            del self._inflight[key]
+
+        self._results[key] = (monotonic(), response)
+        self._async_align(key[:2], requester)
+        return response
+
+    @callback
+    def _async_align(
+        self,
+        school: SchoolKey,
+        requester: LinqConnectDataUpdateCoordinator | None,
+    ) -> None:
+        """Ask the other coordinators for a school to refresh now.
+
+        Their refresh is served from the shared results and restarts their
+        update interval, so all entries for a school poll together.
+        """
+        now = monotonic()
+        aligned_at = self._aligned_at.get(school)
+        ttl = BROKER_RESULT_TTL.total_seconds()
+        if aligned_at is not None and now - aligned_at < ttl:
+            return
+        self._aligned_at[school] = now
+
+        for coordinator in self._coordinators.get(school, ()):
+            if coordinator is not requester:
+                self._hass.async_create_task(coordinator.async_request_refresh())
+
+
+def _school_key(client: LinqConnectApiClient) -> SchoolKey:
+    """Return the key identifying the school a client fetches menus for."""
+    return (client.district_id, client.building_id)
+
+
+@callback
+def async_get_broker(hass: HomeAssistant) -> LinqConnectFetchBroker:
+    """Return the fetch broker, creating it if needed."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    if (broker := domain_data.get(DATA_BROKER)) is None:
+        broker = domain_data[DATA_BROKER] = LinqConnectFetchBroker(hass)
+    return broker
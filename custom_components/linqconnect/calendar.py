@@ -1,25 +1,25 @@
 """Calendar platform for LinqConnect."""
 from __future__ import annotations
 
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 import logging
-from typing import Any
 
 from homeassistant.components.calendar import CalendarEntity, CalendarEvent
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
+from homeassistant.util import dt as dt_util
 
 from .const import (
     ATTRIBUTION,
     CONF_CALENDAR_LINE_BREAK,
     DEFAULT_CALENDAR_LINE_BREAK,
     DOMAIN,
-    SENSOR_BREAKFAST,
-    SENSOR_LUNCH,
 )
 from .coordinator import LinqConnectDataUpdateCoordinator
+from .entity import entry_device_info
+from .models import RenderedDay
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -31,13 +31,25 @@ async def async_setup_entry(
 ) -> None:
     """Set up LinqConnect calendar based on a config entry."""
     coordinator: LinqConnectDataUpdateCoordinator = hass.data[DOMAIN][entry.entry_id]
+    added: set[str] = set()
+
+    @callback
+    def _async_add_calendars() -> None:
+        """Add calendars for serving sessions that don't have one yet."""
+        new_meal_types = [
+            meal_type for meal_type in coordinator.meal_types if meal_type not in added
+        ]
+        if not new_meal_types:
+            return
+        added.update(new_meal_types)
+        async_add_entities(
+            LinqConnectCalendar(coordinator, entry, meal_type)
+            for meal_type in new_meal_types
+        )
 
-    entities = [
-        LinqConnectCalendar(coordinator, entry, SENSOR_BREAKFAST),
-        LinqConnectCalendar(coordinator, entry, SENSOR_LUNCH),
-    ]
-
-    async_add_entities(entities)
+    _async_add_calendars()
+    # Sessions such as snacks can first show up in a later update
+    entry.async_on_unload(coordinator.async_add_listener(_async_add_calendars))
 
 
 class LinqConnectCalendar(CoordinatorEntity, CalendarEntity):
@@ -54,16 +66,54 @@ class LinqConnectCalendar(CoordinatorEntity, CalendarEntity):
         self._meal_type = meal_type
         self._entry = entry
         self._attr_unique_id = f"{entry.entry_id}_{meal_type}_calendar"
-        self._attr_name = f"LinqConnect {meal_type.title()} Calendar"
+        self._attr_device_info = entry_device_info(entry)
+        self._attr_name = (
+            f"LinqConnect {coordinator.get_session_name(meal_type)} Calendar"
+        )
         self._attr_attribution = ATTRIBUTION
+        self._written_today: date | None = None
+        self._written_event_date: date | None = None
+        self._written_available: bool | None = None
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write state only if the next event may have changed.
+
+        The next event can only change if a date up to the one last written
+        was added, removed or edited, or any date if there was no event.
+        """
+        today = dt_util.now().date()
+        available = self.available
+        changed_dates = self.coordinator.changed_dates.get(self._meal_type, ())
+        if (
+            today == self._written_today
+            and available == self._written_available
+            and not any(
+                self._written_event_date is None
+                or changed_date <= self._written_event_date
+                for changed_date in changed_dates
+            )
+        ):
+            return
+
+        self._written_today = today
+        self._written_available = available
+        self._written_event_date = self.coordinator.get_next_menu_date(
+            self._meal_type, today
+        )
+        super()._handle_coordinator_update()
 
     @property
     def event(self) -> CalendarEvent | None:
         """Return the next upcoming event."""
-        events = self._get_events(datetime.now(), datetime.now() + timedelta(days=1))
-        if events:
-            return events[0]
-        return None
+        next_date = self.coordinator.get_next_menu_date(
+            self._meal_type, dt_util.now().date()
+        )
+        if next_date is None:
+            return None
+
+        menu = self.coordinator.get_rendered_menu(self._meal_type, next_date)
+        return self._create_event_from_menu(next_date, menu)
 
     async def async_get_events(
         self,
@@ -84,80 +134,32 @@ class LinqConnectCalendar(CoordinatorEntity, CalendarEntity):
             return []
 
         events = []
-        meal_data = self.coordinator.data.get(self._meal_type, {})
-
-        current_date = start_date.date()
-        end_date_only = end_date.date()
-
-        while current_date <= end_date_only:
-            menu = meal_data.get(current_date)
-            if menu:
-                event = self._create_event_from_menu(current_date, menu)
-                if event:
-                    events.append(event)
-
-            current_date += timedelta(days=1)
+        for menu_date in self.coordinator.get_menu_dates(
+            self._meal_type, start_date.date(), end_date.date()
+        ):
+            menu = self.coordinator.get_rendered_menu(self._meal_type, menu_date)
+            event = self._create_event_from_menu(menu_date, menu)
+            if event:
+                events.append(event)
 
         return events
 
     def _create_event_from_menu(
         self,
         date: datetime.date,
-        menu: dict[str, Any],
+        menu: RenderedDay,
     ) -> CalendarEvent | None:
-        """Create a calendar event from menu data."""
-        theme = menu.get("theme", "")
-        items = menu.get("items", [])
-
-        if not items:
+        """Create a calendar event from a rendered menu."""
+        if not menu.menu.meals:
             return None
 
-        # Build event summary with emoji
-        emoji = "🥐" if self._meal_type == SENSOR_BREAKFAST else "🍔"
-        if theme:
-            summary = f"{emoji} {theme}"
-        else:
-            summary = f"{emoji} {self._meal_type.title()}"
-
-        # Build clean event description
-        description_parts = []
-
-        # Combine all categories from all menu items
-        all_categories = {}
-        for item in items:
-            for category_name, recipes in item.items():
-                if category_name not in all_categories:
-                    all_categories[category_name] = []
-                all_categories[category_name].extend(recipes)
-
-        # Format each category
-        for category_name, recipes in all_categories.items():
-            recipe_names = [recipe["name"] for recipe in recipes if recipe.get("name")]
-            if recipe_names:
-                # Add category header
-                description_parts.append(f"{category_name}:")
-
-                # Show all items
-                for item in recipe_names:
-                    description_parts.append(f"  • {item}")
-
-                # Add blank line between categories
-                description_parts.append("")
-
         # Get line break preference from options
         line_break = self._entry.options.get(CONF_CALENDAR_LINE_BREAK, DEFAULT_CALENDAR_LINE_BREAK)
-        description = line_break.join(description_parts)
-
-        # Make it an all-day event
-        from homeassistant.util import dt as dt_util
 
         # All-day events need start and end dates (not datetimes)
-        start_datetime = dt_util.start_of_local_day(datetime.combine(date, datetime.min.time()))
-        end_datetime = dt_util.start_of_local_day(datetime.combine(date + timedelta(days=1), datetime.min.time()))
-
         return CalendarEvent(
-            start=start_datetime.date(),
-            end=end_datetime.date(),
-            summary=summary,
-            description=description,
+            start=date,
+            end=date + timedelta(days=1),
+            summary=menu.summary,
+            description=menu.description(line_break),
         )
@@ -1,7 +1,7 @@
 """Config flow for LinqConnect integration."""
 from __future__ import annotations
 
-from datetime import time
+from datetime import time, timedelta
 import logging
 from typing import Any
 
@@ -12,21 +12,29 @@ from homeassistant.core import HomeAssistant, callback
 from homeassistant.data_entry_flow import FlowResult
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
 import homeassistant.helpers.config_validation as cv
+from homeassistant.util import dt as dt_util
 
 from .api import ApiClientError, LinqConnectApiClient
+from .broker import async_get_broker
 from .const import (
     CONF_BUILDING_ID,
+    CONF_CACHE_MAX_AGE,
     CONF_CALENDAR_DAYS,
     CONF_CALENDAR_LINE_BREAK,
     CONF_CUTOFF_TIME,
     CONF_DISTRICT_ID,
     CONF_MENU_PLANS,
+    CONF_RAW_RETENTION,
     CONF_UPDATE_INTERVAL,
+    DEFAULT_CACHE_MAX_AGE,
     DEFAULT_CALENDAR_DAYS,
     DEFAULT_CALENDAR_LINE_BREAK,
     DEFAULT_CUTOFF_TIME,
+    DEFAULT_RAW_RETENTION,
     DEFAULT_UPDATE_INTERVAL,
     DOMAIN,
+    MAX_CALENDAR_DAYS,
+    RAW_RETENTION_OPTIONS,
 )
 
 _LOGGER = logging.getLogger(__name__)
@@ -39,8 +47,12 @@ STEP_USER_DATA_SCHEMA = vol.Schema(
 )
 
 
-async def validate_input(hass: HomeAssistant, data: dict[str, Any]) -> dict[str, Any]:
-    """Validate the user input allows us to connect."""
+async def async_get_menu_plans(hass: HomeAssistant, data: dict[str, Any]) -> list[str]:
+    """Fetch the menu plans available for the user input.
+
+    A successful fetch also proves the IDs are valid, so no separate
+    validation request is made.
+    """
     session = async_get_clientsession(hass)
     client = LinqConnectApiClient(
         district_id=data[CONF_DISTRICT_ID],
@@ -48,10 +60,24 @@ async def validate_input(hass: HomeAssistant, data: dict[str, Any]) -> dict[str,
         session=session,
     )
 
-    if not await client.async_validate_credentials():
-        raise InvalidAuth
+    try:
+        menu_data = await client.async_get_menu(project=True)
+    except ApiClientError as err:
+        raise InvalidAuth from err
+
+    return extract_menu_plans(menu_data)
+
+
+def extract_menu_plans(data: dict[str, Any]) -> list[str]:
+    """Extract the unique menu plan names from FamilyMenu data."""
+    plans = set()
+    for session_data in data.get("FamilyMenuSessions", []):
+        for menu_plan in session_data.get("MenuPlans", []):
+            plan_name = menu_plan.get("MenuPlanName")
+            if plan_name:
+                plans.add(plan_name)
 
-    return {"title": "LinqConnect School Menus"}
+    return sorted(plans)
 
 
 class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
@@ -64,6 +90,7 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         self._district_id: str | None = None
         self._building_id: str | None = None
         self._available_plans: list[str] = []
+        self._plans_by_school: dict[tuple[str, str], list[str]] = {}
 
     async def async_step_user(
         self, user_input: dict[str, Any] | None = None
@@ -73,14 +100,19 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 
         if user_input is not None:
             try:
-                info = await validate_input(self.hass, user_input)
-
                 # Store credentials and fetch available menu plans
                 self._district_id = user_input[CONF_DISTRICT_ID]
                 self._building_id = user_input[CONF_BUILDING_ID]
 
-                # Fetch available menu plans
-                self._available_plans = await self._async_get_available_plans()
+                # Reuse the plans if these IDs were already looked up
+                school = (self._district_id, self._building_id)
+                self._available_plans = self._plans_by_school.get(school, [])
+                if not self._available_plans:
+                    self._available_plans = await async_get_menu_plans(
+                        self.hass, user_input
+                    )
+                    if self._available_plans:
+                        self._plans_by_school[school] = self._available_plans
 
                 if not self._available_plans:
                     errors["base"] = "no_menu_plans"
@@ -145,33 +177,6 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             },
         )
 
-    async def _async_get_available_plans(self) -> list[str]:
-        """Fetch available menu plans from API."""
-        try:
-            session = async_get_clientsession(self.hass)
-            client = LinqConnectApiClient(
-                district_id=self._district_id,
-                building_id=self._building_id,
-                session=session,
-            )
-
-            # Fetch menu data
-            data = await client.async_get_menu()
-
-            # Extract unique menu plan names
-            plans = set()
-            for session in data.get("FamilyMenuSessions", []):
-                for menu_plan in session.get("MenuPlans", []):
-                    plan_name = menu_plan.get("MenuPlanName")
-                    if plan_name:
-                        plans.add(plan_name)
-
-            return sorted(list(plans))
-
-        except Exception as err:
-            _LOGGER.error("Failed to fetch menu plans: %s", err)
-            return []
-
     @staticmethod
     @callback
     def async_get_options_flow(
@@ -248,13 +253,25 @@ class OptionsFlowHandler(config_entries.OptionsFlow):
                 default=self.config_entry.options.get(
                     CONF_CALENDAR_DAYS, DEFAULT_CALENDAR_DAYS
                 ),
-            ): cv.positive_int,
+            ): vol.All(cv.positive_int, vol.Range(max=MAX_CALENDAR_DAYS)),
             vol.Optional(
                 CONF_CALENDAR_LINE_BREAK,
                 default=self.config_entry.options.get(
                     CONF_CALENDAR_LINE_BREAK, DEFAULT_CALENDAR_LINE_BREAK
                 ),
             ): cv.string,
+            vol.Optional(
+                CONF_CACHE_MAX_AGE,
+                default=self.config_entry.options.get(
+                    CONF_CACHE_MAX_AGE, DEFAULT_CACHE_MAX_AGE
+                ),
+            ): cv.positive_int,
+            vol.Optional(
+                CONF_RAW_RETENTION,
+                default=self.config_entry.options.get(
+                    CONF_RAW_RETENTION, DEFAULT_RAW_RETENTION
+                ),
+            ): vol.In(RAW_RETENTION_OPTIONS),
         })
 
         options_schema = vol.Schema(schema_dict)
@@ -262,7 +279,11 @@ class OptionsFlowHandler(config_entries.OptionsFlow):
         return self.async_show_form(step_id="init", data_schema=options_schema)
 
     async def _async_get_available_plans(self) -> list[str]:
-        """Fetch available menu plans from API."""
+        """Get the available menu plans, preferring already loaded data."""
+        coordinator = self.hass.data.get(DOMAIN, {}).get(self.config_entry.entry_id)
+        if coordinator is not None and coordinator.available_menu_plans:
+            return coordinator.available_menu_plans
+
         try:
             session = async_get_clientsession(self.hass)
             client = LinqConnectApiClient(
@@ -271,16 +292,15 @@ class OptionsFlowHandler(config_entries.OptionsFlow):
                 session=session,
             )
 
-            data = await client.async_get_menu()
-
-            plans = set()
-            for session_data in data.get("FamilyMenuSessions", []):
-                for menu_plan in session_data.get("MenuPlans", []):
-                    plan_name = menu_plan.get("MenuPlanName")
-                    if plan_name:
-                        plans.add(plan_name)
-
-            return sorted(list(plans))
+            # The broker reuses a recent fetch if the dialog is reopened
+            start_date = dt_util.now().date()
+            response = await async_get_broker(self.hass).async_fetch_menu(
+                client,
+                start_date,
+                start_date + timedelta(days=DEFAULT_CALENDAR_DAYS),
+                project=True,
+            )
+            return extract_menu_plans(response.data)
 
         except Exception as err:
             _LOGGER.error("Failed to fetch menu plans in options: %s", err)
@@ -1,8 +1,11 @@
 """Constants for the LinqConnect integration."""
-from datetime import time
+from datetime import time, timedelta
 
 DOMAIN = "linqconnect"
 
+# hass.data[DOMAIN] key for the fetch broker shared by all config entries
+DATA_BROKER = "fetch_broker"
+
 # API Configuration
 API_BASE_URL = "https://api.linqconnect.com/api"
 API_FAMILY_MENU = f"{API_BASE_URL}/FamilyMenu"
@@ -16,20 +19,89 @@ CONF_CUTOFF_TIME = "cutoff_time"
 CONF_UPDATE_INTERVAL = "update_interval"
 CONF_CALENDAR_DAYS = "calendar_days"
 CONF_CALENDAR_LINE_BREAK = "calendar_line_break"
+CONF_CACHE_MAX_AGE = "cache_max_age"
+CONF_RAW_RETENTION = "raw_retention"
 
 # Defaults
 DEFAULT_CUTOFF_TIME = time(10, 0)  # 10:00 AM
 DEFAULT_UPDATE_INTERVAL = 180  # 3 hours in minutes
 DEFAULT_CALENDAR_DAYS = 30  # Days ahead to fetch
+MAX_CALENDAR_DAYS = 366  # Furthest ahead menus can be fetched
 DEFAULT_CALENDAR_LINE_BREAK = "<br>"  # Default to HTML breaks for compatibility
+DEFAULT_CACHE_MAX_AGE = 24  # Hours cached menus stay usable without a refresh
+
+# Raw API Payload Retention
+RAW_RETENTION_DROP = "drop"  # Keep nothing
+RAW_RETENTION_DEBUG = "debug"  # Keep full payloads while debug logging is on
+RAW_RETENTION_SUMMARY = "summary"  # Keep digests and counts only
+RAW_RETENTION_OPTIONS = [RAW_RETENTION_SUMMARY, RAW_RETENTION_DEBUG, RAW_RETENTION_DROP]
+DEFAULT_RAW_RETENTION = RAW_RETENTION_SUMMARY
+
+# Incremental Fetching
+VOLATILE_DAYS = 3  # Near-term days refetched on every update
+FAR_DAYS_REFRESH_INTERVAL = timedelta(hours=24)  # Refresh cadence for later days
+FETCH_MAX_GAP_DAYS = 3  # Refetch small gaps rather than issue another request
+BROKER_RESULT_TTL = timedelta(minutes=5)  # Reuse of fetches across config entries
+FETCH_WINDOW_MAX_DAYS = 31  # Most days requested at once
+FETCH_WINDOW_MIN_DAYS = 7  # Fewest days a slow API shrinks requests to
+FETCH_SLOW_SECONDS = 5.0  # Requests slower than this shrink the window
+FETCH_CONCURRENCY = 3  # Window requests in flight at once per update
+
+# Request Retries
+REQUEST_TIMEOUT = 10  # Seconds per request attempt
+MAX_RETRIES = 3  # Extra attempts after a transient failure
+RETRY_BACKOFF_BASE = 1.0  # Seconds before the first retry, doubled each retry
+RETRY_BACKOFF_MAX = 30.0  # Upper bound on a single retry delay
+CIRCUIT_FAILURE_THRESHOLD = 3  # Consecutive failed requests that open the circuit
+CIRCUIT_RESET_TIMEOUT = timedelta(minutes=10)  # Wait before a trial request
+RECOVERY_UPDATE_INTERVAL = timedelta(minutes=15)  # Poll interval while degraded
+
+# Event Loop
+DECODE_EXECUTOR_MIN_BYTES = 64 * 1024  # Larger responses are decoded off the loop
+LOOP_HOLD_WARNING = 0.1  # Seconds a menu update may hold the loop before warning
+
+# Date Parsing
+DATE_CACHE_SIZE = 1024  # Distinct menu date strings remembered
+DATE_FAILURE_SAMPLES = 5  # Unparseable date strings kept for diagnostics
 
 # Sensor Configuration
 SENSOR_BREAKFAST = "breakfast"
 SENSOR_LUNCH = "lunch"
+SENSOR_SNACK = "snack"
+# Meal types that always have entities; other serving sessions such as
+# snacks get theirs once they show up in the menus
+MEAL_TYPES = (SENSOR_BREAKFAST, SENSOR_LUNCH)
+
+# Sensor icon per meal type
+MEAL_ICONS = {SENSOR_BREAKFAST: "mdi:food-croissant", SENSOR_SNACK: "mdi:food-apple"}
+MEAL_ICON_DEFAULT = "mdi:food"
+
+# Calendar event title emoji per meal type
+MEAL_EMOJI = {SENSOR_BREAKFAST: "🥐", SENSOR_SNACK: "🍎"}
+MEAL_EMOJI_DEFAULT = "🍔"
 
-# Meal Session Keys (from API)
-SESSION_BREAKFAST = "Breakfast"
-SESSION_LUNCH = "Lunch"
+# Nutrition
+NUTRITION_ROLLING_DAYS = 5  # Menu days summed for rolling nutrient totals
+ATTR_NUTRITION = "nutrition"
+ATTR_NUTRITION_DAILY = "nutrition_daily"
+ATTR_NUTRITION_ROLLING = f"nutrition_{NUTRITION_ROLLING_DAYS}_day"
+ATTR_NUTRITION_UNITS = "nutrition_units"
+
+# Services
+SERVICE_FIND_SAFE_DAYS = "find_safe_days"
+SERVICE_FIND_RECIPE = "find_recipe"
+SERVICE_GET_MENU = "get_menu"
+SERVICE_FORCE_UPDATE = "force_update"
+ATTR_CONFIG_ENTRY_ID = "config_entry_id"
+ATTR_MEAL_TYPE = "meal_type"
+ATTR_ALLERGENS = "allergens"
+ATTR_RESTRICTIONS = "restrictions"
+ATTR_CATEGORY = "category"
+ATTR_START_DATE = "start_date"
+ATTR_END_DATE = "end_date"
+ATTR_RECIPE = "recipe"
+ATTR_MENU_PLAN = "menu_plan"
+CATEGORY_ALL = "all"  # Category value that checks every recipe of a day
 
 # Recipe Categories
 CATEGORY_MAIN_ENTREE = "Main Entrée"
@@ -43,3 +115,6 @@ CATEGORY_SIDE_ITEM = "Side Item"
 
 # Attribution
 ATTRIBUTION = "Data provided by LinqConnect"
+
+# Device
+MANUFACTURER = "LinqConnect"
@@ -1,19 +1,79 @@
 """DataUpdateCoordinator for LinqConnect."""
 from __future__ import annotations
 
-from datetime import datetime, timedelta
+from array import array
+import asyncio
+from collections.abc import Iterable
+from dataclasses import replace
+from datetime import date, datetime, timedelta
+from itertools import chain
 import logging
-from typing import Any
+from time import monotonic
+from typing import TYPE_CHECKING, Any, NamedTuple
 
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
-
-from .api import LinqConnectApiClient, ApiClientError
-from .const import DOMAIN, SESSION_BREAKFAST, SESSION_LUNCH
+from homeassistant.util import dt as dt_util, slugify
+
+from .api import LinqConnectApiClient, ApiClientError, MenuResponse
+from .const import (
+    CATEGORY_MAIN_ENTREE,
+    DEFAULT_CACHE_MAX_AGE,
+    DEFAULT_CALENDAR_DAYS,
+    DEFAULT_CALENDAR_LINE_BREAK,
+    DEFAULT_RAW_RETENTION,
+    DOMAIN,
+    FAR_DAYS_REFRESH_INTERVAL,
+    FETCH_CONCURRENCY,
+    FETCH_MAX_GAP_DAYS,
+    FETCH_SLOW_SECONDS,
+    FETCH_WINDOW_MAX_DAYS,
+    FETCH_WINDOW_MIN_DAYS,
+    LOOP_HOLD_WARNING,
+    MEAL_TYPES,
+    RAW_RETENTION_DEBUG,
+    RAW_RETENTION_SUMMARY,
+    RECOVERY_UPDATE_INTERVAL,
+    VOLATILE_DAYS,
+)
+from .dates import MenuDateParser
+from .indexes import (
+    CategoryTags,
+    DateIndex,
+    DietIndex,
+    RecipeIndex,
+    TagTable,
+    build_day_tags,
+)
+from .models import (
+    Category,
+    MenuDay,
+    MenuInterner,
+    RenderedDay,
+    ServingSession,
+    render_menu_day,
+)
+from .nutrition import NutrientTable, build_nutrition
+from .store import LinqConnectMenuStore
+
+if TYPE_CHECKING:
+    from .broker import LinqConnectFetchBroker
 
 _LOGGER = logging.getLogger(__name__)
 
 
+class MenuViews(NamedTuple):
+    """Lookup structures built from processed menu data."""
+
+    date_index: dict[str, DateIndex]
+    rendered: dict[str, dict[date, RenderedDay]]
+    changed_dates: dict[str, frozenset[date]]
+    diet_index: dict[str, DietIndex]
+    meal_totals: dict[str, dict[date, array]]
+    nutrition: dict[str, dict[date, dict[str, Any]]]
+    recipe_index: dict[str, RecipeIndex]
+
+
 class LinqConnectDataUpdateCoordinator(DataUpdateCoordinator):
     """Class to manage fetching LinqConnect data."""
 
@@ -23,36 +83,622 @@ class LinqConnectDataUpdateCoordinator(DataUpdateCoordinator):
         client: LinqConnectApiClient,
         update_interval: timedelta,
         selected_menu_plans: list[str] | None = None,
+        store: LinqConnectMenuStore | None = None,
+        cache_max_age: timedelta = timedelta(hours=DEFAULT_CACHE_MAX_AGE),
+        raw_retention: str = DEFAULT_RAW_RETENTION,
+        line_break: str = DEFAULT_CALENDAR_LINE_BREAK,
+        broker: LinqConnectFetchBroker | None = None,
+        fetch_days: int = DEFAULT_CALENDAR_DAYS,
     ) -> None:
         """Initialize the coordinator."""
         self.client = client
+        self._broker = broker
         self.selected_menu_plans = selected_menu_plans or []
+        self.raw_retention = raw_retention
+        self.raw_data: dict[str, Any] | None = None
+        self.raw_summary: dict[str, Any] | None = None
+        self.last_fetched: datetime | None = None
+        self._menu_plan_names: set[str] = set()
+        # Serving sessions seen in API responses, by meal type key
+        self.sessions: dict[str, ServingSession] = {}
+        # Meal type key per ServingSessionId, or per name without an ID
+        self._session_index: dict[str, str] = {}
+        self._interner = MenuInterner()
+        self.date_parser = MenuDateParser()
+        self._line_breaks = tuple(dict.fromkeys((line_break, "<br>", "\n")))
+        self._rendered: dict[str, dict[date, RenderedDay]] = {}
+        # Dates per meal type whose menu changed in the latest update
+        self.changed_dates: dict[str, frozenset[date]] = {}
+        # Milliseconds spent per stage of the latest update
+        self.update_timings: dict[str, float] | None = None
+        self._date_index: dict[str, DateIndex] = {}
+        # Bit positions of allergen and restriction IDs, and masks per day
+        self._allergen_table = TagTable()
+        self._restriction_table = TagTable()
+        self._diet_index: dict[str, DietIndex] = {}
+        self._category_tags: dict[int, tuple[Category, CategoryTags]] = {}
+        # Nutrients per recipe, totals per meal and the attributes built on them
+        self._nutrient_table = NutrientTable()
+        self._meal_totals: dict[str, dict[date, array]] = {}
+        self._nutrition: dict[str, dict[date, dict[str, Any]]] = {}
+        # Dates each recipe is served on, per meal type
+        self._recipe_index: dict[str, RecipeIndex] = {}
+        self._fetched_dates: dict[date, datetime] = {}
+        # Last response per fetch window, without its data, for conditional requests
+        self._previous_responses: dict[tuple[date, date], MenuResponse] = {}
+        self._fetch_days = fetch_days
+        # Held for the whole of an update, and while loading the cache
+        self._update_lock = asyncio.Lock()
+        # Most days per request, shrunk while the API is slow
+        self.fetch_window_days = FETCH_WINDOW_MAX_DAYS
+        self._store = store
+        self._cache_max_age = cache_max_age
+        self._normal_update_interval = update_interval
         super().__init__(
             hass,
             _LOGGER,
             name=DOMAIN,
             update_interval=update_interval,
+            # Unchanged menus return the same data, which needs no state writes
+            always_update=False,
         )
 
-    async def _async_update_data(self) -> dict[str, Any]:
-        """Fetch data from API."""
-        try:
-            # Fetch menu data for the configured time range
-            raw_data = await self.client.async_get_menu()
+    @property
+    def degraded(self) -> bool:
+        """Return True while polling on the recovery schedule after failures."""
+        return self.update_interval != self._normal_update_interval
+
+    @property
+    def available_menu_plans(self) -> list[str]:
+        """Return every menu plan name seen in API responses, selected or not."""
+        return sorted(self._menu_plan_names)
+
+    @property
+    def meal_types(self) -> list[str]:
+        """Return the meal types with menu data, breakfast and lunch first."""
+        return _meal_types(self.data)
+
+    def get_session_name(self, meal_type: str) -> str:
+        """Return the display name of the serving session for a meal type."""
+        if (session := self.sessions.get(meal_type)) is not None:
+            return session.name
+        return meal_type.replace("_", " ").title()
+
+    async def async_load_cache(self) -> bool:
+        """Load menus from the on-disk cache, returning True if any were loaded."""
+        if self._store is None:
+            return False
+
+        cached = await self._store.async_load(self._cache_max_age)
+        if cached is None:
+            return False
+
+        async with self._update_lock:
+            self.data = cached.data
+            self.last_fetched = cached.fetched_at
+            self._fetched_dates = cached.fetched_dates
+            # Entities are named after the sessions, and renamed sessions
+            # keep their keys through the index
+            self.sessions = cached.sessions
+            self._session_index = cached.session_index
+            self._apply_views(
+                await self.hass.async_add_executor_job(self._build_views, self.data)
+            )
+        _LOGGER.debug("Loaded cached menu data fetched at %s", self.last_fetched)
+        return True
+
+    async def async_force_refresh(
+        self, start: date | None = None, end: date | None = None
+    ) -> None:
+        """Refetch the menus from start to end, all of them by default, now.
+
+        The days are marked as never fetched, so the refresh fetches them
+        along with the near-term days and merges them into the current menus.
+        """
+        first, last = start or date.min, end or date.max
+        self._fetched_dates = {
+            menu_date: fetched_at
+            for menu_date, fetched_at in self._fetched_dates.items()
+            if not first <= menu_date <= last
+        }
+        await self.async_refresh()
 
-            # Process and organize the data
-            processed_data = self._process_menu_data(raw_data)
+    async def _async_update_data(self) -> dict[str, Any]:
+        """Fetch data from API, one update at a time.
+
+        Scheduled, aligned and forced refreshes can overlap, and processing
+        replaces the interner and session index and updates the tag and
+        nutrient tables, which are not safe to share between executor jobs.
+        """
+        async with self._update_lock:
+            return await self._async_fetch_and_process()
+
+    async def _async_fetch_and_process(self) -> dict[str, Any]:
+        """Fetch the new and due menus and process them.
+
+        Decoding large responses and processing them into views runs in the
+        executor. The time left over, outside of fetching and the executor,
+        is how long the update held the event loop.
+        """
+        started = monotonic()
+        fetch_time = executor_time = 0.0
+        now = dt_util.utcnow()
+        today = dt_util.now().date()
+        fetch_ranges = self._get_fetch_ranges(today, now)
+
+        # Full payloads are only needed when they are going to be retained
+        keep_raw = self._keep_raw_data()
+        self.changed_dates = {}
 
-            return processed_data
+        try:
+            # Only fetch the days that are new or due for a refresh
+            fetch_started = monotonic()
+            responses = await self._async_fetch_windows(fetch_ranges, keep_raw)
+            fetch_time = monotonic() - fetch_started
         except ApiClientError as err:
+            self._set_degraded(True)
+            if self._has_fresh_data():
+                _LOGGER.warning(
+                    "Error communicating with API, keeping menus fetched at %s: %s",
+                    self.last_fetched,
+                    err,
+                )
+                return self.data
             raise UpdateFailed(f"Error communicating with API: {err}") from err
 
-    def _process_menu_data(self, raw_data: dict[str, Any]) -> dict[str, Any]:
-        """Process raw API data into a more usable format."""
-        processed = {
-            "breakfast": {},
-            "lunch": {},
-            "raw": raw_data,
+        self._set_degraded(False)
+
+        changed = [
+            (start, end, response)
+            for start, end, response in responses
+            if not response.not_modified
+        ]
+        if changed or self.data is None or self._has_past_days(self.data, today):
+            executor_started = monotonic()
+            processed_data, views = await self.hass.async_add_executor_job(
+                self._process_changes, self.data, changed, today
+            )
+            executor_time = monotonic() - executor_started
+            self._apply_views(views)
+            for start, end, _ in changed:
+                # Days in overlapping windows now come from this response
+                self._previous_responses = {
+                    window: previous
+                    for window, previous in self._previous_responses.items()
+                    if window[1] < start or window[0] > end
+                }
+        else:
+            _LOGGER.debug("Menus unchanged, skipping processing")
+            processed_data = self.data
+
+        for start, end, response in responses:
+            self._previous_responses[(start, end)] = replace(response, data=None)
+            for offset in range((end - start).days + 1):
+                self._fetched_dates[start + timedelta(days=offset)] = now
+
+        self._previous_responses = {
+            window: previous
+            for window, previous in self._previous_responses.items()
+            if window[0] >= today
+        }
+        self._fetched_dates = {
+            menu_date: fetched_at
+            for menu_date, fetched_at in self._fetched_dates.items()
+            if menu_date >= today
+        }
+        self.last_fetched = now
+        self._retain_raw_data(responses, processed_data, keep_raw)
+        if self._store is not None:
+            self._store.async_schedule_save(
+                processed_data,
+                self.last_fetched,
+                self._fetched_dates,
+                self.sessions,
+                self._session_index,
+            )
+
+        self._log_timings(monotonic() - started, fetch_time, executor_time)
+        return processed_data
+
+    async def _async_fetch_windows(
+        self, fetch_ranges: list[tuple[date, date]], keep_raw: bool
+    ) -> list[tuple[date, date, MenuResponse]]:
+        """Fetch each window, a few at a time, and adapt the window size."""
+        semaphore = asyncio.Semaphore(FETCH_CONCURRENCY)
+        durations: list[float] = []
+
+        async def _async_fetch_window(
+            start: date, end: date
+        ) -> tuple[date, date, MenuResponse]:
+            # Raw payloads can't be retained from not modified responses
+            previous = (
+                None if keep_raw else self._previous_responses.get((start, end))
+            )
+            async with semaphore:
+                started = monotonic()
+                response = await self._async_fetch_menu(
+                    start, end, not keep_raw, previous
+                )
+                durations.append(monotonic() - started)
+            return start, end, response
+
+        results = await asyncio.gather(
+            *(_async_fetch_window(start, end) for start, end in fetch_ranges),
+            return_exceptions=True,
+        )
+        for result in results:
+            if isinstance(result, BaseException):
+                if isinstance(result.__cause__, asyncio.TimeoutError):
+                    self._resize_fetch_window(slow=True)
+                raise result
+
+        self._resize_fetch_window(
+            slow=max(durations, default=0) >= FETCH_SLOW_SECONDS
+        )
+        return results
+
+    def _resize_fetch_window(self, slow: bool) -> None:
+        """Halve the fetch window while the API is slow, and grow it back after.
+
+        Smaller windows mean smaller responses, which are less likely to
+        time out, and more of them fetched in parallel.
+        """
+        if slow:
+            window_days = max(self.fetch_window_days // 2, FETCH_WINDOW_MIN_DAYS)
+        else:
+            window_days = min(self.fetch_window_days * 2, FETCH_WINDOW_MAX_DAYS)
+        if window_days != self.fetch_window_days:
+            _LOGGER.log(
+                logging.INFO if slow else logging.DEBUG,
+                "Menu API is %s, requesting %d days at a time",
+                "slow" if slow else "responsive",
+                window_days,
+            )
+            self.fetch_window_days = window_days
+
+    def _process_changes(
+        self,
+        data: dict[str, Any] | None,
+        changed: list[tuple[date, date, MenuResponse]],
+        today: date,
+    ) -> tuple[dict[str, Any], MenuViews]:
+        """Merge changed windows into the menus and build views.
+
+        Runs in the executor, under the update lock. The menus and views are
+        returned as new objects for the caller to apply on the event loop,
+        while the lookup tables are updated in place. The interner is seeded
+        with the retained menus, so refetched days share their objects, and
+        emptied afterwards so it doesn't keep pruned days alive.
+        """
+        processed_data = self._prune_menu_data(data, today)
+        self._interner = MenuInterner(
+            menu for days in processed_data.values() for menu in days.values()
+        )
+        for start, end, response in changed:
+            processed_data = self._merge_menu_data(
+                processed_data, self._process_menu_data(response.data), start, end
+            )
+        self._interner = MenuInterner()
+        return processed_data, self._build_views(processed_data)
+
+    def _log_timings(
+        self, total_time: float, fetch_time: float, executor_time: float
+    ) -> None:
+        """Record and log where the time of an update went."""
+        loop_time = max(total_time - fetch_time - executor_time, 0)
+        self.update_timings = {
+            "total_ms": round(total_time * 1000, 1),
+            "fetch_ms": round(fetch_time * 1000, 1),
+            "executor_ms": round(executor_time * 1000, 1),
+            "event_loop_ms": round(loop_time * 1000, 1),
+        }
+        _LOGGER.log(
+            logging.WARNING if loop_time > LOOP_HOLD_WARNING else logging.DEBUG,
+            "Menu update held the event loop for %.1f ms "
+            "(%.1f ms fetching, %.1f ms processing in the executor)",
+            loop_time * 1000,
+            fetch_time * 1000,
+            executor_time * 1000,
+        )
+
+    async def _async_fetch_menu(
+        self,
+        start: date,
+        end: date,
+        project: bool,
+        previous: MenuResponse | None = None,
+    ) -> MenuResponse:
+        """Fetch menus, through the shared broker when there is one."""
+        if self._broker is None:
+            return await self.client.async_fetch_menu(
+                start, end, project=project, previous=previous
+            )
+        return await self._broker.async_fetch_menu(
+            self.client, start, end, project, requester=self, previous=previous
+        )
+
+    def _set_degraded(self, degraded: bool) -> None:
+        """Switch between the normal and the recovery poll schedule.
+
+        While the API is failing, retry sooner than the normal interval so
+        menus are fresh again shortly after it recovers. The client's
+        circuit breaker keeps these polls from adding load during an outage.
+        """
+        update_interval = self._normal_update_interval
+        if degraded and update_interval is not None:
+            update_interval = min(update_interval, RECOVERY_UPDATE_INTERVAL)
+        if update_interval != self.update_interval:
+            _LOGGER.info(
+                "Menu updates %s, polling every %s",
+                "degraded" if degraded else "recovered",
+                update_interval,
+            )
+            self.update_interval = update_interval
+
+    def _update_views(self, data: dict[str, dict[date, MenuDay]]) -> None:
+        """Rebuild the date index and render views for new or changed days."""
+        self._apply_views(self._build_views(data))
+
+    def _build_views(self, data: dict[str, dict[date, MenuDay]]) -> MenuViews:
+        """Build the date index and render views for new or changed days.
+
+        Every day of a renamed serving session is rendered again, since
+        days without a theme are summarized with its name. Also records which dates were added, removed or changed, so entities
+        can skip state writes when the days they show are unchanged, builds
+        allergen and restriction masks for those dates, and totals their
+        nutrients. The recipe index of a meal type is rebuilt when any of
+        its days changed. Runs in the executor under the update lock: the
+        current views are only read, but the tag and nutrient tables and
+        their category caches are updated in place, and pruned of what the
+        menus no longer reference when any day changed.
+        """
+        date_index = {
+            meal_type: DateIndex(
+                menu_date
+                for menu_date, menu in data.get(meal_type, {}).items()
+                if menu.meals
+            )
+            for meal_type in _meal_types(data)
+        }
+
+        rendered: dict[str, dict[date, RenderedDay]] = {}
+        changed_dates: dict[str, frozenset[date]] = {}
+        diet_index: dict[str, DietIndex] = {}
+        recipe_index: dict[str, RecipeIndex] = {}
+        for meal_type in _meal_types(data, self._rendered):
+            previous = self._rendered.get(meal_type, {})
+            previous_tags = getattr(self._diet_index.get(meal_type), "days", {})
+            session_name = self.get_session_name(meal_type)
+            days = data.get(meal_type, {})
+            views = rendered[meal_type] = {}
+            tags = {}
+            changed = set(previous.keys() - days.keys())
+            for menu_date, menu in days.items():
+                view = previous.get(menu_date)
+                day_tags = previous_tags.get(menu_date)
+                if (
+                    view is None
+                    or view.session_name != session_name
+                    or (view.menu is not menu and view.menu != menu)
+                ):
+                    view = render_menu_day(
+                        menu, meal_type, session_name, self._line_breaks
+                    )
+                    changed.add(menu_date)
+                    day_tags = None
+                if day_tags is None:
+                    day_tags = build_day_tags(
+                        menu.iter_categories(),
+                        self._allergen_table,
+                        self._restriction_table,
+                        self._category_tags,
+                    )
+                views[menu_date] = view
+                tags[menu_date] = day_tags
+            changed_dates[meal_type] = frozenset(changed)
+            diet_index[meal_type] = DietIndex(tags)
+            if changed or (index := self._recipe_index.get(meal_type)) is None:
+                index = RecipeIndex(days)
+            recipe_index[meal_type] = index
+
+        meal_totals = {
+            meal_type: {
+                menu_date: totals
+                for menu_date, totals in self._meal_totals.get(meal_type, {}).items()
+                if menu_date in views and menu_date not in changed_dates[meal_type]
+            }
+            for meal_type, views in rendered.items()
+        }
+        nutrition = build_nutrition(self._nutrient_table, data, meal_totals)
+        if any(changed_dates.values()):
+            self._retain_tables(data)
+        # Daily and rolling totals also change with the days around a date
+        for meal_type, days in nutrition.items():
+            previous = self._nutrition.get(meal_type, {})
+            if changed := {
+                menu_date
+                for menu_date, attributes in days.items()
+                if previous.get(menu_date) != attributes
+            } - changed_dates[meal_type]:
+                changed_dates[meal_type] = changed_dates[meal_type] | changed
+
+        return MenuViews(
+            date_index,
+            rendered,
+            changed_dates,
+            diet_index,
+            meal_totals,
+            nutrition,
+            recipe_index,
+        )
+
+    def _retain_tables(self, data: dict[str, dict[date, MenuDay]]) -> None:
+        """Drop nutrient rows and cached tags the menus no longer reference.
+
+        Both are filled in as days are added, so without this they would
+        keep every pruned and replaced day's recipes alive.
+        """
+        categories = {
+            id(category): category
+            for days in data.values()
+            for menu in days.values()
+            for category in menu.iter_categories()
+        }
+        self._nutrient_table.retain(categories.values())
+        self._category_tags = {
+            key: cached
+            for key, cached in self._category_tags.items()
+            if categories.get(key) is cached[0]
+        }
+
+    def _apply_views(self, views: MenuViews) -> None:
+        """Make newly built views the ones entities read."""
+        (
+            self._date_index,
+            self._rendered,
+            self.changed_dates,
+            self._diet_index,
+            self._meal_totals,
+            self._nutrition,
+            self._recipe_index,
+        ) = views
+
+    def _keep_raw_data(self) -> bool:
+        """Return True if full API payloads should be kept for diagnostics."""
+        return self.raw_retention == RAW_RETENTION_DEBUG and _LOGGER.isEnabledFor(
+            logging.DEBUG
+        )
+
+    def _retain_raw_data(
+        self,
+        responses: list[tuple[date, date, MenuResponse]],
+        processed_data: dict[str, Any],
+        keep_raw: bool,
+    ) -> None:
+        """Apply the raw payload retention policy to the latest responses."""
+        self.raw_data = (
+            {
+                f"{start.isoformat()}/{end.isoformat()}": response.data
+                for start, end, response in responses
+            }
+            if keep_raw
+            else None
+        )
+
+        if self.raw_retention != RAW_RETENTION_SUMMARY:
+            self.raw_summary = None
+            return
+
+        self.raw_summary = {
+            "fetched_at": self.last_fetched.isoformat(),
+            "responses": [
+                {
+                    "start": start.isoformat(),
+                    "end": end.isoformat(),
+                    "sha256": response.sha256,
+                    "bytes": response.size,
+                    "not_modified": response.not_modified,
+                }
+                for start, end, response in responses
+            ],
+            "menu_dates": {
+                meal_type: len(days) for meal_type, days in processed_data.items()
+            },
+        }
+
+    def _get_fetch_ranges(
+        self, today: date, now: datetime
+    ) -> list[tuple[date, date]]:
+        """Return the date ranges that need to be fetched this update.
+
+        Near-term days are refetched every time since they are the most likely
+        to be edited. Later days are only fetched when they first enter the
+        window or once their last fetch is older than the slow refresh cadence.
+        Ranges are split so no request covers more than the fetch window.
+        """
+        volatile_end = today + timedelta(days=VOLATILE_DAYS)
+        dates = []
+        for offset in range(self._fetch_days + 1):
+            menu_date = today + timedelta(days=offset)
+            fetched_at = self._fetched_dates.get(menu_date)
+            if (
+                menu_date <= volatile_end
+                or fetched_at is None
+                or now - fetched_at >= FAR_DAYS_REFRESH_INTERVAL
+            ):
+                dates.append(menu_date)
+
+        # Group into contiguous ranges, folding small gaps into one request
+        ranges: list[tuple[date, date]] = []
+        for menu_date in dates:
+            if ranges and (menu_date - ranges[-1][1]).days <= FETCH_MAX_GAP_DAYS + 1:
+                ranges[-1] = (ranges[-1][0], menu_date)
+            else:
+                ranges.append((menu_date, menu_date))
+
+        window = timedelta(days=self.fetch_window_days)
+        windows: list[tuple[date, date]] = []
+        for start, end in ranges:
+            while start <= end:
+                windows.append((start, min(start + window - timedelta(days=1), end)))
+                start += window
+        return windows
+
+    @staticmethod
+    def _prune_menu_data(
+        data: dict[str, Any] | None, today: date
+    ) -> dict[str, Any]:
+        """Return a copy of the menu data without days before today."""
+        data = data or {}
+        return {
+            meal_type: {
+                menu_date: menu
+                for menu_date, menu in data.get(meal_type, {}).items()
+                if menu_date >= today
+            }
+            for meal_type in _meal_types(data)
+        }
+
+    @staticmethod
+    def _has_past_days(data: dict[str, Any], today: date) -> bool:
+        """Return True if the menu data holds days before today."""
+        return any(
+            min(days, default=today) < today for days in data.values()
+        )
+
+    @staticmethod
+    def _merge_menu_data(
+        current: dict[str, Any],
+        fetched: dict[str, Any],
+        start: date,
+        end: date,
+    ) -> dict[str, Any]:
+        """Replace the days between start and end with freshly fetched menus."""
+        merged: dict[str, Any] = {}
+        for meal_type in _meal_types(current, fetched):
+            days = {
+                menu_date: menu
+                for menu_date, menu in current.get(meal_type, {}).items()
+                if not start <= menu_date <= end
+            }
+            days.update(fetched.get(meal_type, {}))
+            merged[meal_type] = dict(sorted(days.items()))
+        return merged
+
+    def _has_fresh_data(self) -> bool:
+        """Return True if the current data is younger than the cache max age."""
+        return (
+            self.data is not None
+            and self.last_fetched is not None
+            and dt_util.utcnow() - self.last_fetched <= self._cache_max_age
+        )
+
+    def _process_menu_data(
+        self, raw_data: dict[str, Any]
+    ) -> dict[str, dict[date, MenuDay]]:
+        """Process raw API data into menu days per meal type."""
+        processed: dict[str, dict[date, MenuDay]] = {
+            meal_type: {} for meal_type in MEAL_TYPES
         }
 
         if not raw_data:
@@ -66,17 +712,25 @@ class LinqConnectDataUpdateCoordinator(DataUpdateCoordinator):
         sessions = raw_data["FamilyMenuSessions"]
         _LOGGER.debug("Processing %d menu sessions", len(sessions))
 
-        for session in raw_data["FamilyMenuSessions"]:
-            # Try both field names (API inconsistency)
-            session_name = session.get("ServingSession", session.get("ServingSessionKey", "")).lower()
+        interner = self._interner
+        parse_date = self.date_parser.parse
+        days_by_meal: dict[str, dict[date, tuple[str | None, str, list, list]]] = {
+            meal_type: {} for meal_type in MEAL_TYPES
+        }
 
-            # Determine if this is breakfast or lunch
-            if SESSION_BREAKFAST.lower() in session_name:
-                meal_type = "breakfast"
-            elif SESSION_LUNCH.lower() in session_name:
-                meal_type = "lunch"
-            else:
+        # Remember every plan so the options flow can offer them. The set is
+        # replaced rather than updated since this can run in the executor.
+        self._menu_plan_names = self._menu_plan_names | {
+            menu_plan["MenuPlanName"]
+            for session in sessions
+            for menu_plan in session.get("MenuPlans", [])
+            if menu_plan.get("MenuPlanName")
+        }
+
+        for session, meal_type in zip(sessions, self._resolve_sessions(sessions)):
+            if meal_type is None:
                 continue
+            days_by_meal.setdefault(meal_type, {})
 
             # Process menu plans
             for menu_plan in session.get("MenuPlans", []):
@@ -94,11 +748,8 @@ class LinqConnectDataUpdateCoordinator(DataUpdateCoordinator):
                     if not date_str:
                         continue
 
-                    # Parse the date (format: M/D/YYYY)
-                    try:
-                        date_obj = datetime.strptime(date_str, "%m/%d/%Y").date()
-                    except ValueError as e:
-                        _LOGGER.warning("Could not parse date: %s", date_str)
+                    # Parse the date (format: M/D/YYYY or YYYY-MM-DD)
+                    if (date_obj := parse_date(date_str)) is None:
                         continue
 
                     # Process menu meals for this day
@@ -106,71 +757,231 @@ class LinqConnectDataUpdateCoordinator(DataUpdateCoordinator):
                     theme_day = None
 
                     for menu_meal in day.get("MenuMeals", []):
-                        meal_name = menu_meal.get("Name")
+                        meal_name = menu_meal.get("MenuMealName", menu_meal.get("Name"))
                         if meal_name:
                             theme_day = meal_name
 
                         # Process recipe categories
-                        categories = {}
+                        categories = []
                         for category in menu_meal.get("RecipeCategories", []):
                             category_name = category.get("CategoryName")
                             if not category_name:
                                 continue
 
-                            recipes = []
-                            for recipe in category.get("Recipes", []):
-                                recipe_info = {
-                                    "name": recipe.get("RecipeName"),
-                                    "serving_size": recipe.get("ServingSize"),
-                                    "identifier": recipe.get("RecipeIdentifier"),
-                                }
-
-                                # Add nutritional info if available
-                                nutrients = recipe.get("Nutrients", [])
-                                if nutrients:
-                                    recipe_info["nutrients"] = {
-                                        nutrient.get("Name"): nutrient.get("Value")
-                                        for nutrient in nutrients
-                                    }
-
-                                # Add allergens if available
-                                allergens = recipe.get("Allergens", [])
-                                if allergens:
-                                    recipe_info["allergens"] = allergens
-
-                                recipes.append(recipe_info)
+                            recipes = tuple(
+                                interner.recipe(
+                                    recipe.get("RecipeName"),
+                                    recipe.get("ServingSize"),
+                                    recipe.get("RecipeIdentifier"),
+                                    tuple(
+                                        interner.nutrient(
+                                            nutrient.get("Name"),
+                                            nutrient.get("Value"),
+                                            nutrient.get("Unit"),
+                                        )
+                                        for nutrient in recipe.get("Nutrients", [])
+                                        if nutrient.get("Name")
+                                    ),
+                                    tuple(recipe.get("Allergens", [])),
+                                    tuple(
+                                        str(restriction)
+                                        for restriction in chain(
+                                            recipe.get("DietaryRestrictions") or (),
+                                            recipe.get("ReligiousRestrictions") or (),
+                                        )
+                                    ),
+                                )
+                                for recipe in category.get("Recipes", [])
+                            )
 
                             if recipes:
-                                categories[category_name] = recipes
+                                categories.append(
+                                    interner.category(category_name, recipes)
+                                )
 
                         if categories:
-                            menu_items.append(categories)
-
-                    # Store processed day data
-                    if date_obj not in processed[meal_type]:
-                        processed[meal_type][date_obj] = {
-                            "theme": theme_day,
-                            "menu_plan": menu_plan_name,
-                            "items": [],
-                        }
-
-                    processed[meal_type][date_obj]["items"].extend(menu_items)
+                            menu_items.append(tuple(categories))
+
+                    # Collect day data, combining plans that share a date but
+                    # remembering the plan of each meal
+                    plan_name = interner.string(menu_plan_name)
+                    if date_obj not in days_by_meal[meal_type]:
+                        days_by_meal[meal_type][date_obj] = (
+                            interner.string(theme_day),
+                            plan_name,
+                            [],
+                            [],
+                        )
+
+                    days_by_meal[meal_type][date_obj][2].extend(menu_items)
+                    days_by_meal[meal_type][date_obj][3].extend(
+                        [plan_name] * len(menu_items)
+                    )
+
+        for meal_type, days_by_date in days_by_meal.items():
+            processed[meal_type] = {
+                date_obj: MenuDay(date_obj, theme, plan, tuple(meals), tuple(plans))
+                for date_obj, (theme, plan, meals, plans) in days_by_date.items()
+            }
 
         # Log summary
         _LOGGER.info(
-            "Loaded %d breakfast and %d lunch menu dates",
-            len(processed["breakfast"]),
-            len(processed["lunch"]),
+            "Loaded menu dates: %s",
+            ", ".join(
+                f"{len(days)} {meal_type}" for meal_type, days in processed.items()
+            ),
         )
 
         return processed
 
+    def _resolve_sessions(
+        self, sessions: list[dict[str, Any]]
+    ) -> list[str | None]:
+        """Return the meal type key of each serving session in a payload.
+
+        Keys are looked up by ServingSessionId, or by name for sessions
+        without one, so renaming a session keeps its entities. New sessions
+        whose name contains breakfast or lunch share those keys, as every
+        such session did before sessions were discovered, and the others get
+        a key from their name. Sessions without a selected menu plan get
+        None. The index is replaced rather than updated since this can run
+        in the executor.
+        """
+        known = dict(self.sessions)
+        index = dict(self._session_index)
+        keys: list[str | None] = []
+        # Breakfast and lunch keys are named after the first session using them
+        named: set[str] = set()
+        for session in sessions:
+            # Try both field names (API inconsistency)
+            name = session.get("ServingSession") or session.get("ServingSessionKey")
+            if not name or (
+                self.selected_menu_plans
+                and not any(
+                    menu_plan.get("MenuPlanName") in self.selected_menu_plans
+                    for menu_plan in session.get("MenuPlans", [])
+                )
+            ):
+                keys.append(None)
+                continue
+
+            session_id = session.get("ServingSessionId")
+            if (key := index.get(session_id or name)) is None:
+                key = _legacy_meal_type(name)
+            if key is None:
+                key = base = slugify(name) or "session"
+                claimed = set(index.values())
+                suffix = 2
+                while key in claimed:
+                    key = f"{base}_{suffix}"
+                    suffix += 1
+            index[session_id or name] = key
+            if key not in named:
+                known[key] = ServingSession(key, name, session_id)
+                named.add(key)
+            keys.append(key)
+
+        self.sessions = known
+        self._session_index = index
+        return keys
+
     def get_menu_for_date(
-        self, meal_type: str, target_date: datetime.date
-    ) -> dict[str, Any] | None:
+        self, meal_type: str, target_date: date
+    ) -> MenuDay | None:
         """Get menu data for a specific date and meal type."""
         if not self.data:
             return None
 
         meal_data = self.data.get(meal_type, {})
         return meal_data.get(target_date)
+
+    def get_rendered_menu(
+        self, meal_type: str, target_date: date
+    ) -> RenderedDay | None:
+        """Get the display view of the menu for a date and meal type."""
+        return self._rendered.get(meal_type, {}).get(target_date)
+
+    def get_menu_dates(self, meal_type: str, start: date, end: date) -> list[date]:
+        """Get the dates from start to end, inclusive, that have menu items."""
+        if (index := self._date_index.get(meal_type)) is None:
+            return []
+        return index.between(start, end)
+
+    def get_menus(self, meal_type: str, start: date, end: date) -> list[MenuDay]:
+        """Get the menus from start to end, inclusive, that have menu items."""
+        days = (self.data or {}).get(meal_type, {})
+        return [
+            days[menu_date]
+            for menu_date in self.get_menu_dates(meal_type, start, end)
+        ]
+
+    def get_nutrition(self, meal_type: str, target_date: date) -> dict[str, Any]:
+        """Get the nutrient totals attributes for a date and meal type."""
+        return self._nutrition.get(meal_type, {}).get(target_date, {})
+
+    def find_safe_days(
+        self,
+        meal_type: str,
+        start: date,
+        end: date,
+        allergens: Iterable[str] = (),
+        restrictions: Iterable[str] = (),
+        category: str | None = CATEGORY_MAIN_ENTREE,
+    ) -> dict[date, list[str]]:
+        """Find the days with a recipe free of allergens that meets restrictions.
+
+        Returns the safe recipes in the category for each date from start to
+        end that has any. Without a category, every recipe of a day has to
+        be safe.
+        """
+        restrictions = list(restrictions)
+        if (index := self._diet_index.get(meal_type)) is None or any(
+            restriction not in self._restriction_table for restriction in restrictions
+        ):
+            return {}
+        return index.safe_days(
+            self.get_menu_dates(meal_type, start, end),
+            self._allergen_table.mask(allergens),
+            self._restriction_table.mask(restrictions),
+            category,
+        )
+
+    def find_recipe(
+        self,
+        query: str,
+        start: date,
+        end: date,
+        meal_types: Iterable[str] | None = None,
+    ) -> dict[str, dict[date, list[str]]]:
+        """Find the days from start to end that serve a recipe, per meal type.
+
+        query is a RecipeIdentifier or part of a recipe name. Returns the
+        matching recipes per date for the meal types that serve one, all of
+        them by default.
+        """
+        found: dict[str, dict[date, list[str]]] = {}
+        for meal_type in self.meal_types if meal_types is None else meal_types:
+            if (index := self._recipe_index.get(meal_type)) is None:
+                continue
+            if days := index.find(query, start, end):
+                found[meal_type] = days
+        return found
+
+    def get_next_menu_date(self, meal_type: str, start: date) -> date | None:
+        """Get the first date on or after start that has menu items."""
+        if (index := self._date_index.get(meal_type)) is None:
+            return None
+        return index.next_on_or_after(start)
+
+
+def _legacy_meal_type(name: str) -> str | None:
+    """Return the breakfast or lunch key for a session named after either."""
+    name = name.casefold()
+    return next((meal_type for meal_type in MEAL_TYPES if meal_type in name), None)
+
+
+def _meal_types(*data: dict[str, Any] | None) -> list[str]:
+    """Return the meal types in menu data, breakfast and lunch first."""
+    return list(
+        dict.fromkeys(chain(MEAL_TYPES, *(menus or {} for menus in data)))
+    )
@@ -0,0 +1,63 @@
+"""Date parsing for LinqConnect menu payloads."""
+from __future__ import annotations
+
+from collections import deque
+from datetime import date
+from functools import lru_cache
+import logging
+from typing import Any
+
+from .const import DATE_CACHE_SIZE, DATE_FAILURE_SAMPLES
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@lru_cache(maxsize=DATE_CACHE_SIZE)
+def parse_menu_date(value: str) -> date:
+    """Parse a menu date in M/D/YYYY or YYYY-MM-DD form.
+
+    The same few dates repeat across every plan and session of a payload,
+    so results are cached. Raises ValueError for anything else.
+    """
+    if "/" in value:
+        month, day, year = value.split("/")
+    else:
+        year, month, day = value.split("-")
+    if len(year) != 4:
+        raise ValueError(f"Unrecognized menu date: {value!r}")
+    return date(int(year), int(month), int(day))
+
+
+class MenuDateParser:
+    """Parse menu dates, counting the ones that fail."""
+
+    def __init__(self) -> None:
+        """Initialize the parser."""
+        self.parsed = 0
+        self.failures = 0
+        self._failed_values: deque[str] = deque(maxlen=DATE_FAILURE_SAMPLES)
+
+    def parse(self, value: Any) -> date | None:
+        """Return the date for value, or None if it can't be parsed."""
+        try:
+            menu_date = parse_menu_date(value)
+        except (AttributeError, TypeError, ValueError):
+            self.failures += 1
+            # Warn once per value rather than on every refresh
+            if (value := str(value)) not in self._failed_values:
+                _LOGGER.warning("Could not parse date: %s", value)
+                self._failed_values.append(value)
+            return None
+        self.parsed += 1
+        return menu_date
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return parsing metrics for diagnostics."""
+        cache = parse_menu_date.cache_info()
+        return {
+            "parsed": self.parsed,
+            "failures": self.failures,
+            "failed_values": list(self._failed_values),
+            "cache_hits": cache.hits,
+            "cache_misses": cache.misses,
+        }
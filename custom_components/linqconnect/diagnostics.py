@@ -0,0 +1,58 @@
+"""Diagnostics support for LinqConnect."""
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .api import ApiClientError
+from .const import DOMAIN
+from .coordinator import LinqConnectDataUpdateCoordinator
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    coordinator: LinqConnectDataUpdateCoordinator = hass.data[DOMAIN][entry.entry_id]
+
+    # Raw payloads are normally not kept in memory, so fetch one on demand
+    raw_data: dict[str, Any] | None = coordinator.raw_data
+    if raw_data is None:
+        try:
+            raw_data = {"refetched": await coordinator.client.async_get_menu()}
+        except ApiClientError as err:
+            raw_data = {"error": str(err)}
+
+    return {
+        "entry": {
+            "data": dict(entry.data),
+            "options": dict(entry.options),
+        },
+        "coordinator": {
+            "last_update_success": coordinator.last_update_success,
+            "last_fetched": coordinator.last_fetched.isoformat()
+            if coordinator.last_fetched
+            else None,
+            "raw_retention": coordinator.raw_retention,
+            "degraded": coordinator.degraded,
+            "circuit_open": coordinator.client.circuit_open,
+            "update_timings": coordinator.update_timings,
+            "fetch_window_days": coordinator.fetch_window_days,
+            "date_parsing": coordinator.date_parser.as_dict(),
+            "menu_dates": {
+                meal_type: [
+                    menu_date.isoformat()
+                    for menu_date in (coordinator.data or {}).get(meal_type, {})
+                ]
+                for meal_type in coordinator.meal_types
+            },
+            "sessions": {
+                session.key: {"name": session.name, "id": session.session_id}
+                for session in coordinator.sessions.values()
+            },
+        },
+        "raw_summary": coordinator.raw_summary,
+        "raw": raw_data,
+    }
@@ -0,0 +1,17 @@
+"""Shared entity helpers for LinqConnect."""
+from __future__ import annotations
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.helpers.device_registry import DeviceEntryType, DeviceInfo
+
+from .const import DOMAIN, MANUFACTURER
+
+
+def entry_device_info(entry: ConfigEntry) -> DeviceInfo:
+    """Return the device grouping the entities of a config entry."""
+    return DeviceInfo(
+        identifiers={(DOMAIN, entry.entry_id)},
+        name=entry.title,
+        manufacturer=MANUFACTURER,
+        entry_type=DeviceEntryType.SERVICE,
+    )
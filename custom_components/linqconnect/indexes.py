@@ -0,0 +1,287 @@
+"""Lookup indexes built over processed LinqConnect menus."""
+from __future__ import annotations
+
+from bisect import bisect_left, bisect_right
+from collections.abc import Iterable
+from dataclasses import dataclass
+from datetime import date
+
+from .models import Category, MenuDay
+
+
+class DateIndex:
+    """Sorted ordinals of the dates that have a menu.
+
+    Range queries cost O(log n + k) in the number of menu days instead of
+    probing every calendar day in the range.
+    """
+
+    __slots__ = ("_ordinals",)
+
+    def __init__(self, dates: Iterable[date]) -> None:
+        """Initialize the index."""
+        self._ordinals = sorted(menu_date.toordinal() for menu_date in dates)
+
+    def __len__(self) -> int:
+        """Return the number of indexed dates."""
+        return len(self._ordinals)
+
+    def between(self, start: date, end: date) -> list[date]:
+        """Return the indexed dates from start to end, inclusive."""
+        ordinals = self._ordinals
+        return [
+            date.fromordinal(ordinal)
+            for ordinal in ordinals[
+                bisect_left(ordinals, start.toordinal()) : bisect_right(
+                    ordinals, end.toordinal()
+                )
+            ]
+        ]
+
+    def next_on_or_after(self, start: date) -> date | None:
+        """Return the first indexed date on or after start."""
+        position = bisect_left(self._ordinals, start.toordinal())
+        if position == len(self._ordinals):
+            return None
+        return date.fromordinal(self._ordinals[position])
+
+
+class RecipeIndex:
+    """Sorted ordinals of the dates each recipe is served on.
+
+    Recipes are keyed by their normalized name and by RecipeIdentifier, so
+    finding when a dish is next served is a lookup and a bisect rather than
+    a walk over every menu day.
+    """
+
+    __slots__ = ("_names", "_identifiers")
+
+    def __init__(self, days: dict[date, MenuDay]) -> None:
+        """Initialize the index."""
+        # (display name, ordinals) per normalized name and per identifier
+        self._names: dict[str, tuple[str, list[int]]] = {}
+        self._identifiers: dict[str, tuple[str, list[int]]] = {}
+        for menu_date in sorted(days):
+            ordinal = menu_date.toordinal()
+            for category in days[menu_date].iter_categories():
+                for recipe in category.recipes:
+                    if not recipe.name:
+                        continue
+                    _add_ordinal(
+                        self._names,
+                        normalize_recipe_name(recipe.name),
+                        recipe.name,
+                        ordinal,
+                    )
+                    if recipe.identifier:
+                        _add_ordinal(
+                            self._identifiers, recipe.identifier, recipe.name, ordinal
+                        )
+
+    def __len__(self) -> int:
+        """Return the number of distinct recipe names."""
+        return len(self._names)
+
+    def find(self, query: str, start: date, end: date) -> dict[date, list[str]]:
+        """Return the recipes matching query per date from start to end.
+
+        A RecipeIdentifier matches that recipe, anything else matches every
+        recipe whose name contains it, ignoring case and spacing.
+        """
+        if (entry := self._identifiers.get(query)) is not None:
+            entries = [entry]
+        elif query := normalize_recipe_name(query):
+            entries = [entry for name, entry in self._names.items() if query in name]
+        else:
+            return {}
+
+        first, last = start.toordinal(), end.toordinal()
+        found: dict[int, list[str]] = {}
+        for name, ordinals in entries:
+            for ordinal in ordinals[
+                bisect_left(ordinals, first) : bisect_right(ordinals, last)
+            ]:
+                found.setdefault(ordinal, []).append(name)
+        return {date.fromordinal(ordinal): found[ordinal] for ordinal in sorted(found)}
+
+
+def normalize_recipe_name(name: str) -> str:
+    """Return a recipe name folded for case and whitespace insensitive lookups."""
+    return " ".join(name.casefold().split())
+
+
+def _add_ordinal(
+    index: dict[str, tuple[str, list[int]]], key: str, name: str, ordinal: int
+) -> None:
+    """Add a date ordinal to a recipe's entry, once per date."""
+    if (entry := index.get(key)) is None:
+        index[key] = (name, [ordinal])
+    elif entry[1][-1] != ordinal:
+        entry[1].append(ordinal)
+
+
+class TagTable:
+    """Bit positions for allergen or restriction IDs, assigned as first seen."""
+
+    __slots__ = ("_bits",)
+
+    def __init__(self) -> None:
+        """Initialize the table."""
+        self._bits: dict[str, int] = {}
+
+    def __len__(self) -> int:
+        """Return the number of known tags."""
+        return len(self._bits)
+
+    def __contains__(self, tag: object) -> bool:
+        """Return True if the tag has a bit."""
+        return tag in self._bits
+
+    def add(self, tags: Iterable[str]) -> int:
+        """Return the bitmask of tags, assigning bits to new ones."""
+        bits = self._bits
+        mask = 0
+        for tag in tags:
+            if (bit := bits.get(tag)) is None:
+                bit = bits[tag] = 1 << len(bits)
+            mask |= bit
+        return mask
+
+    def mask(self, tags: Iterable[str]) -> int:
+        """Return the bitmask of tags, ignoring unknown ones."""
+        mask = 0
+        for tag in tags:
+            mask |= self._bits.get(tag, 0)
+        return mask
+
+
+@dataclass(frozen=True, slots=True)
+class CategoryTags:
+    """Allergen and restriction bitmasks for the recipes of one category."""
+
+    name: str
+    # Allergens of any recipe, restrictions met by every recipe
+    allergens: int
+    restrictions: int
+    # (name, allergens, restrictions) per recipe
+    recipes: tuple[tuple[str | None, int, int], ...]
+
+    def safe_recipes(self, exclude: int, require: int) -> list[str]:
+        """Return the recipes free of exclude that meet every require."""
+        if not self.allergens & exclude and self.restrictions & require == require:
+            return [name for name, _, _ in self.recipes if name]
+        return [
+            name
+            for name, allergens, restrictions in self.recipes
+            if name and not allergens & exclude and restrictions & require == require
+        ]
+
+
+@dataclass(frozen=True, slots=True)
+class DayTags:
+    """Allergen and restriction bitmasks for one menu day."""
+
+    allergens: int
+    restrictions: int
+    categories: tuple[CategoryTags, ...]
+
+    def safe_recipes(
+        self, exclude: int, require: int, category: str | None
+    ) -> list[str]:
+        """Return the safe recipes in a category, or [] if there are none.
+
+        Without a category, every recipe of the day has to be safe.
+        """
+        if category is None:
+            if self.allergens & exclude or self.restrictions & require != require:
+                return []
+            return [
+                name
+                for category_tags in self.categories
+                for name, _, _ in category_tags.recipes
+                if name
+            ]
+        return [
+            name
+            for category_tags in self.categories
+            if category_tags.name == category
+            for name in category_tags.safe_recipes(exclude, require)
+        ]
+
+
+class DietIndex:
+    """Allergen and restriction bitmasks per menu day.
+
+    Masks are built once per changed day, so finding the days that are safe
+    for a set of allergens takes a few bitwise operations per day instead of
+    a scan of every recipe's allergen list.
+    """
+
+    __slots__ = ("days",)
+
+    def __init__(self, days: dict[date, DayTags]) -> None:
+        """Initialize the index."""
+        self.days = days
+
+    def safe_days(
+        self,
+        dates: Iterable[date],
+        exclude: int,
+        require: int,
+        category: str | None,
+    ) -> dict[date, list[str]]:
+        """Return the safe recipes per date, for the dates that have any."""
+        safe: dict[date, list[str]] = {}
+        for menu_date in dates:
+            if (day := self.days.get(menu_date)) is None:
+                continue
+            if recipes := day.safe_recipes(exclude, require, category):
+                safe[menu_date] = recipes
+        return safe
+
+
+def build_day_tags(
+    categories: Iterable[Category],
+    allergen_table: TagTable,
+    restriction_table: TagTable,
+    cache: dict[int, tuple[Category, CategoryTags]],
+) -> DayTags:
+    """Build the bitmasks for the categories served on one day.
+
+    Categories are shared between days, so their masks are cached by
+    identity in cache.
+    """
+    day_allergens = 0
+    day_restrictions = -1
+    category_tags = []
+    for category in categories:
+        cached = cache.get(id(category))
+        if cached is not None and cached[0] is category:
+            tags = cached[1]
+        else:
+            tags = _build_category_tags(category, allergen_table, restriction_table)
+            cache[id(category)] = (category, tags)
+        category_tags.append(tags)
+        day_allergens |= tags.allergens
+        day_restrictions &= tags.restrictions if tags.recipes else -1
+    return DayTags(day_allergens, max(day_restrictions, 0), tuple(category_tags))
+
+
+def _build_category_tags(
+    category: Category, allergen_table: TagTable, restriction_table: TagTable
+) -> CategoryTags:
+    """Build the bitmasks for the recipes of one category."""
+    recipes = tuple(
+        (
+            recipe.name,
+            allergen_table.add(recipe.allergens),
+            restriction_table.add(recipe.restrictions),
+        )
+        for recipe in category.recipes
+    )
+    allergens = 0
+    restrictions = -1
+    for _, recipe_allergens, recipe_restrictions in recipes:
+        allergens |= recipe_allergens
+        restrictions &= recipe_restrictions
+    return CategoryTags(category.name, allergens, max(restrictions, 0), recipes)
@@ -0,0 +1,303 @@
+"""Data model for processed LinqConnect menus."""
+from __future__ import annotations
+
+from collections.abc import Collection, Iterable, Iterator
+from dataclasses import dataclass
+from datetime import date
+from sys import intern
+from typing import Any
+
+from .const import CATEGORY_MAIN_ENTREE, MEAL_EMOJI, MEAL_EMOJI_DEFAULT
+
+
+@dataclass(frozen=True, slots=True)
+class ServingSession:
+    """A serving session offered by a school, such as breakfast or snack."""
+
+    key: str
+    name: str
+    session_id: str | None = None
+
+
+@dataclass(frozen=True, slots=True)
+class Nutrient:
+    """A nutrient value for one serving of a recipe."""
+
+    name: str
+    value: float | None
+    unit: str | None = None
+
+
+@dataclass(frozen=True, slots=True)
+class Recipe:
+    """A recipe served within a menu category."""
+
+    name: str | None
+    serving_size: str | None = None
+    identifier: str | None = None
+    nutrients: tuple[Nutrient, ...] = ()
+    allergens: tuple[str, ...] = ()
+    # Dietary and religious restriction IDs the recipe meets
+    restrictions: tuple[str, ...] = ()
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the recipe as a JSON-serializable dict."""
+        recipe: dict[str, Any] = {
+            "name": self.name,
+            "serving_size": self.serving_size,
+            "identifier": self.identifier,
+        }
+        if self.nutrients:
+            recipe["nutrients"] = {
+                nutrient.name: nutrient.value for nutrient in self.nutrients
+            }
+            if units := {
+                nutrient.name: nutrient.unit
+                for nutrient in self.nutrients
+                if nutrient.unit
+            }:
+                recipe["nutrient_units"] = units
+        if self.allergens:
+            recipe["allergens"] = list(self.allergens)
+        if self.restrictions:
+            recipe["restrictions"] = list(self.restrictions)
+        return recipe
+
+
+@dataclass(frozen=True, slots=True)
+class Category:
+    """A recipe category such as Main Entrée or Fruit."""
+
+    name: str
+    recipes: tuple[Recipe, ...]
+
+    @property
+    def recipe_names(self) -> list[str]:
+        """Return the names of the recipes in this category."""
+        return [recipe.name for recipe in self.recipes if recipe.name]
+
+
+@dataclass(frozen=True, slots=True)
+class MenuDay:
+    """The menu served for one meal type on one date."""
+
+    date: date
+    theme: str | None
+    menu_plan: str
+    meals: tuple[tuple[Category, ...], ...]
+    # Menu plan of each meal, since plans sharing a date are combined
+    meal_plans: tuple[str, ...] = ()
+
+    @property
+    def menu_plans(self) -> list[str]:
+        """Return the menu plans serving this day, in order."""
+        return list(dict.fromkeys(self.meal_plans or (self.menu_plan,)))
+
+    def iter_categories(
+        self, menu_plans: Collection[str] | None = None
+    ) -> Iterator[Category]:
+        """Iterate over the categories of every meal, or of the given plans."""
+        if menu_plans is None:
+            for categories in self.meals:
+                yield from categories
+            return
+        meal_plans = self.meal_plans or (self.menu_plan,) * len(self.meals)
+        for menu_plan, categories in zip(meal_plans, self.meals):
+            if menu_plan in menu_plans:
+                yield from categories
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the day as a JSON-serializable dict."""
+        day: dict[str, Any] = {
+            "theme": self.theme,
+            "menu_plan": self.menu_plan,
+            "items": [
+                {
+                    category.name: [recipe.as_dict() for recipe in category.recipes]
+                    for category in categories
+                }
+                for categories in self.meals
+            ],
+        }
+        if self.meal_plans:
+            day["meal_plans"] = list(self.meal_plans)
+        return day
+
+
+@dataclass(frozen=True, slots=True)
+class RenderedDay:
+    """Display-ready view of a menu day, built once per data update."""
+
+    menu: MenuDay
+    session_name: str
+    state: str
+    summary: str
+    attributes: dict[str, Any]
+    description_parts: tuple[str, ...]
+    descriptions: dict[str, str]
+
+    def description(self, line_break: str) -> str:
+        """Return the calendar description joined with line_break."""
+        description = self.descriptions.get(line_break)
+        if description is None:
+            description = line_break.join(self.description_parts)
+        return description
+
+
+def render_menu_day(
+    menu: MenuDay, meal_type: str, session_name: str, line_breaks: Iterable[str]
+) -> RenderedDay:
+    """Render the sensor attributes and calendar text for a menu day.
+
+    Days without a theme are summarized with the serving session's name.
+    """
+    # Combine all categories from all menu items
+    all_categories: dict[str, list[str]] = {}
+    for category in menu.iter_categories():
+        all_categories.setdefault(category.name, []).extend(category.recipe_names)
+
+    attributes: dict[str, Any] = {
+        "menu_plan": menu.menu_plan,
+        "theme_day": menu.theme,
+    }
+    description_parts: list[str] = []
+
+    for category_name, recipe_names in all_categories.items():
+        if not recipe_names:
+            continue
+
+        # Use a sanitized key for the attribute
+        attr_key = category_name.lower().replace(" ", "_").replace("é", "e")
+        attributes[attr_key] = recipe_names
+
+        # For main entrees, also create a formatted string
+        if category_name == CATEGORY_MAIN_ENTREE:
+            attributes["main_entree_formatted"] = ", ".join(recipe_names)
+
+        # Category header, one line per item and a blank line between categories
+        description_parts.append(f"{category_name}:")
+        description_parts.extend(f"  • {name}" for name in recipe_names)
+        description_parts.append("")
+
+    emoji = MEAL_EMOJI.get(meal_type, MEAL_EMOJI_DEFAULT)
+    return RenderedDay(
+        menu=menu,
+        session_name=session_name,
+        state=menu.theme or "Menu available",
+        summary=f"{emoji} {menu.theme or session_name}",
+        attributes=attributes,
+        description_parts=tuple(description_parts),
+        descriptions={
+            line_break: line_break.join(description_parts)
+            for line_break in line_breaks
+        },
+    )
+
+
+class MenuInterner:
+    """Share equal strings and menu objects between days.
+
+    The same recipes, categories and nutrient names recur across every day
+    and menu plan, so storing a single instance of each keeps the processed
+    menus small. Seeding the interner with existing menus makes new days
+    share their objects.
+    """
+
+    def __init__(self, menus: Iterable[MenuDay] = ()) -> None:
+        """Initialize the interner, seeded with the objects of menus."""
+        self._objects: dict[Any, Any] = {}
+        # Categories are already shared between days, so seed each once
+        categories = {
+            id(category): category
+            for menu in menus
+            for category in menu.iter_categories()
+        }
+        for category in categories.values():
+            for recipe in category.recipes:
+                for nutrient in recipe.nutrients:
+                    self._share(nutrient)
+                self._share(recipe)
+            self._share(category)
+
+    def string(self, value: str | None) -> str | None:
+        """Intern a string."""
+        return intern(value) if isinstance(value, str) else value
+
+    def nutrient(
+        self, name: str, value: float | None, unit: str | None = None
+    ) -> Nutrient:
+        """Return a shared nutrient."""
+        return self._share(Nutrient(intern(name), value, self.string(unit)))
+
+    def recipe(
+        self,
+        name: str | None,
+        serving_size: str | None,
+        identifier: str | None,
+        nutrients: tuple[Nutrient, ...],
+        allergens: tuple[str, ...],
+        restrictions: tuple[str, ...] = (),
+    ) -> Recipe:
+        """Return a shared recipe."""
+        return self._share(
+            Recipe(
+                self.string(name),
+                self.string(serving_size),
+                self.string(identifier),
+                nutrients,
+                tuple(intern(allergen) for allergen in allergens),
+                tuple(intern(restriction) for restriction in restrictions),
+            )
+        )
+
+    def category(self, name: str, recipes: tuple[Recipe, ...]) -> Category:
+        """Return a shared category."""
+        return self._share(Category(intern(name), recipes))
+
+    def _share(self, obj: Any) -> Any:
+        """Return the stored instance equal to obj, storing obj if new."""
+        return self._objects.setdefault(obj, obj)
+
+
+def menu_day_from_dict(
+    menu_date: date, stored: dict[str, Any], interner: MenuInterner
+) -> MenuDay:
+    """Rebuild a menu day from its dict form."""
+    meals = []
+    for item in stored.get("items", []):
+        categories = []
+        for category_name, recipes in item.items():
+            categories.append(
+                interner.category(
+                    category_name,
+                    tuple(
+                        interner.recipe(
+                            recipe.get("name"),
+                            recipe.get("serving_size"),
+                            recipe.get("identifier"),
+                            tuple(
+                                interner.nutrient(
+                                    name,
+                                    value,
+                                    recipe.get("nutrient_units", {}).get(name),
+                                )
+                                for name, value in recipe.get("nutrients", {}).items()
+                            ),
+                            tuple(recipe.get("allergens", ())),
+                            tuple(recipe.get("restrictions", ())),
+                        )
+                        for recipe in recipes
+                    ),
+                )
+            )
+        meals.append(tuple(categories))
+
+    return MenuDay(
+        date=menu_date,
+        theme=interner.string(stored.get("theme")),
+        menu_plan=interner.string(stored.get("menu_plan")),
+        meals=tuple(meals),
+        meal_plans=tuple(
+            interner.string(menu_plan) for menu_plan in stored.get("meal_plans", ())
+        ),
+    )
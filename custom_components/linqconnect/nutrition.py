@@ -0,0 +1,218 @@
+"""Nutrient totals for processed LinqConnect menus."""
+from __future__ import annotations
+
+from array import array
+from collections.abc import Iterable
+from datetime import date
+from itertools import zip_longest
+from math import isnan, nan
+from typing import Any
+
+from .const import (
+    ATTR_NUTRITION,
+    ATTR_NUTRITION_DAILY,
+    ATTR_NUTRITION_ROLLING,
+    ATTR_NUTRITION_UNITS,
+    NUTRITION_ROLLING_DAYS,
+)
+from .models import Category, MenuDay, Recipe
+
+# Conversion to grams for the mass units menus use
+MASS_UNITS = {
+    "kg": 1000.0,
+    "g": 1.0,
+    "mg": 0.001,
+    "mcg": 0.000001,
+    "µg": 0.000001,
+}
+
+
+class NutrientTable:
+    """Nutrient values per recipe, stored as one array column per nutrient.
+
+    Each recipe gets a row the first time it is seen and each nutrient name
+    a column with the unit it was first seen in. Values in other mass units
+    are converted to that unit when the row is added, so totals are sums of
+    plain floats. Missing values are NaN.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the table."""
+        self._columns: dict[str, int] = {}
+        self._units: list[str | None] = []
+        self._values: list[array] = []
+        self._rows: dict[Recipe, int] = {}
+        # Sums and counts of known values per category, by category identity
+        # since categories are shared between days
+        self._categories: dict[int, tuple[Category, list[float], list[int]]] = {}
+
+    @property
+    def units(self) -> dict[str, str | None]:
+        """Return the unit of each nutrient."""
+        return dict(zip(self._columns, self._units))
+
+    def row(self, recipe: Recipe) -> int:
+        """Return the row of a recipe, adding it if new."""
+        if (row := self._rows.get(recipe)) is not None:
+            return row
+
+        row = self._rows[recipe] = len(self._rows)
+        for column in self._values:
+            column.append(nan)
+        for nutrient in recipe.nutrients:
+            if nutrient.value is None:
+                continue
+            column = self._column(nutrient.name, nutrient.unit)
+            self._values[column][row] = self._convert(
+                float(nutrient.value), nutrient.unit, self._units[column]
+            )
+        return row
+
+    def retain(self, categories: Iterable[Category]) -> None:
+        """Drop the rows and category sums that categories don't reach.
+
+        Columns are kept, so totals built from the table stay valid.
+        """
+        live = {id(category): category for category in categories}
+        self._categories = {
+            key: cached
+            for key, cached in self._categories.items()
+            if live.get(key) is cached[0]
+        }
+        recipes = {recipe for category in live.values() for recipe in category.recipes}
+        kept = [(recipe, row) for recipe, row in self._rows.items() if recipe in recipes]
+        if len(kept) == len(self._rows):
+            return
+        self._rows = {recipe: row for row, (recipe, _) in enumerate(kept)}
+        self._values = [
+            array("d", (values[row] for _, row in kept)) for values in self._values
+        ]
+
+    def meal_totals(self, menu: MenuDay) -> array:
+        """Return the nutrients of one serving from each category of a meal.
+
+        Categories list alternatives, so each one contributes the average of
+        its recipes rather than their sum. Categories of the same name from
+        different menu plans are treated as one.
+        """
+        groups: dict[str, list[Category]] = {}
+        for category in menu.iter_categories():
+            groups.setdefault(category.name, []).append(category)
+
+        # Sum first, since new recipes can add columns
+        group_sums = [
+            tuple(zip(*map(self._category_sums, categories)))
+            for categories in groups.values()
+        ]
+        totals = array("d", bytes(8 * len(self._values)))
+        for sums, counts in group_sums:
+            for column, (total, count) in enumerate(
+                zip(
+                    map(sum, zip_longest(*sums, fillvalue=0.0)),
+                    map(sum, zip_longest(*counts, fillvalue=0)),
+                )
+            ):
+                if count:
+                    totals[column] += total / count
+        return totals
+
+    def attributes(self, totals: Iterable[float]) -> dict[str, float]:
+        """Return totals keyed by nutrient name."""
+        # Adding 0.0 turns the -0.0 a rolling total can round to into 0.0
+        return {
+            name: round(value, 1) + 0.0
+            for name, value in zip(self._columns, totals)
+        }
+
+    def _category_sums(self, category: Category) -> tuple[list[float], list[int]]:
+        """Return the sum and count of the known values of a category's recipes.
+
+        These only cover the columns that existed when the category was first
+        seen, which is every column its recipes have values for.
+        """
+        cached = self._categories.get(id(category))
+        if cached is not None and cached[0] is category:
+            return cached[1], cached[2]
+
+        rows = [self.row(recipe) for recipe in category.recipes]
+        sums: list[float] = []
+        counts: list[int] = []
+        for values in self._values:
+            known = [value for row in rows if not isnan(value := values[row])]
+            sums.append(sum(known))
+            counts.append(len(known))
+        self._categories[id(category)] = (category, sums, counts)
+        return sums, counts
+
+    def _column(self, name: str, unit: str | None) -> int:
+        """Return the column of a nutrient, adding it if new."""
+        if (column := self._columns.get(name)) is None:
+            column = self._columns[name] = len(self._values)
+            self._units.append(unit)
+            self._values.append(array("d", [nan]) * len(self._rows))
+        return column
+
+    @staticmethod
+    def _convert(value: float, unit: str | None, to_unit: str | None) -> float:
+        """Convert a value between mass units, leaving other units as they are."""
+        if unit == to_unit or unit not in MASS_UNITS or to_unit not in MASS_UNITS:
+            return value
+        return value * MASS_UNITS[unit] / MASS_UNITS[to_unit]
+
+
+def build_nutrition(
+    table: NutrientTable,
+    data: dict[str, dict[date, MenuDay]],
+    meal_totals: dict[str, dict[date, array]],
+) -> dict[str, dict[date, dict[str, Any]]]:
+    """Build the nutrition attributes of every meal type and day in one pass.
+
+    meal_totals holds the totals of each unchanged day's meal, and is
+    filled in for the other days. Each day gets the totals of its meal,
+    of every meal type served that day, and of its meal over the next
+    NUTRITION_ROLLING_DAYS menu days starting with it.
+    """
+    daily: dict[date, list[float]] = {}
+    for meal_type, days in data.items():
+        totals = meal_totals.setdefault(meal_type, {})
+        for menu_date, menu in days.items():
+            if menu_date not in totals:
+                totals[menu_date] = table.meal_totals(menu)
+            _add(daily.setdefault(menu_date, []), totals[menu_date])
+
+    if not table.units:
+        return {}
+
+    units = table.units
+    nutrition: dict[str, dict[date, dict[str, Any]]] = {}
+    for meal_type, days in data.items():
+        totals = meal_totals[meal_type]
+        dates = sorted(days)
+        attributes = nutrition[meal_type] = {}
+        rolling: list[float] = []
+        # Walk backwards so each window is the previous one plus a day,
+        # minus the day that fell out of it
+        for position in range(len(dates) - 1, -1, -1):
+            menu_date = dates[position]
+            _add(rolling, totals[menu_date])
+            if position + NUTRITION_ROLLING_DAYS < len(dates):
+                _add(
+                    rolling,
+                    totals[dates[position + NUTRITION_ROLLING_DAYS]],
+                    sign=-1,
+                )
+            attributes[menu_date] = {
+                ATTR_NUTRITION: table.attributes(totals[menu_date]),
+                ATTR_NUTRITION_DAILY: table.attributes(daily[menu_date]),
+                ATTR_NUTRITION_ROLLING: table.attributes(rolling),
+                ATTR_NUTRITION_UNITS: units,
+            }
+    return nutrition
+
+
+def _add(total: list[float], values: Iterable[float], sign: int = 1) -> None:
+    """Add values to a running total in place, growing it as needed."""
+    for column, value in enumerate(values):
+        if column == len(total):
+            total.append(0.0)
+        total[column] += sign * value
@@ -1,26 +1,33 @@
 """Sensor platform for LinqConnect."""
 from __future__ import annotations
 
-from datetime import datetime, time, timedelta
+from datetime import date, datetime, time, timedelta
 import logging
 from typing import Any
 
 from homeassistant.components.sensor import SensorEntity
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.event import async_track_point_in_time
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
+from homeassistant.util import dt as dt_util
 
 from .const import (
+    ATTR_NUTRITION,
+    ATTR_NUTRITION_DAILY,
+    ATTR_NUTRITION_ROLLING,
+    ATTR_NUTRITION_UNITS,
     ATTRIBUTION,
-    CATEGORY_MAIN_ENTREE,
     CONF_CUTOFF_TIME,
     DEFAULT_CUTOFF_TIME,
     DOMAIN,
-    SENSOR_BREAKFAST,
-    SENSOR_LUNCH,
+    MEAL_ICON_DEFAULT,
+    MEAL_ICONS,
 )
 from .coordinator import LinqConnectDataUpdateCoordinator
+from .entity import entry_device_info
+from .models import RenderedDay
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -32,18 +39,41 @@ async def async_setup_entry(
 ) -> None:
     """Set up LinqConnect sensors based on a config entry."""
     coordinator: LinqConnectDataUpdateCoordinator = hass.data[DOMAIN][entry.entry_id]
-
-    entities = [
-        LinqConnectMenuSensor(coordinator, entry, SENSOR_BREAKFAST),
-        LinqConnectMenuSensor(coordinator, entry, SENSOR_LUNCH),
-    ]
-
-    async_add_entities(entities)
+    added: set[str] = set()
+
+    @callback
+    def _async_add_sensors() -> None:
+        """Add sensors for serving sessions that don't have one yet."""
+        new_meal_types = [
+            meal_type for meal_type in coordinator.meal_types if meal_type not in added
+        ]
+        if not new_meal_types:
+            return
+        added.update(new_meal_types)
+        async_add_entities(
+            LinqConnectMenuSensor(coordinator, entry, meal_type)
+            for meal_type in new_meal_types
+        )
+
+    _async_add_sensors()
+    # Sessions such as snacks can first show up in a later update
+    entry.async_on_unload(coordinator.async_add_listener(_async_add_sensors))
 
 
 class LinqConnectMenuSensor(CoordinatorEntity, SensorEntity):
     """Sensor for displaying school menu information."""
 
+    # Nutrient totals are derived from the menus, and the daily and rolling
+    # ones change with neighbouring days, so keep them out of the recorder
+    _unrecorded_attributes = frozenset(
+        {
+            ATTR_NUTRITION,
+            ATTR_NUTRITION_DAILY,
+            ATTR_NUTRITION_ROLLING,
+            ATTR_NUTRITION_UNITS,
+        }
+    )
+
     def __init__(
         self,
         coordinator: LinqConnectDataUpdateCoordinator,
@@ -55,90 +85,111 @@ class LinqConnectMenuSensor(CoordinatorEntity, SensorEntity):
         self._meal_type = meal_type
         self._entry = entry
         self._attr_unique_id = f"{entry.entry_id}_{meal_type}"
-        self._attr_name = f"LinqConnect {meal_type.title()}"
+        self._attr_device_info = entry_device_info(entry)
+        self._attr_name = f"LinqConnect {coordinator.get_session_name(meal_type)}"
         self._attr_attribution = ATTRIBUTION
+        self._written_date: date | None = None
+        self._written_available: bool | None = None
+        self._unsub_rollover: CALLBACK_TYPE | None = None
+
+    async def async_added_to_hass(self) -> None:
+        """Start following the coordinator and schedule the first rollover."""
+        await super().async_added_to_hass()
+        self._async_schedule_rollover(dt_util.now())
+
+    async def async_will_remove_from_hass(self) -> None:
+        """Cancel the scheduled rollover."""
+        await super().async_will_remove_from_hass()
+        if self._unsub_rollover is not None:
+            self._unsub_rollover()
+            self._unsub_rollover = None
+
+    @callback
+    def _async_schedule_rollover(self, now: datetime) -> None:
+        """Schedule a state update at the next cutoff or midnight."""
+        self._unsub_rollover = async_track_point_in_time(
+            self.hass, self._async_rollover, self._next_rollover(now)
+        )
+
+    @callback
+    def _async_rollover(self, now: datetime) -> None:
+        """Switch to the next day's menu from the cached data, if it changed."""
+        self._async_schedule_rollover(now)
+        target_date = self._get_target_date(now)
+        if target_date != self._written_date:
+            self._written_date = target_date
+            self.async_write_ha_state()
+
+    def _next_rollover(self, now: datetime) -> datetime:
+        """Return when the target date can next change: the cutoff or midnight."""
+        now = dt_util.as_local(now)
+        cutoff = datetime.combine(
+            now.date(), self._get_cutoff_time(), tzinfo=now.tzinfo
+        )
+        if now < cutoff:
+            return cutoff
+        return dt_util.start_of_local_day(now.date() + timedelta(days=1))
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write state only if the menu this sensor shows may have changed."""
+        target_date = self._get_target_date()
+        available = self.available
+        if (
+            target_date == self._written_date
+            and available == self._written_available
+            and target_date
+            not in self.coordinator.changed_dates.get(self._meal_type, ())
+        ):
+            return
+
+        self._written_date = target_date
+        self._written_available = available
+        super()._handle_coordinator_update()
 
     @property
     def icon(self) -> str:
         """Return the icon for the sensor."""
-        if self._meal_type == SENSOR_BREAKFAST:
-            return "mdi:food-croissant"
-        return "mdi:food"
+        return MEAL_ICONS.get(self._meal_type, MEAL_ICON_DEFAULT)
 
     @property
     def native_value(self) -> str | None:
         """Return the state of the sensor."""
-        menu_data = self._get_relevant_menu()
-        if not menu_data:
+        menu_view = self._get_relevant_menu()
+        if not menu_view:
             return "No menu available"
 
-        theme = menu_data.get("theme")
-        if theme:
-            return theme
-
-        return "Menu available"
+        return menu_view.state
 
     @property
     def extra_state_attributes(self) -> dict[str, Any]:
         """Return the state attributes."""
-        menu_data = self._get_relevant_menu()
-        if not menu_data:
+        menu_view = self._get_relevant_menu()
+        if not menu_view:
             return {}
 
-        attributes = {
-            "menu_plan": menu_data.get("menu_plan"),
-            "theme_day": menu_data.get("theme"),
-        }
+        if nutrition := self.coordinator.get_nutrition(
+            self._meal_type, menu_view.menu.date
+        ):
+            return {**menu_view.attributes, **nutrition}
+        return menu_view.attributes
 
-        # Organize items by category
-        items = menu_data.get("items", [])
-        if items:
-            # Combine all categories from all menu items
-            all_categories = {}
-            for item in items:
-                for category_name, recipes in item.items():
-                    if category_name not in all_categories:
-                        all_categories[category_name] = []
-                    all_categories[category_name].extend(recipes)
-
-            # Add each category as an attribute
-            for category_name, recipes in all_categories.items():
-                # Create a list of recipe names
-                recipe_names = [recipe["name"] for recipe in recipes if recipe.get("name")]
-                if recipe_names:
-                    # Use a sanitized key for the attribute
-                    attr_key = category_name.lower().replace(" ", "_").replace("é", "e")
-                    attributes[attr_key] = recipe_names
-
-                    # For main entrees, also create a formatted string
-                    if category_name == CATEGORY_MAIN_ENTREE:
-                        attributes["main_entree_formatted"] = ", ".join(recipe_names)
-
-        return attributes
-
-    def _get_relevant_menu(self) -> dict[str, Any] | None:
+    def _get_relevant_menu(self) -> RenderedDay | None:
         """Get the menu for today or tomorrow based on cutoff time."""
         target_date = self._get_target_date()
-        menu = self.coordinator.get_menu_for_date(self._meal_type, target_date)
+        menu = self.coordinator.get_rendered_menu(self._meal_type, target_date)
         if not menu:
             _LOGGER.debug("No %s menu available for %s", self._meal_type, target_date)
         return menu
 
-    def _get_target_date(self) -> datetime.date:
+    def _get_target_date(self, now: datetime | None = None) -> date:
         """Determine which date's menu to show based on cutoff time."""
-        now = datetime.now()
-        cutoff_time = self._entry.options.get(CONF_CUTOFF_TIME, DEFAULT_CUTOFF_TIME)
-
-        # Parse cutoff time if it's a string
-        if isinstance(cutoff_time, str):
-            try:
-                hour, minute = cutoff_time.split(":")
-                cutoff_time = time(int(hour), int(minute))
-            except (ValueError, AttributeError):
-                cutoff_time = DEFAULT_CUTOFF_TIME
+        now = dt_util.as_local(now) if now is not None else dt_util.now()
 
         # Create a datetime for today's cutoff
-        cutoff_datetime = datetime.combine(now.date(), cutoff_time)
+        cutoff_datetime = datetime.combine(
+            now.date(), self._get_cutoff_time(), tzinfo=now.tzinfo
+        )
 
         # If we're past the cutoff time, show tomorrow's menu
         if now >= cutoff_datetime:
@@ -147,3 +198,17 @@ class LinqConnectMenuSensor(CoordinatorEntity, SensorEntity):
             target_date = now.date()
 
         return target_date
+
+    def _get_cutoff_time(self) -> time:
+        """Return the configured cutoff time."""
+        cutoff_time = self._entry.options.get(CONF_CUTOFF_TIME, DEFAULT_CUTOFF_TIME)
+
+        # Parse cutoff time if it's a string
+        if isinstance(cutoff_time, str):
+            try:
+                hour, minute = cutoff_time.split(":")
+                cutoff_time = time(int(hour), int(minute))
+            except (ValueError, AttributeError):
+                cutoff_time = DEFAULT_CUTOFF_TIME
+
+        return cutoff_time
@@ -0,0 +1,301 @@
+"""Services for the LinqConnect integration."""
+from __future__ import annotations
+
+from datetime import timedelta
+import logging
+from typing import Any
+
+import voluptuous as vol
+
+from homeassistant.config_entries import ConfigEntry, ConfigEntryState
+from homeassistant.const import ATTR_DEVICE_ID
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+    callback,
+)
+from homeassistant.exceptions import ServiceValidationError
+from homeassistant.helpers import device_registry as dr
+import homeassistant.helpers.config_validation as cv
+from homeassistant.util import dt as dt_util
+
+from .broker import async_get_broker
+from .const import (
+    ATTR_ALLERGENS,
+    ATTR_CATEGORY,
+    ATTR_CONFIG_ENTRY_ID,
+    ATTR_END_DATE,
+    ATTR_MEAL_TYPE,
+    ATTR_MENU_PLAN,
+    ATTR_RECIPE,
+    ATTR_RESTRICTIONS,
+    ATTR_START_DATE,
+    CATEGORY_ALL,
+    CATEGORY_MAIN_ENTREE,
+    DOMAIN,
+    MAX_CALENDAR_DAYS,
+    SENSOR_LUNCH,
+    SERVICE_FIND_RECIPE,
+    SERVICE_FIND_SAFE_DAYS,
+    SERVICE_FORCE_UPDATE,
+    SERVICE_GET_MENU,
+)
+from .coordinator import LinqConnectDataUpdateCoordinator
+from .models import MenuDay
+
+_LOGGER = logging.getLogger(__name__)
+
+FIND_SAFE_DAYS_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_CONFIG_ENTRY_ID): vol.All(cv.ensure_list, [cv.string]),
+        vol.Optional(ATTR_MEAL_TYPE, default=SENSOR_LUNCH): cv.string,
+        vol.Optional(ATTR_ALLERGENS, default=[]): vol.All(
+            cv.ensure_list, [cv.string]
+        ),
+        vol.Optional(ATTR_RESTRICTIONS, default=[]): vol.All(
+            cv.ensure_list, [cv.string]
+        ),
+        vol.Optional(ATTR_CATEGORY, default=CATEGORY_MAIN_ENTREE): cv.string,
+        vol.Optional(ATTR_START_DATE): cv.date,
+        vol.Optional(ATTR_END_DATE): cv.date,
+    }
+)
+
+FIND_RECIPE_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_CONFIG_ENTRY_ID): vol.All(cv.ensure_list, [cv.string]),
+        vol.Required(ATTR_RECIPE): cv.string,
+        vol.Optional(ATTR_MEAL_TYPE): vol.All(cv.ensure_list, [cv.string]),
+        vol.Optional(ATTR_START_DATE): cv.date,
+        vol.Optional(ATTR_END_DATE): cv.date,
+    }
+)
+
+GET_MENU_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_CONFIG_ENTRY_ID): vol.All(cv.ensure_list, [cv.string]),
+        vol.Optional(ATTR_MEAL_TYPE): vol.All(cv.ensure_list, [cv.string]),
+        vol.Optional(ATTR_MENU_PLAN): vol.All(cv.ensure_list, [cv.string]),
+        vol.Optional(ATTR_CATEGORY): vol.All(cv.ensure_list, [cv.string]),
+        vol.Optional(ATTR_START_DATE): cv.date,
+        vol.Optional(ATTR_END_DATE): cv.date,
+    }
+)
+
+FORCE_UPDATE_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_CONFIG_ENTRY_ID): vol.All(cv.ensure_list, [cv.string]),
+        vol.Optional(ATTR_DEVICE_ID): vol.All(cv.ensure_list, [cv.string]),
+        vol.Optional(ATTR_START_DATE): cv.date,
+        vol.Optional(ATTR_END_DATE): cv.date,
+    }
+)
+
+
+@callback
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the LinqConnect services."""
+
+    async def async_find_safe_days(call: ServiceCall) -> ServiceResponse:
+        """Find the upcoming days with a recipe safe for the given allergens."""
+        start = call.data.get(ATTR_START_DATE, dt_util.now().date())
+        end = call.data.get(ATTR_END_DATE, start + timedelta(days=MAX_CALENDAR_DAYS))
+        category = call.data[ATTR_CATEGORY]
+        return {
+            entry.entry_id: {
+                "name": entry.title,
+                "days": [
+                    {"date": menu_date.isoformat(), "recipes": recipes}
+                    for menu_date, recipes in coordinator.find_safe_days(
+                        call.data[ATTR_MEAL_TYPE],
+                        start,
+                        end,
+                        allergens=call.data[ATTR_ALLERGENS],
+                        restrictions=call.data[ATTR_RESTRICTIONS],
+                        category=None if category == CATEGORY_ALL else category,
+                    ).items()
+                ],
+            }
+            for entry, coordinator in async_get_coordinators(hass, call)
+        }
+
+    async def async_find_recipe(call: ServiceCall) -> ServiceResponse:
+        """Find the upcoming days that serve a recipe."""
+        start = call.data.get(ATTR_START_DATE, dt_util.now().date())
+        end = call.data.get(ATTR_END_DATE, start + timedelta(days=MAX_CALENDAR_DAYS))
+        response = {}
+        for entry, coordinator in async_get_coordinators(hass, call):
+            found = coordinator.find_recipe(
+                call.data[ATTR_RECIPE], start, end, call.data.get(ATTR_MEAL_TYPE)
+            )
+            days = [
+                (menu_date, meal_type, recipes)
+                for meal_type, dates in found.items()
+                for menu_date, recipes in dates.items()
+            ]
+            # Earliest first, in meal type order within a day
+            days.sort(key=lambda day: day[0])
+            response[entry.entry_id] = {
+                "name": entry.title,
+                "days": [
+                    {
+                        "date": menu_date.isoformat(),
+                        "meal_type": meal_type,
+                        "recipes": recipes,
+                    }
+                    for menu_date, meal_type, recipes in days
+                ],
+            }
+        return response
+
+    async def async_get_menu(call: ServiceCall) -> ServiceResponse:
+        """Return the menus from the processed data, without fetching."""
+        start = call.data.get(ATTR_START_DATE, dt_util.now().date())
+        end = call.data.get(ATTR_END_DATE, start)
+        menu_plans = call.data.get(ATTR_MENU_PLAN)
+        categories = call.data.get(ATTR_CATEGORY)
+        response = {}
+        for entry, coordinator in async_get_coordinators(hass, call):
+            days = [
+                (menu.date, meal_type, menu)
+                for meal_type in call.data.get(ATTR_MEAL_TYPE, coordinator.meal_types)
+                for menu in coordinator.get_menus(meal_type, start, end)
+            ]
+            # Earliest first, in meal type order within a day
+            days.sort(key=lambda day: day[0])
+            response[entry.entry_id] = {
+                "name": entry.title,
+                "days": [
+                    day
+                    for _, meal_type, menu in days
+                    if (
+                        day := _menu_response(menu, meal_type, menu_plans, categories)
+                    )
+                ],
+            }
+        return response
+
+    async def async_force_update(call: ServiceCall) -> None:
+        """Refetch menus now, only those in the given date range if any."""
+        start = call.data.get(ATTR_START_DATE)
+        end = call.data.get(ATTR_END_DATE)
+        if start is not None and end is not None and end < start:
+            raise ServiceValidationError("The end date is before the start date")
+        coordinators = [
+            coordinator for _, coordinator in async_get_coordinators(hass, call)
+        ]
+        _LOGGER.info(
+            "Force update requested for %d entries from %s to %s",
+            len(coordinators),
+            start or "today",
+            end or "the last calendar day",
+        )
+        await async_get_broker(hass).async_force_refresh(coordinators, start, end)
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_FIND_SAFE_DAYS,
+        async_find_safe_days,
+        schema=FIND_SAFE_DAYS_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_FIND_RECIPE,
+        async_find_recipe,
+        schema=FIND_RECIPE_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_GET_MENU,
+        async_get_menu,
+        schema=GET_MENU_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_FORCE_UPDATE,
+        async_force_update,
+        schema=FORCE_UPDATE_SCHEMA,
+    )
+
+
+@callback
+def async_get_coordinators(
+    hass: HomeAssistant, call: ServiceCall
+) -> list[tuple[ConfigEntry, LinqConnectDataUpdateCoordinator]]:
+    """Return the loaded entries a service call targets, all of them by default.
+
+    Entries are targeted by ID, or through the devices of their entities.
+    """
+    entry_ids = call.data.get(ATTR_CONFIG_ENTRY_ID)
+    if (device_ids := call.data.get(ATTR_DEVICE_ID)) is not None:
+        entry_ids = list(entry_ids or ())
+        device_registry = dr.async_get(hass)
+        for device_id in device_ids:
+            device = device_registry.async_get(device_id)
+            if device is None or not any(
+                identifier[0] == DOMAIN for identifier in device.identifiers
+            ):
+                raise ServiceValidationError(
+                    f"Unknown LinqConnect device: {device_id}"
+                )
+            entry_ids.extend(
+                entry_id
+                for entry_id in device.config_entries
+                if (entry := hass.config_entries.async_get_entry(entry_id))
+                and entry.domain == DOMAIN
+            )
+        entry_ids = list(dict.fromkeys(entry_ids))
+    entries = []
+    for entry_id in entry_ids or ():
+        entry = hass.config_entries.async_get_entry(entry_id)
+        if entry is None or entry.domain != DOMAIN:
+            raise ServiceValidationError(f"Unknown LinqConnect entry: {entry_id}")
+        if entry.state is not ConfigEntryState.LOADED:
+            raise ServiceValidationError(f"LinqConnect entry not loaded: {entry_id}")
+        entries.append(entry)
+    if entry_ids is None:
+        entries = [
+            entry
+            for entry in hass.config_entries.async_entries(DOMAIN)
+            if entry.state is ConfigEntryState.LOADED
+        ]
+
+    return [(entry, hass.data[DOMAIN][entry.entry_id]) for entry in entries]
+
+
+def _menu_response(
+    menu: MenuDay,
+    meal_type: str,
+    menu_plans: list[str] | None,
+    categories: list[str] | None,
+) -> dict[str, Any] | None:
+    """Return a menu day as service response data, or None if nothing is left.
+
+    Categories of the same name from different meals are combined, and
+    only the meals of the given plans and the given categories are kept
+    when there are any.
+    """
+    recipes: dict[str, list[dict[str, Any]]] = {}
+    for category in menu.iter_categories(menu_plans):
+        if categories is None or category.name in categories:
+            recipes.setdefault(category.name, []).extend(
+                recipe.as_dict() for recipe in category.recipes
+            )
+    if not recipes:
+        return None
+    return {
+        "date": menu.date.isoformat(),
+        "meal_type": meal_type,
+        "menu_plans": [
+            menu_plan
+            for menu_plan in menu.menu_plans
+            if menu_plans is None or menu_plan in menu_plans
+        ],
+        "theme": menu.theme,
+        "categories": recipes,
+    }
@@ -0,0 +1,171 @@
+"""Persistent menu cache for LinqConnect."""
+from __future__ import annotations
+
+from datetime import date, datetime, timedelta
+import logging
+from typing import Any, NamedTuple
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN, MEAL_TYPES
+from .models import MenuDay, MenuInterner, ServingSession, menu_day_from_dict
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_VERSION = 2
+STORAGE_KEY = f"{DOMAIN}.menu_cache"
+
+# Delay before writing the cache to disk, so back-to-back refreshes only
+# produce a single write
+SAVE_DELAY = 10
+
+
+def build_cache_key(
+    district_id: str, building_id: str, menu_plans: list[str]
+) -> str:
+    """Build the key identifying which menus a cache file holds."""
+    return "|".join([district_id, building_id, *sorted(menu_plans)])
+
+
+class CachedMenus(NamedTuple):
+    """Menu data loaded from disk."""
+
+    data: dict[str, dict[date, MenuDay]]
+    fetched_at: datetime
+    fetched_dates: dict[date, datetime]
+    sessions: dict[str, ServingSession]
+    session_index: dict[str, str]
+
+
+class _MenuCacheStore(Store[dict[str, Any]]):
+    """Store migrating menu caches written by older versions."""
+
+    async def _async_migrate_func(
+        self,
+        old_major_version: int,
+        old_minor_version: int,
+        old_data: dict[str, Any],
+    ) -> dict[str, Any]:
+        """Migrate the cache to the current version."""
+        if old_major_version == 1:
+            # Version 1 caches have no serving sessions, which entity names
+            # and meal type keys come from, so their menus are refetched
+            return {}
+        raise NotImplementedError
+
+
+class LinqConnectMenuStore:
+    """Versioned on-disk store of processed menu data for a config entry."""
+
+    def __init__(self, hass: HomeAssistant, entry_id: str, cache_key: str) -> None:
+        """Initialize the store."""
+        self._store: Store[dict[str, Any]] = _MenuCacheStore(
+            hass, STORAGE_VERSION, f"{STORAGE_KEY}.{entry_id}"
+        )
+        self._cache_key = cache_key
+
+    async def async_load(self, max_age: timedelta) -> CachedMenus | None:
+        """Load cached menu data if it matches this entry and is fresh enough."""
+        try:
+            stored = await self._store.async_load()
+        except Exception as err:  # pylint: disable=broad-except
+            _LOGGER.warning("Could not read cached menu data: %s", err)
+            return None
+
+        if not stored:
+            return None
+
+        if stored.get("key") != self._cache_key:
+            _LOGGER.debug("Ignoring cached menu data for a different configuration")
+            return None
+
+        fetched_at = dt_util.parse_datetime(stored.get("fetched_at") or "")
+        if fetched_at is None:
+            return None
+
+        age = dt_util.utcnow() - fetched_at
+        if age > max_age:
+            _LOGGER.debug("Ignoring cached menu data older than %s (%s)", max_age, age)
+            return None
+
+        try:
+            data = deserialize_menu_data(stored["data"])
+            fetched_dates = {
+                date.fromisoformat(date_str): datetime.fromisoformat(timestamp)
+                for date_str, timestamp in stored.get("fetched", {}).items()
+            }
+            sessions = deserialize_sessions(stored["sessions"])
+            session_index = dict(stored["session_index"])
+        except (KeyError, TypeError, ValueError) as err:
+            _LOGGER.warning("Discarding unreadable cached menu data: %s", err)
+            return None
+
+        return CachedMenus(data, fetched_at, fetched_dates, sessions, session_index)
+
+    def async_schedule_save(
+        self,
+        data: dict[str, dict[date, MenuDay]],
+        fetched_at: datetime,
+        fetched_dates: dict[date, datetime],
+        sessions: dict[str, ServingSession],
+        session_index: dict[str, str],
+    ) -> None:
+        """Schedule writing processed menu data and its sessions to disk."""
+        self._store.async_delay_save(
+            lambda: {
+                "key": self._cache_key,
+                "fetched_at": fetched_at.isoformat(),
+                "fetched": {
+                    menu_date.isoformat(): timestamp.isoformat()
+                    for menu_date, timestamp in fetched_dates.items()
+                },
+                "data": serialize_menu_data(data),
+                "sessions": serialize_sessions(sessions),
+                "session_index": dict(session_index),
+            },
+            SAVE_DELAY,
+        )
+
+    async def async_remove(self) -> None:
+        """Remove the cache file."""
+        await self._store.async_remove()
+
+
+def serialize_menu_data(data: dict[str, dict[date, MenuDay]]) -> dict[str, Any]:
+    """Convert processed menu data into a JSON-serializable dict."""
+    return {
+        meal_type: {
+            menu_date.isoformat(): menu.as_dict() for menu_date, menu in days.items()
+        }
+        for meal_type, days in data.items()
+    }
+
+
+def deserialize_menu_data(stored: dict[str, Any]) -> dict[str, dict[date, MenuDay]]:
+    """Convert stored menu data back into the processed format."""
+    interner = MenuInterner()
+    data: dict[str, dict[date, MenuDay]] = {meal_type: {} for meal_type in MEAL_TYPES}
+    for meal_type, days in stored.items():
+        data[meal_type] = {}
+        for date_str, menu in days.items():
+            menu_date = date.fromisoformat(date_str)
+            data[meal_type][menu_date] = menu_day_from_dict(menu_date, menu, interner)
+    return data
+
+
+def serialize_sessions(sessions: dict[str, ServingSession]) -> dict[str, Any]:
+    """Convert serving sessions into a JSON-serializable dict."""
+    return {
+        key: {"name": session.name, "session_id": session.session_id}
+        for key, session in sessions.items()
+    }
+
+
+def deserialize_sessions(stored: dict[str, Any]) -> dict[str, ServingSession]:
+    """Convert stored serving sessions back into their meal type keys."""
+    return {
+        key: ServingSession(key, session["name"], session.get("session_id"))
+        for key, session in stored.items()
+    }
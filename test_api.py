@@ -2,17 +2,41 @@
 """
 Standalone test script for LinqConnect API.
 Run this to test the API and data parsing without Home Assistant.
+
+Set LINQCONNECT_API_URL, LINQCONNECT_DISTRICT_ID and LINQCONNECT_BUILDING_ID
+to test against another server, for example the local mock:
+
+    python -m tests.mock_server &
+    LINQCONNECT_API_URL=http://127.0.0.1:8080/api/FamilyMenu \
+    LINQCONNECT_DISTRICT_ID=mock-district LINQCONNECT_BUILDING_ID=mock-building \
+    python3 test_api.py
+
+Live responses are saved to live_response.json, which git ignores. To
+refresh the test_response.json fixture used by the tests and benchmarks,
+set LINQCONNECT_RESPONSE_FILE=test_response.json.
 """
 import asyncio
 import aiohttp
 from datetime import datetime, timedelta
 import json
+import os
+from pathlib import Path
 import sys
 
 # Your credentials
-DISTRICT_ID = "8571dba1-79cf-eb11-a2c4-f81ec5475527"
-BUILDING_ID = "b812a68d-5ed4-eb11-a2c4-87353d5bc03e"
-API_URL = "https://api.linqconnect.com/api/FamilyMenu"
+DISTRICT_ID = os.environ.get(
+    "LINQCONNECT_DISTRICT_ID", "8571dba1-79cf-eb11-a2c4-f81ec5475527"
+)
+BUILDING_ID = os.environ.get(
+    "LINQCONNECT_BUILDING_ID", "b812a68d-5ed4-eb11-a2c4-87353d5bc03e"
+)
+LIVE_API_URL = "https://api.linqconnect.com/api/FamilyMenu"
+API_URL = os.environ.get("LINQCONNECT_API_URL", LIVE_API_URL)
+
+# Live responses are saved next to this script, away from the test fixture
+RESPONSE_FILE = Path(__file__).parent / os.environ.get(
+    "LINQCONNECT_RESPONSE_FILE", "live_response.json"
+)
 
 
 async def test_api():
@@ -50,9 +74,10 @@ async def test_api():
                 data = await response.json()
 
                 # Save raw response for inspection
-                with open("/Users/coltonshaw/development/linqconnect/test_response.json", "w") as f:
-                    json.dump(data, f, indent=2)
-                print("💾 Raw response saved to test_response.json")
+                if API_URL == LIVE_API_URL:
+                    with open(RESPONSE_FILE, "w") as f:
+                        json.dump(data, f, indent=2)
+                    print(f"💾 Raw response saved to {RESPONSE_FILE}")
 
                 # Process the data like the coordinator does
                 print("\n" + "=" * 80)
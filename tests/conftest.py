@@ -0,0 +1,17 @@
+"""Shared fixtures for LinqConnect tests."""
+import asyncio
+
+import pytest
+
+
+class ExecutorHass:
+    """Just enough of Home Assistant to run executor jobs."""
+
+    def async_add_executor_job(self, target, *args):
+        return asyncio.get_running_loop().run_in_executor(None, target, *args)
+
+
+@pytest.fixture
+def executor_hass():
+    """Return a stand-in for hass that runs executor jobs."""
+    return ExecutorHass()
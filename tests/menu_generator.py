@@ -0,0 +1,213 @@
+"""Synthetic FamilyMenu payloads for tests and benchmarks.
+
+Payloads follow the shape of ``test_response.json``: serving sessions hold
+menu plans, plans hold school days, and days hold a themed meal made of
+recipe categories. Recipes carry nutrients and allergens. Menus repeat on
+a four week cycle drawn from a shared recipe pool, the way district menus
+do, and the same seed always produces the same payload.
+"""
+from __future__ import annotations
+
+import base64
+from collections.abc import Sequence
+from datetime import date, timedelta
+import random
+from typing import Any
+import uuid
+
+SESSIONS = ("Breakfast", "Lunch", "Snack")
+
+CATEGORIES = (
+    ("Main Entrée", "#1e1b7d"),
+    ("Grain", "#b8860b"),
+    ("Vegetable", "#2e8b57"),
+    ("Fruit", "#dc143c"),
+    ("Milk", "#4682b4"),
+    ("Condiment", "#696969"),
+)
+
+# (name, unit, abbreviation)
+NUTRIENTS = (
+    ("Calories", "kcal", "Cal"),
+    ("Protein", "g", "Prot"),
+    ("Total Carbohydrate", "g", "Carb"),
+    ("Total Fat", "g", "Fat"),
+    ("Sodium", "mg", "Na"),
+)
+
+WEEKDAYS = ("Monday", "Tuesday", "Wednesday", "Thursday", "Friday")
+
+# School days in one menu cycle
+CYCLE_DAYS = 20
+
+
+def generate_family_menu(
+    start: date,
+    school_days: int = 22,
+    plans_per_session: int = 2,
+    sessions: Sequence[str] = SESSIONS,
+    recipes_per_category: int = 2,
+    recipe_pool: int = 150,
+    nutrients: Sequence[tuple[str, str, str]] = NUTRIENTS,
+    allergens: int = 10,
+    weekends: bool = False,
+    seed: int = 0,
+) -> dict[str, Any]:
+    """Build a FamilyMenu payload of the given size.
+
+    Every plan covers the same school days starting at start, skipping
+    weekends unless weekends is set.
+    """
+    rng = random.Random(seed)
+    allergen_ids = [_guid(rng) for _ in range(allergens)]
+    recipes = [
+        _recipe(rng, number, nutrients, allergen_ids) for number in range(recipe_pool)
+    ]
+    calendar_id = _guid(rng)
+    dates = _school_dates(start, school_days, weekends)
+
+    family_sessions = []
+    for session_name in sessions:
+        menu_plans = []
+        for plan_number in range(plans_per_session):
+            plan_name = f"{session_name} Plan {plan_number}"
+            cycle = [
+                _menu_meal(rng, plan_name, cycle_day, recipes, recipes_per_category)
+                for cycle_day in range(CYCLE_DAYS)
+            ]
+            menu_plans.append(
+                {
+                    "MenuPlanName": plan_name,
+                    "MenuPlanId": _guid(rng),
+                    "AcademicCalenderId": calendar_id,
+                    "Days": [
+                        {
+                            "Date": format_menu_date(menu_date),
+                            "MenuMeals": [cycle[day_number % CYCLE_DAYS]],
+                        }
+                        for day_number, menu_date in enumerate(dates)
+                    ],
+                }
+            )
+
+        family_sessions.append(
+            {
+                "ServingSessionKey": base64.b64encode(session_name.encode()).decode(),
+                "ServingSessionId": _guid(rng),
+                "ServingSession": session_name,
+                "MenuPlans": menu_plans,
+            }
+        )
+
+    return {
+        "FamilyMenuSessions": family_sessions,
+        "AcademicCalendars": [{"AcademicCalendarId": calendar_id, "Days": []}],
+    }
+
+
+def filter_family_menu(
+    payload: dict[str, Any], start: date, end: date
+) -> dict[str, Any]:
+    """Return the payload limited to days between start and end inclusive."""
+    return {
+        **payload,
+        "FamilyMenuSessions": [
+            {
+                **session,
+                "MenuPlans": [
+                    {
+                        **menu_plan,
+                        "Days": [
+                            day
+                            for day in menu_plan["Days"]
+                            if start <= parse_menu_date(day["Date"]) <= end
+                        ],
+                    }
+                    for menu_plan in session["MenuPlans"]
+                ],
+            }
+            for session in payload["FamilyMenuSessions"]
+        ],
+    }
+
+
+def format_menu_date(menu_date: date) -> str:
+    """Format a date the way FamilyMenu responses do (M/D/YYYY)."""
+    return f"{menu_date.month}/{menu_date.day}/{menu_date.year}"
+
+
+def parse_menu_date(date_str: str) -> date:
+    """Parse a FamilyMenu date (M/D/YYYY)."""
+    month, day, year = date_str.split("/")
+    return date(int(year), int(month), int(day))
+
+
+def _school_dates(start: date, count: int, weekends: bool) -> list[date]:
+    """Return count consecutive school days from start."""
+    dates: list[date] = []
+    menu_date = start
+    while len(dates) < count:
+        if weekends or menu_date.weekday() < 5:
+            dates.append(menu_date)
+        menu_date += timedelta(days=1)
+    return dates
+
+
+def _guid(rng: random.Random) -> str:
+    """Return a reproducible GUID."""
+    return str(uuid.UUID(int=rng.getrandbits(128)))
+
+
+def _recipe(
+    rng: random.Random,
+    number: int,
+    nutrients: Sequence[tuple[str, str, str]],
+    allergen_ids: list[str],
+) -> dict[str, Any]:
+    """Build one recipe."""
+    return {
+        "ItemId": _guid(rng),
+        "RecipeIdentifier": f"R-{number:05d}",
+        "RecipeName": f"Recipe {number}",
+        "ServingSize": f"{rng.randint(1, 8)} oz",
+        "GramPerServing": round(rng.uniform(20, 250), 6),
+        "Nutrients": [
+            {
+                "Name": name,
+                "Value": round(rng.uniform(0, 400), 1),
+                "HasMissingNutrients": False,
+                "Unit": unit,
+                "Abbreviation": abbreviation,
+            }
+            for name, unit, abbreviation in nutrients
+        ],
+        "Allergens": rng.sample(allergen_ids, rng.randint(0, min(3, len(allergen_ids)))),
+        "ReligiousRestrictions": [],
+        "DietaryRestrictions": [],
+        "HasNutrients": bool(nutrients),
+    }
+
+
+def _menu_meal(
+    rng: random.Random,
+    plan_name: str,
+    cycle_day: int,
+    recipes: list[dict[str, Any]],
+    recipes_per_category: int,
+) -> dict[str, Any]:
+    """Build the meal served on one day of the menu cycle."""
+    return {
+        "MenuPlanName": plan_name,
+        "MenuMealName": (
+            f"Week {cycle_day // 5 + 1} {WEEKDAYS[cycle_day % 5]}"
+        ),
+        "MenuMealId": _guid(rng),
+        "RecipeCategories": [
+            {
+                "CategoryName": category_name,
+                "Color": color,
+                "Recipes": rng.sample(recipes, min(recipes_per_category, len(recipes))),
+            }
+            for category_name, color in CATEGORIES
+        ],
+    }
@@ -0,0 +1,164 @@
+"""Local mock of the LinqConnect FamilyMenu API.
+
+Serves generated or recorded FamilyMenu payloads filtered to the requested
+date window, with configurable latency and failures, so the API client and
+coordinator can be exercised offline. Run it standalone for manual testing:
+
+    python -m tests.mock_server --port 8080 --school-days 180 --plans 10
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+from collections import deque
+from datetime import date
+import hashlib
+import json
+import random
+from typing import Any
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from .menu_generator import filter_family_menu, generate_family_menu
+
+FAMILY_MENU_PATH = "/api/FamilyMenu"
+
+MOCK_DISTRICT_ID = "mock-district"
+MOCK_BUILDING_ID = "mock-building"
+
+
+class MockLinqConnectServer:
+    """FamilyMenu API served from a local aiohttp server."""
+
+    def __init__(
+        self,
+        payload: dict[str, Any] | None = None,
+        district_id: str = MOCK_DISTRICT_ID,
+        building_id: str = MOCK_BUILDING_ID,
+        latency: float = 0,
+        failures: list[int] | None = None,
+        error_rate: float = 0,
+        seed: int = 0,
+    ) -> None:
+        """Initialize the server.
+
+        failures lists HTTP statuses returned, in order, by the next
+        requests. error_rate makes any other request fail with a 503 at
+        that probability. Responses carry an ETag and honour If-None-Match.
+        """
+        self.payload = payload or generate_family_menu(date.today())
+        self.district_id = district_id
+        self.building_id = building_id
+        self.latency = latency
+        self.failures = deque(failures or ())
+        self.error_rate = error_rate
+        self.requests: list[dict[str, str]] = []
+        self._rng = random.Random(seed)
+        self._server: TestServer | None = None
+
+    @property
+    def url(self) -> str:
+        """Return the FamilyMenu endpoint URL."""
+        assert self._server is not None, "server is not started"
+        return str(self._server.make_url(FAMILY_MENU_PATH))
+
+    def create_app(self) -> web.Application:
+        """Create the aiohttp application."""
+        app = web.Application()
+        app.router.add_get(FAMILY_MENU_PATH, self._handle_family_menu)
+        return app
+
+    async def start(self) -> None:
+        """Start serving on a free local port."""
+        self._server = TestServer(self.create_app(), host="127.0.0.1")
+        await self._server.start_server()
+
+    async def close(self) -> None:
+        """Stop the server."""
+        if self._server is not None:
+            await self._server.close()
+            self._server = None
+
+    async def __aenter__(self) -> MockLinqConnectServer:
+        """Start the server for the duration of a context."""
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        """Stop the server."""
+        await self.close()
+
+    async def _handle_family_menu(self, request: web.Request) -> web.Response:
+        """Serve a FamilyMenu request."""
+        params = dict(request.query)
+        self.requests.append(params)
+
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+        if self.failures:
+            return _error(self.failures.popleft())
+        if self.error_rate and self._rng.random() < self.error_rate:
+            return _error(503)
+
+        if (
+            params.get("districtId") != self.district_id
+            or params.get("buildingId") != self.building_id
+        ):
+            return _error(400)
+
+        try:
+            start = _parse_query_date(params["startDate"])
+            end = _parse_query_date(params["endDate"])
+        except (KeyError, ValueError):
+            return _error(400)
+
+        body = json.dumps(filter_family_menu(self.payload, start, end)).encode()
+        etag = f'"{hashlib.sha256(body).hexdigest()[:16]}"'
+        if request.headers.get("If-None-Match") == etag:
+            return web.Response(status=304, headers={"ETag": etag})
+        return web.Response(
+            body=body, content_type="application/json", headers={"ETag": etag}
+        )
+
+
+def _parse_query_date(value: str) -> date:
+    """Parse a request date (M-D-YYYY)."""
+    month, day, year = value.split("-")
+    return date(int(year), int(month), int(day))
+
+
+def _error(status: int) -> web.Response:
+    """Return an error response shaped like the API's."""
+    return web.json_response({"Message": "An error has occurred."}, status=status)
+
+
+def main() -> None:
+    """Serve a generated district until interrupted."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--school-days", type=int, default=22)
+    parser.add_argument("--plans", type=int, default=2)
+    parser.add_argument("--latency", type=float, default=0)
+    parser.add_argument("--error-rate", type=float, default=0)
+    args = parser.parse_args()
+
+    server = MockLinqConnectServer(
+        generate_family_menu(
+            date.today(),
+            school_days=args.school_days,
+            plans_per_session=args.plans,
+        ),
+        latency=args.latency,
+        error_rate=args.error_rate,
+    )
+    print(
+        f"Serving http://127.0.0.1:{args.port}{FAMILY_MENU_PATH} for "
+        f"districtId={server.district_id} buildingId={server.building_id}"
+    )
+    web.run_app(server.create_app(), host="127.0.0.1", port=args.port, print=None)
+
+
+if __name__ == "__main__":
+    main()
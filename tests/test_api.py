@@ -0,0 +1,156 @@
+"""Tests for the LinqConnect API client."""
+import json
+from pathlib import Path
+
+import pytest
+
+from custom_components.linqconnect.api import (
+    FAMILY_MENU_FIELDS,
+    CircuitBreaker,
+    CircuitOpenError,
+    LinqConnectApiClient,
+    MenuResponse,
+    project_fields,
+)
+from custom_components.linqconnect.coordinator import LinqConnectDataUpdateCoordinator
+
+RESPONSE_FIXTURE = Path(__file__).parent.parent / "test_response.json"
+
+
+def test_project_fields_drops_unused_fields():
+    """Test projection keeps only the requested fields."""
+    data = {
+        "FamilyMenuSessions": [
+            {
+                "ServingSession": "Lunch",
+                "ServingSessionId": "a472dba1",
+                "MenuPlans": [{"MenuPlanName": "K-8 Lunch", "MenuPlanId": "c1b1"}],
+            }
+        ],
+        "AcademicCalendars": [],
+    }
+
+    assert project_fields(data, FAMILY_MENU_FIELDS) == {
+        "FamilyMenuSessions": [
+            {
+                "ServingSession": "Lunch",
+                "ServingSessionId": "a472dba1",
+                "MenuPlans": [{"MenuPlanName": "K-8 Lunch"}],
+            }
+        ]
+    }
+
+
+def test_projected_response_processes_identically():
+    """Test the coordinator gets the same menus from a projected response."""
+    coordinator = LinqConnectDataUpdateCoordinator(None, None, None)
+    raw_data = json.loads(RESPONSE_FIXTURE.read_text())
+    projected = project_fields(raw_data, FAMILY_MENU_FIELDS)
+
+    full = coordinator._process_menu_data(raw_data)
+    reduced = coordinator._process_menu_data(projected)
+
+    assert len(json.dumps(projected)) < len(json.dumps(raw_data))
+    assert full == reduced
+    assert list(full) == ["breakfast", "lunch", "snack"]
+
+
+class FakeResponse:
+    """Minimal aiohttp response returning a fixed body."""
+
+    def __init__(self, body, status=200, headers=None):
+        self._body = body
+        self.status = status
+        self.headers = headers or {}
+
+    def raise_for_status(self):
+        """Accept any status."""
+
+    async def read(self):
+        """Return the body."""
+        return self._body
+
+
+class FakeSession:
+    """Minimal aiohttp session recording request parameters."""
+
+    def __init__(self, body, status=200, headers=None):
+        self.body = body
+        self.status = status
+        self.headers = headers
+        self.params = []
+        self.request_headers = []
+
+    async def get(self, url, params=None, headers=None):
+        """Record the request and return the body."""
+        self.params.append(params)
+        self.request_headers.append(headers)
+        return FakeResponse(self.body, self.status, self.headers)
+
+
+def _fail_decode(body):
+    """JSON decoder that must not be reached."""
+    raise AssertionError("unchanged body was decoded")
+
+
+@pytest.mark.asyncio
+async def test_unchanged_body_is_not_decoded():
+    """Test a body matching the previous digest is reported as not modified."""
+    body = b'{"FamilyMenuSessions": []}'
+    session = FakeSession(body, headers={"ETag": '"v1"'})
+    client = LinqConnectApiClient("district", "building", session)
+    previous = await client.async_fetch_menu()
+    assert previous.etag == '"v1"'
+
+    client = LinqConnectApiClient(
+        "district", "building", session, json_loads=_fail_decode
+    )
+    response = await client.async_fetch_menu(previous=previous)
+
+    assert response.not_modified
+    assert response.data is None
+    assert session.request_headers[-1] == {"If-None-Match": '"v1"'}
+
+
+@pytest.mark.asyncio
+async def test_not_modified_status_is_not_decoded():
+    """Test a 304 response to a conditional request skips decoding."""
+    session = FakeSession(b"", status=304)
+    client = LinqConnectApiClient(
+        "district", "building", session, json_loads=_fail_decode
+    )
+    previous = MenuResponse(
+        data=None, sha256="abc", size=10, last_modified="Wed, 21 Oct 2025 07:28:00 GMT"
+    )
+
+    response = await client.async_fetch_menu(previous=previous)
+
+    assert response.not_modified
+    assert response.sha256 == "abc"
+    assert session.request_headers[-1] == {
+        "If-Modified-Since": "Wed, 21 Oct 2025 07:28:00 GMT"
+    }
+
+
+def test_half_open_circuit_lets_one_trial_through():
+    """Test only one request at a time is tried once the reset timeout passes."""
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0)
+    assert breaker.before_request() is False
+    breaker.record_failure()
+
+    trial = breaker.before_request()
+    assert trial is True
+    assert breaker.is_open
+    with pytest.raises(CircuitOpenError):
+        breaker.before_request()
+
+    # A failed trial reopens the circuit for another trial later
+    breaker.record_failure()
+    breaker.after_request(trial)
+    trial = breaker.before_request()
+    assert trial is True
+
+    breaker.record_success()
+    breaker.after_request(trial)
+    assert not breaker.is_open
+    assert breaker.before_request() is False
@@ -0,0 +1,258 @@
+"""Benchmarks for the LinqConnect menu processing pipeline.
+
+Each stage is timed and its allocations traced, against the bundled
+``test_response.json`` and a synthetic large district. Traced memory is
+reported both at its peak during a stage and as what the stage's result
+keeps allocated afterwards. The thresholds are
+deliberately generous so they only catch real regressions, not noisy
+machines. Run ``make bench`` to print the measurements.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta
+import json
+from pathlib import Path
+import resource
+import sys
+import time as time_module
+from types import SimpleNamespace
+import tracemalloc
+from typing import Any, Callable
+
+import pytest
+
+from custom_components.linqconnect.api import LinqConnectApiClient
+from custom_components.linqconnect.calendar import LinqConnectCalendar
+from custom_components.linqconnect.const import (
+    CONF_CUTOFF_TIME,
+    SENSOR_BREAKFAST,
+    SENSOR_LUNCH,
+)
+from custom_components.linqconnect.coordinator import LinqConnectDataUpdateCoordinator
+from custom_components.linqconnect.models import MenuInterner
+from custom_components.linqconnect.sensor import LinqConnectMenuSensor
+
+from .menu_generator import generate_family_menu
+
+RESPONSE_FIXTURE = Path(__file__).parent.parent / "test_response.json"
+
+# Synthetic district size
+SYNTHETIC_PLANS = 10
+SYNTHETIC_DAYS = 180
+
+# Regression thresholds: (seconds, peak traced MiB)
+THRESHOLDS = {
+    "decode_fixture": (0.5, 10),
+    "decode_projected_fixture": (0.5, 10),
+    "process_fixture": (0.5, 20),
+    "process_synthetic": (5.0, 50),
+    "update_views_synthetic": (1.0, 50),
+    "sensor_attributes": (0.5, 5),
+    "calendar_year": (0.5, 20),
+}
+
+# Property reads per sensor, roughly a day of state writes and UI views
+SENSOR_READS = 1000
+
+
+@dataclass
+class Measurement:
+    """Wall time and memory used by one benchmark stage."""
+
+    stage: str
+    seconds: float
+    peak_mib: float
+    retained_mib: float
+    rss_growth_mib: float
+
+
+def _max_rss_mib() -> float:
+    """Return the peak resident set size of this process in MiB."""
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS reports bytes
+    return max_rss / (1024 * 1024 if sys.platform == "darwin" else 1024)
+
+
+def measure(stage: str, func: Callable[[], Any]) -> tuple[Any, Measurement]:
+    """Run func twice, recording wall time, traced allocations and RSS growth.
+
+    Tracing slows Python down considerably, so the first run is timed and
+    the second is traced. func must start from the same state every call.
+    """
+    rss_before = _max_rss_mib()
+    started = time_module.perf_counter()
+    result = func()
+    seconds = time_module.perf_counter() - started
+
+    tracemalloc.start()
+    try:
+        # Keep the result alive so what it retains is still traced
+        traced_result = func()
+        retained, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del traced_result
+
+    measurement = Measurement(
+        stage,
+        seconds,
+        peak / (1024 * 1024),
+        retained / (1024 * 1024),
+        _max_rss_mib() - rss_before,
+    )
+    print(
+        f"\n{stage}: {measurement.seconds * 1000:.1f} ms, "
+        f"peak {measurement.peak_mib:.2f} MiB traced, "
+        f"{measurement.retained_mib:.2f} MiB retained, "
+        f"+{measurement.rss_growth_mib:.2f} MiB max RSS"
+    )
+    return result, measurement
+
+
+def assert_within_threshold(measurement: Measurement) -> None:
+    """Fail if a stage is slower or larger than its threshold."""
+    max_seconds, max_mib = THRESHOLDS[measurement.stage]
+    assert measurement.seconds < max_seconds, measurement
+    assert measurement.peak_mib < max_mib, measurement
+
+
+def _new_coordinator() -> LinqConnectDataUpdateCoordinator:
+    """Return a coordinator without Home Assistant or an API client."""
+    return LinqConnectDataUpdateCoordinator(None, None, None)
+
+
+@pytest.fixture(scope="module")
+def raw_fixture() -> dict[str, Any]:
+    """Return the bundled API response."""
+    return json.loads(RESPONSE_FIXTURE.read_text())
+
+
+@pytest.fixture(scope="module")
+def fixture_body() -> bytes:
+    """Return the body of the bundled API response."""
+    return RESPONSE_FIXTURE.read_bytes()
+
+
+@pytest.fixture(scope="module")
+def synthetic_district() -> dict[str, Any]:
+    """Return a synthetic district serving every day from today."""
+    payload = generate_family_menu(
+        date.today(),
+        school_days=SYNTHETIC_DAYS,
+        plans_per_session=SYNTHETIC_PLANS,
+        sessions=("Breakfast", "Lunch"),
+        weekends=True,
+    )
+    # Decode from JSON so objects aren't shared the way the generator shares them
+    return json.loads(json.dumps(payload))
+
+
+@pytest.fixture(scope="module")
+def loaded_coordinator(
+    synthetic_district: dict[str, Any],
+) -> LinqConnectDataUpdateCoordinator:
+    """Return a coordinator holding the synthetic district."""
+    coordinator = _new_coordinator()
+    coordinator.data = coordinator._process_menu_data(synthetic_district)
+    coordinator._update_views(coordinator.data)
+    return coordinator
+
+
+def test_benchmark_decode_fixture(fixture_body):
+    """Benchmark decoding the bundled API response with and without projection.
+
+    Projection copies the consumed fields out of the decoded payload, so it
+    lowers what stays allocated after decoding, at the cost of a higher peak
+    while both trees exist.
+    """
+    client = LinqConnectApiClient("district", "building", None)
+    plain = measure("decode_fixture", lambda: client._decode(fixture_body, False))[1]
+    projected = measure(
+        "decode_projected_fixture", lambda: client._decode(fixture_body, True)
+    )[1]
+
+    assert projected.retained_mib < plain.retained_mib
+    assert_within_threshold(plain)
+    assert_within_threshold(projected)
+
+
+def test_benchmark_process_fixture(raw_fixture):
+    """Benchmark processing the bundled API response."""
+    data, measurement = measure(
+        "process_fixture", lambda: _new_coordinator()._process_menu_data(raw_fixture)
+    )
+
+    assert data["breakfast"] and data["lunch"]
+    assert_within_threshold(measurement)
+
+
+def test_benchmark_process_synthetic(synthetic_district):
+    """Benchmark processing a district with many plans and days."""
+    coordinator = _new_coordinator()
+
+    def process() -> dict[str, Any]:
+        coordinator._interner = MenuInterner()
+        return coordinator._process_menu_data(synthetic_district)
+
+    data, measurement = measure("process_synthetic", process)
+
+    assert len(data["lunch"]) == SYNTHETIC_DAYS
+    assert len(coordinator.available_menu_plans) == 2 * SYNTHETIC_PLANS
+    assert_within_threshold(measurement)
+
+
+def test_benchmark_update_views_synthetic(synthetic_district):
+    """Benchmark rendering every day of a large district."""
+    coordinator = _new_coordinator()
+    data = coordinator._process_menu_data(synthetic_district)
+
+    def update_views() -> None:
+        # Drop the previous views so every day is rendered again
+        coordinator._rendered = {}
+        coordinator._update_views(data)
+
+    _, measurement = measure("update_views_synthetic", update_views)
+
+    assert len(coordinator._rendered[SENSOR_LUNCH]) == SYNTHETIC_DAYS
+    assert_within_threshold(measurement)
+
+
+def test_benchmark_sensor_attributes(loaded_coordinator):
+    """Benchmark repeated sensor state and attribute reads."""
+    # A cutoff at the end of the day keeps the sensor on today's menu
+    entry = SimpleNamespace(
+        entry_id="bench", title="School", options={CONF_CUTOFF_TIME: time(23, 59)}
+    )
+    sensors = [
+        LinqConnectMenuSensor(loaded_coordinator, entry, meal_type)
+        for meal_type in (SENSOR_BREAKFAST, SENSOR_LUNCH)
+    ]
+
+    def read_sensors() -> int:
+        attributes = 0
+        for _ in range(SENSOR_READS):
+            for sensor in sensors:
+                sensor.native_value
+                attributes += len(sensor.extra_state_attributes)
+        return attributes
+
+    attributes, measurement = measure("sensor_attributes", read_sensors)
+
+    assert attributes
+    assert_within_threshold(measurement)
+
+
+def test_benchmark_calendar_year(loaded_coordinator):
+    """Benchmark listing a year of calendar events."""
+    entry = SimpleNamespace(entry_id="bench", title="School", options={})
+    calendar = LinqConnectCalendar(loaded_coordinator, entry, SENSOR_LUNCH)
+    start = datetime.combine(date.today(), time())
+
+    events, measurement = measure(
+        "calendar_year",
+        lambda: calendar._get_events(start, start + timedelta(days=365)),
+    )
+
+    assert len(events) == SYNTHETIC_DAYS
+    assert_within_threshold(measurement)
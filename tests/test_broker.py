@@ -0,0 +1,118 @@
+"""Tests for the LinqConnect fetch broker."""
+import asyncio
+from datetime import date
+
+import pytest
+
+from custom_components.linqconnect.api import MenuResponse
+from custom_components.linqconnect.broker import LinqConnectFetchBroker
+
+
+class FakeHass:
+    """Just enough of Home Assistant to run broker tasks."""
+
+    def async_create_background_task(self, target, name):
+        return asyncio.ensure_future(target)
+
+    def async_create_task(self, target):
+        return asyncio.ensure_future(target)
+
+
+class SlowClient:
+    """Client counting fetches, each taking a moment to complete."""
+
+    district_id = "district"
+    building_id = "building"
+
+    def __init__(self):
+        self.calls = 0
+
+    async def async_fetch_menu(self, start_date, end_date, project=False, previous=None):
+        self.calls += 1
+        await asyncio.sleep(0.01)
+        return MenuResponse(data={"FamilyMenuSessions": []}, sha256="abc", size=2)
+
+
+class FakeCoordinator:
+    """Coordinator stand-in recording refresh requests."""
+
+    def __init__(self, client, broker=None):
+        self.client = client
+        self.broker = broker
+        self.refreshes = 0
+        self.forced = []
+
+    async def async_request_refresh(self):
+        self.refreshes += 1
+
+    async def async_force_refresh(self, start=None, end=None):
+        self.forced.append((start, end))
+        await self.broker.async_fetch_menu(self.client, start, end, True, self)
+
+
+@pytest.mark.asyncio
+async def test_identical_fetches_are_coalesced():
+    """Test concurrent and repeated fetches for one window share one request."""
+    broker = LinqConnectFetchBroker(FakeHass())
+    client = SlowClient()
+    start, end = date(2025, 10, 21), date(2025, 11, 20)
+
+    first, second = await asyncio.gather(
+        broker.async_fetch_menu(client, start, end, True),
+        broker.async_fetch_menu(SlowClient(), start, end, True),
+    )
+    third = await broker.async_fetch_menu(client, start, end, True)
+
+    assert client.calls == 1
+    assert first is second is third
+
+    await broker.async_fetch_menu(client, start, end, False)
+    assert client.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_fetch_aligns_other_entries_for_the_school():
+    """Test a real fetch asks other coordinators for the school to refresh."""
+    broker = LinqConnectFetchBroker(FakeHass())
+    client = SlowClient()
+    requester, sibling = FakeCoordinator(client), FakeCoordinator(client)
+    broker.async_register(requester)
+    unregister = broker.async_register(sibling)
+
+    await broker.async_fetch_menu(
+        client, date(2025, 10, 21), date(2025, 10, 24), True, requester=requester
+    )
+    await asyncio.sleep(0)
+
+    assert requester.refreshes == 0
+    assert sibling.refreshes == 1
+
+    unregister()
+    assert broker._coordinators[("district", "building")] == {requester}
+
+
+@pytest.mark.asyncio
+async def test_forced_refreshes_are_coalesced_per_school():
+    """Test forced refreshes fetch once per school and skip recent results."""
+    broker = LinqConnectFetchBroker(FakeHass())
+    client, other_client = SlowClient(), SlowClient()
+    other_client.building_id = "other"
+    first, second = FakeCoordinator(client, broker), FakeCoordinator(client, broker)
+    other = FakeCoordinator(other_client, broker)
+    for coordinator in (first, second, other):
+        broker.async_register(coordinator)
+    start, end = date(2025, 10, 21), date(2025, 10, 24)
+    await broker.async_fetch_menu(client, start, end, True)
+
+    await asyncio.gather(
+        broker.async_force_refresh([first], start, end),
+        broker.async_force_refresh([first, second], start, end),
+    )
+    await asyncio.sleep(0)
+
+    assert client.calls == 2
+    assert first.forced == second.forced == [(start, end)]
+    # Only nudged by the first fetch, forced refreshes don't align them again
+    assert first.refreshes == second.refreshes == 1
+    assert not other.forced
+    assert not broker._forced
@@ -0,0 +1,21 @@
+"""Tests for the LinqConnect config flow helpers."""
+import json
+from pathlib import Path
+
+from custom_components.linqconnect.config_flow import extract_menu_plans
+from custom_components.linqconnect.coordinator import LinqConnectDataUpdateCoordinator
+
+RESPONSE_FIXTURE = Path(__file__).parent.parent / "test_response.json"
+
+
+def test_plans_match_between_flow_and_coordinator():
+    """Test the options flow can use the coordinator's plans instead of fetching."""
+    raw_data = json.loads(RESPONSE_FIXTURE.read_text())
+    coordinator = LinqConnectDataUpdateCoordinator(
+        None, None, None, selected_menu_plans=["K-8 Lunch SY 25-26"]
+    )
+
+    coordinator._process_menu_data(raw_data)
+
+    assert coordinator.available_menu_plans == extract_menu_plans(raw_data)
+    assert "Pre-K Snacks SY 25-26" in coordinator.available_menu_plans
@@ -1,7 +1,27 @@
 """Tests for the LinqConnect coordinator."""
+import asyncio
+import json
+import time
+
 import pytest
-from datetime import datetime, date
+from datetime import datetime, date, timedelta
+from homeassistant.helpers.update_coordinator import UpdateFailed
+from homeassistant.util import dt as dt_util
+from custom_components.linqconnect.api import ApiClientError, MenuResponse
+from custom_components.linqconnect.const import (
+    RAW_RETENTION_DEBUG,
+    RAW_RETENTION_DROP,
+    FETCH_CONCURRENCY,
+    FETCH_WINDOW_MAX_DAYS,
+    FETCH_WINDOW_MIN_DAYS,
+    RAW_RETENTION_SUMMARY,
+    RECOVERY_UPDATE_INTERVAL,
+)
 from custom_components.linqconnect.coordinator import LinqConnectDataUpdateCoordinator
+from custom_components.linqconnect.models import MenuDay
+from custom_components.linqconnect.store import LinqConnectMenuStore
+
+from .menu_generator import generate_family_menu
 
 
 def test_process_menu_data_with_valid_data():
@@ -47,8 +67,9 @@ def test_process_menu_data_with_valid_data():
     assert "breakfast" in processed
     assert date(2025, 10, 21) in processed["breakfast"]
     menu = processed["breakfast"][date(2025, 10, 21)]
-    assert menu["theme"] == "Test Tuesday"
-    assert menu["menu_plan"] == "K-12 Breakfast"
+    assert menu.theme == "Test Tuesday"
+    assert menu.menu_plan == "K-12 Breakfast"
+    assert [category.name for category in menu.iter_categories()] == ["Main Entrée"]
 
 
 def test_process_menu_data_with_empty_response():
@@ -99,5 +120,597 @@ def test_date_parsing_format():
     assert date(2025, 10, 21) in processed["lunch"]
 
 
+def test_sessions_discovered_by_id():
+    """Test every serving session gets a meal type keyed by its ID."""
+    coordinator = LinqConnectDataUpdateCoordinator(None, None, None)
+    raw_data = generate_family_menu(
+        date(2025, 10, 20),
+        school_days=5,
+        plans_per_session=1,
+        sessions=("Lunch", "Pre-K Snack", "Supper"),
+    )
+
+    processed = coordinator._process_menu_data(raw_data)
+
+    assert list(processed) == ["breakfast", "lunch", "pre_k_snack", "supper"]
+    assert len(processed["pre_k_snack"]) == 5
+    assert coordinator.get_session_name("pre_k_snack") == "Pre-K Snack"
+
+    # A renamed session keeps its key, another session with the same name
+    # gets its own
+    snack = raw_data["FamilyMenuSessions"][1]
+    snack["ServingSession"] = "Snack"
+    raw_data["FamilyMenuSessions"].append({**snack, "ServingSessionId": "other"})
+    processed = coordinator._process_menu_data(raw_data)
+
+    assert list(processed) == ["breakfast", "lunch", "pre_k_snack", "supper", "snack"]
+    assert coordinator.get_session_name("pre_k_snack") == "Snack"
+
+
+def test_sessions_named_after_breakfast_or_lunch_keep_legacy_keys():
+    """Test sessions containing breakfast or lunch use those keys, as before."""
+    coordinator = LinqConnectDataUpdateCoordinator(None, None, None)
+    raw_data = generate_family_menu(
+        date(2025, 10, 20),
+        school_days=5,
+        plans_per_session=1,
+        sessions=("School Breakfast", "School Lunch", "Pre-K Lunch", "Snack"),
+    )
+
+    processed = coordinator._process_menu_data(raw_data)
+
+    assert list(processed) == ["breakfast", "lunch", "snack"]
+    assert len(processed["breakfast"]) == len(processed["lunch"]) == 5
+    assert {menu.menu_plan for menu in processed["lunch"].values()} == {
+        "School Lunch Plan 0"
+    }
+    assert coordinator.get_session_name("lunch") == "School Lunch"
+
+
+def test_sessions_without_selected_plans_are_skipped():
+    """Test sessions whose plans are all filtered out get no meal type."""
+    coordinator = LinqConnectDataUpdateCoordinator(
+        None, None, None, selected_menu_plans=["Lunch Plan 0"]
+    )
+
+    processed = coordinator._process_menu_data(
+        generate_family_menu(date(2025, 10, 20), school_days=5)
+    )
+
+    assert list(processed) == ["breakfast", "lunch"]
+    assert processed["breakfast"] == {}
+    assert {menu.menu_plan for menu in processed["lunch"].values()} == {
+        "Lunch Plan 0"
+    }
+
+
+class FailingClient:
+    """Client whose requests always fail."""
+
+    async def async_fetch_menu(self, *args, **kwargs):
+        raise ApiClientError("down")
+
+
+@pytest.mark.asyncio
+async def test_update_failure_keeps_fresh_data():
+    """Test menus younger than the cache max age survive an API outage."""
+    coordinator = LinqConnectDataUpdateCoordinator(
+        None, FailingClient(), None, cache_max_age=timedelta(hours=1)
+    )
+    coordinator.data = {"breakfast": {}, "lunch": {}}
+    coordinator.last_fetched = dt_util.utcnow() - timedelta(minutes=30)
+
+    assert await coordinator._async_update_data() is coordinator.data
+
+    coordinator.last_fetched = dt_util.utcnow() - timedelta(hours=2)
+    with pytest.raises(UpdateFailed):
+        await coordinator._async_update_data()
+
+
+def test_fetch_ranges_only_cover_new_and_volatile_days():
+    """Test updates after the first only refetch near-term and new days."""
+    coordinator = LinqConnectDataUpdateCoordinator(None, None, None)
+    today = date(2025, 10, 21)
+    now = datetime(2025, 10, 21, 8, tzinfo=dt_util.UTC)
+
+    assert coordinator._get_fetch_ranges(today, now) == [
+        (today, today + timedelta(days=30))
+    ]
+
+    coordinator._fetched_dates = {
+        today + timedelta(days=offset): now for offset in range(31)
+    }
+    assert coordinator._get_fetch_ranges(today, now + timedelta(hours=3)) == [
+        (today, today + timedelta(days=3))
+    ]
+
+    tomorrow = today + timedelta(days=1)
+    assert coordinator._get_fetch_ranges(tomorrow, now + timedelta(hours=20)) == [
+        (tomorrow, tomorrow + timedelta(days=3)),
+        (tomorrow + timedelta(days=30), tomorrow + timedelta(days=30)),
+    ]
+
+    assert coordinator._get_fetch_ranges(today, now + timedelta(hours=24)) == [
+        (today, today + timedelta(days=30))
+    ]
+
+
+@pytest.mark.asyncio
+async def test_force_refresh_refetches_only_the_range():
+    """Test a forced refresh fetches its range along with near-term days."""
+    coordinator = LinqConnectDataUpdateCoordinator(None, None, None)
+    today = date(2025, 10, 21)
+    now = datetime(2025, 10, 21, 8, tzinfo=dt_util.UTC)
+    coordinator._fetched_dates = {
+        today + timedelta(days=offset): now for offset in range(31)
+    }
+    refreshes = []
+
+    async def async_refresh():
+        refreshes.append(coordinator._get_fetch_ranges(today, now))
+
+    coordinator.async_refresh = async_refresh
+    await coordinator.async_force_refresh(
+        today + timedelta(days=10), today + timedelta(days=12)
+    )
+    await coordinator.async_force_refresh()
+
+    assert refreshes == [
+        [
+            (today, today + timedelta(days=3)),
+            (today + timedelta(days=10), today + timedelta(days=12)),
+        ],
+        [(today, today + timedelta(days=30))],
+    ]
+
+
+def test_merge_replaces_only_fetched_window():
+    """Test merging keeps days outside the fetched window."""
+    coordinator = LinqConnectDataUpdateCoordinator(None, None, None)
+    current = {
+        "breakfast": {
+            date(2025, 10, 21): {"theme": "old"},
+            date(2025, 10, 22): {"theme": "removed"},
+            date(2025, 11, 3): {"theme": "kept"},
+        },
+        "lunch": {},
+    }
+    fetched = {"breakfast": {date(2025, 10, 21): {"theme": "new"}}, "lunch": {}}
+
+    merged = coordinator._merge_menu_data(
+        current, fetched, date(2025, 10, 21), date(2025, 10, 24)
+    )
+
+    assert merged["breakfast"] == {
+        date(2025, 10, 21): {"theme": "new"},
+        date(2025, 11, 3): {"theme": "kept"},
+    }
+
+
+class StaticClient:
+    """Client returning the same payload for every window."""
+
+    def __init__(self, data):
+        self.data = data
+        self.projected = []
+
+    async def async_fetch_menu(
+        self, start_date=None, end_date=None, project=False, previous=None
+    ):
+        self.projected.append(project)
+        if previous is not None and previous.sha256 == "abc123":
+            return MenuResponse(
+                data=None, sha256="abc123", size=42, not_modified=True
+            )
+        return MenuResponse(data=self.data, sha256="abc123", size=42)
+
+
+@pytest.mark.asyncio
+async def test_unchanged_menus_skip_processing(executor_hass):
+    """Test a refresh with no changed windows returns the same data."""
+    client = StaticClient(generate_family_menu(date.today(), school_days=5))
+    coordinator = LinqConnectDataUpdateCoordinator(executor_hass, client, None)
+
+    # The first update fetches the whole window, later ones the near-term days
+    for _ in range(2):
+        coordinator.data = await coordinator._async_update_data()
+        assert coordinator.raw_summary["responses"][0]["not_modified"] is False
+
+    coordinator._process_menu_data = None  # Must not be called again
+    assert await coordinator._async_update_data() is coordinator.data
+    assert coordinator.raw_summary["responses"][0]["not_modified"] is True
+
+
+class MemoryStore:
+    """Stand-in for a Home Assistant Store keeping its data as JSON."""
+
+    def __init__(self):
+        self.data = None
+
+    async def async_load(self):
+        return self.data
+
+    def async_delay_save(self, data_func, delay):
+        self.data = json.loads(json.dumps(data_func()))
+
+
+@pytest.mark.asyncio
+async def test_sessions_restored_from_cache_after_restart(executor_hass):
+    """Test session names and keys survive a restart through the cache."""
+    raw_data = generate_family_menu(
+        date.today(),
+        school_days=5,
+        plans_per_session=1,
+        sessions=("School Lunch", "Pre-K Snack"),
+    )
+    store = LinqConnectMenuStore(None, "entry", "key")
+    store._store = MemoryStore()
+    coordinator = LinqConnectDataUpdateCoordinator(
+        executor_hass, StaticClient(raw_data), None, store=store
+    )
+    coordinator.data = await coordinator._async_update_data()
+
+    restarted = LinqConnectDataUpdateCoordinator(
+        executor_hass, StaticClient(raw_data), None, store=store
+    )
+    assert await restarted.async_load_cache()
+
+    assert list(restarted.data) == ["breakfast", "lunch", "pre_k_snack"]
+    assert restarted.get_session_name("lunch") == "School Lunch"
+    assert restarted.get_session_name("pre_k_snack") == "Pre-K Snack"
+
+    # A session renamed while Home Assistant was stopped keeps its key
+    raw_data["FamilyMenuSessions"][1]["ServingSession"] = "Preschool Snack"
+    restarted.data = await restarted._async_update_data()
+
+    assert list(restarted.data) == ["breakfast", "lunch", "pre_k_snack"]
+    assert restarted.get_session_name("pre_k_snack") == "Preschool Snack"
+
+
+@pytest.mark.asyncio
+async def test_recovery_interval_while_degraded(executor_hass):
+    """Test failures switch to the recovery schedule until an update succeeds."""
+    coordinator = LinqConnectDataUpdateCoordinator(
+        executor_hass, FailingClient(), timedelta(hours=3)
+    )
+
+    with pytest.raises(UpdateFailed):
+        await coordinator._async_update_data()
+    assert coordinator.degraded
+    assert coordinator.update_interval == RECOVERY_UPDATE_INTERVAL
+
+    coordinator.client = StaticClient({"FamilyMenuSessions": []})
+    await coordinator._async_update_data()
+    assert not coordinator.degraded
+    assert coordinator.update_interval == timedelta(hours=3)
+
+
+class OverlapClient:
+    """Client recording each window and how many requests overlap."""
+
+    def __init__(self, delay=0.01):
+        self.delay = delay
+        self.windows = []
+        self.in_flight = self.max_in_flight = 0
+
+    async def async_fetch_menu(
+        self, start_date=None, end_date=None, project=False, previous=None
+    ):
+        self.windows.append((start_date, end_date))
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(self.delay)
+        self.in_flight -= 1
+        return MenuResponse(
+            data={"FamilyMenuSessions": []}, sha256=str(start_date), size=2
+        )
+
+
+@pytest.mark.asyncio
+async def test_long_horizon_fetched_in_parallel_windows(executor_hass):
+    """Test a long horizon is split into capped, concurrent requests."""
+    client = OverlapClient()
+    coordinator = LinqConnectDataUpdateCoordinator(
+        executor_hass, client, None, fetch_days=180
+    )
+
+    await coordinator._async_update_data()
+
+    today = dt_util.now().date()
+    windows = sorted(client.windows)
+    assert windows[0][0] == today
+    assert windows[-1][1] == today + timedelta(days=180)
+    assert all(
+        (end - start).days < FETCH_WINDOW_MAX_DAYS for start, end in windows
+    )
+    assert all(
+        (next_start - end).days == 1
+        for (_, end), (next_start, _) in zip(windows, windows[1:])
+    )
+    assert 1 < client.max_in_flight <= FETCH_CONCURRENCY
+
+
+@pytest.mark.asyncio
+async def test_overlapping_updates_take_turns(executor_hass):
+    """Test concurrent refreshes never process menus at the same time."""
+    coordinator = LinqConnectDataUpdateCoordinator(
+        executor_hass, OverlapClient(), None
+    )
+    process_changes = coordinator._process_changes
+    running = []
+    overlapped = []
+
+    def _process_changes(*args):
+        overlapped.append(bool(running))
+        running.append(True)
+        try:
+            time.sleep(0.02)
+            return process_changes(*args)
+        finally:
+            running.pop()
+
+    coordinator._process_changes = _process_changes
+
+    await asyncio.gather(
+        coordinator._async_update_data(), coordinator._async_update_data()
+    )
+
+    assert overlapped == [False, False]
+
+
+@pytest.mark.asyncio
+async def test_fetch_window_shrinks_while_slow(executor_hass):
+    """Test slow responses shrink the window and fast ones grow it back."""
+    coordinator = LinqConnectDataUpdateCoordinator(
+        executor_hass, OverlapClient(), None, fetch_days=60
+    )
+    today = dt_util.now().date()
+
+    for _ in range(4):
+        coordinator._resize_fetch_window(slow=True)
+    assert coordinator.fetch_window_days == FETCH_WINDOW_MIN_DAYS
+    assert len(coordinator._get_fetch_ranges(today, dt_util.utcnow())) == 9
+
+    coordinator.client.delay = 0
+    await coordinator._async_update_data()
+    assert coordinator.fetch_window_days == FETCH_WINDOW_MIN_DAYS * 2
+
+
+@pytest.mark.asyncio
+async def test_raw_retention_policies(caplog, executor_hass):
+    """Test raw payloads are only kept as the retention policy allows."""
+    client = StaticClient({"FamilyMenuSessions": []})
+
+    coordinator = LinqConnectDataUpdateCoordinator(
+        executor_hass, client, None, raw_retention=RAW_RETENTION_SUMMARY
+    )
+    data = await coordinator._async_update_data()
+    assert "raw" not in data
+    assert coordinator.raw_data is None
+    assert coordinator.raw_summary["responses"][0]["sha256"] == "abc123"
+    assert client.projected == [True]
+
+    coordinator = LinqConnectDataUpdateCoordinator(
+        executor_hass, client, None, raw_retention=RAW_RETENTION_DROP
+    )
+    await coordinator._async_update_data()
+    assert coordinator.raw_data is None
+    assert coordinator.raw_summary is None
+
+    coordinator = LinqConnectDataUpdateCoordinator(
+        executor_hass, client, None, raw_retention=RAW_RETENTION_DEBUG
+    )
+    await coordinator._async_update_data()
+    assert coordinator.raw_data is None
+
+    caplog.set_level("DEBUG", logger="custom_components.linqconnect.coordinator")
+    await coordinator._async_update_data()
+    assert list(coordinator.raw_data.values()) == [client.data]
+    assert client.projected[-1] is False
+
+
+def test_process_menu_data_shares_recurring_recipes():
+    """Test identical recipes on different days are stored once."""
+    coordinator = LinqConnectDataUpdateCoordinator(None, None, None)
+    milk = {"RecipeName": "1% Milk", "ServingSize": "8 oz", "Allergens": ["a1"]}
+    days = [
+        {
+            "Date": f"10/{day}/2025",
+            "MenuMeals": [
+                {
+                    "RecipeCategories": [
+                        {"CategoryName": "Milk", "Recipes": [dict(milk)]}
+                    ]
+                }
+            ],
+        }
+        for day in (21, 22)
+    ]
+    raw_data = {
+        "FamilyMenuSessions": [
+            {
+                "ServingSession": "Lunch",
+                "MenuPlans": [{"MenuPlanName": "K-8 Lunch", "Days": days}],
+            }
+        ]
+    }
+
+    processed = coordinator._process_menu_data(raw_data)
+
+    first, second = (
+        next(menu.iter_categories()).recipes[0]
+        for menu in processed["lunch"].values()
+    )
+    assert first is second
+    assert first.allergens == ("a1",)
+
+
+def _rolling_refresh(coordinator, today, seed):
+    """Refetch the 60 days from today, as generated from seed."""
+    payload = generate_family_menu(
+        today, school_days=60, plans_per_session=1, weekends=True, seed=seed
+    )
+    response = MenuResponse(data=payload, sha256=str(seed), size=0)
+    coordinator.data, views = coordinator._process_changes(
+        coordinator.data, [(today, today + timedelta(days=59), response)], today
+    )
+    coordinator._apply_views(views)
+
+
+def test_refetched_menus_share_objects_between_updates():
+    """Test refetched days reuse the retained objects without keeping them."""
+    coordinator = LinqConnectDataUpdateCoordinator(None, None, None)
+    today = date(2025, 10, 20)
+    _rolling_refresh(coordinator, today, seed=0)
+    before = coordinator.data["lunch"][today]
+
+    _rolling_refresh(coordinator, today, seed=0)
+
+    after = coordinator.data["lunch"][today]
+    assert after is not before
+    assert all(
+        new is old
+        for new, old in zip(after.iter_categories(), before.iter_categories())
+    )
+    # The interner is only seeded for an update, so pruned days can be freed
+    assert coordinator._interner._objects == {}
+
+
+def test_tables_only_keep_current_menus_across_rolling_refreshes():
+    """Test nutrient rows and category tags don't grow as days roll over."""
+    coordinator = LinqConnectDataUpdateCoordinator(None, None, None)
+    today = date(2025, 10, 20)
+    sizes = []
+    for seed in range(10):
+        # Every refresh edits the menus, replacing all their recipes
+        _rolling_refresh(coordinator, today + timedelta(days=seed), seed=seed)
+        categories = {
+            id(category): category
+            for days in coordinator.data.values()
+            for menu in days.values()
+            for category in menu.iter_categories()
+        }
+        recipes = {
+            recipe for category in categories.values() for recipe in category.recipes
+        }
+        assert len(coordinator._nutrient_table._rows) == len(recipes)
+        assert coordinator._category_tags.keys() == categories.keys()
+        sizes.append((len(recipes), len(categories)))
+
+    assert max(sizes) <= (150, 360)
+
+    # Totals from the pruned table match a table built from scratch
+    fresh = LinqConnectDataUpdateCoordinator(None, None, None)
+    fresh._update_views(coordinator.data)
+    assert coordinator._nutrition == fresh._nutrition
+
+
+def test_find_safe_days():
+    """Test safe days are found from the ingested allergens and restrictions."""
+    coordinator = LinqConnectDataUpdateCoordinator(None, None, None)
+    raw_data = generate_family_menu(
+        date(2025, 10, 20), school_days=10, plans_per_session=1, allergens=4
+    )
+    data = coordinator._process_menu_data(raw_data)
+    coordinator._update_views(data)
+    allergen = raw_data["FamilyMenuSessions"][1]["MenuPlans"][0]["Days"][0][
+        "MenuMeals"
+    ][0]["RecipeCategories"][0]["Recipes"][0]["Allergens"]
+    assert allergen
+
+    safe = coordinator.find_safe_days(
+        "lunch", date(2025, 10, 20), date(2025, 10, 31), allergens=allergen
+    )
+
+    assert set(safe) < set(data["lunch"])
+    for menu_date, recipes in safe.items():
+        entrees = next(
+            category
+            for category in data["lunch"][menu_date].iter_categories()
+            if category.name == "Main Entrée"
+        )
+        assert recipes == [
+            recipe.name
+            for recipe in entrees.recipes
+            if not set(recipe.allergens) & set(allergen)
+        ]
+    assert coordinator.find_safe_days(
+        "lunch", date(2025, 10, 20), date(2025, 10, 31), restrictions=["unknown"]
+    ) == {}
+
+
+def test_find_recipe():
+    """Test recipes are found from the index, which is kept while unchanged."""
+    coordinator = LinqConnectDataUpdateCoordinator(None, None, None)
+    data = coordinator._process_menu_data(
+        generate_family_menu(date(2025, 10, 20), school_days=10, plans_per_session=1)
+    )
+    coordinator._update_views(data)
+    start, end = date(2025, 10, 20), date(2025, 10, 31)
+    first_date = min(data["lunch"])
+    recipe = next(data["lunch"][first_date].iter_categories()).recipes[0]
+
+    found = coordinator.find_recipe(recipe.name.upper(), start, end)
+    by_identifier = coordinator.find_recipe(recipe.identifier, start, end, ["lunch"])
+
+    assert recipe.name in found["lunch"][first_date]
+    assert by_identifier["lunch"][first_date] == [recipe.name]
+    assert set(by_identifier) == {"lunch"}
+    assert set(by_identifier["lunch"]) == {
+        menu_date
+        for menu_date, menu in data["lunch"].items()
+        for category in menu.iter_categories()
+        if recipe in category.recipes
+    }
+    index = coordinator._recipe_index["lunch"]
+    coordinator._update_views(data)
+    assert coordinator._recipe_index["lunch"] is index
+    assert coordinator.find_recipe("no such dish", start, end) == {}
+
+
+def test_views_are_only_rendered_for_changed_days():
+    """Test unchanged menu days keep their rendered view."""
+    coordinator = LinqConnectDataUpdateCoordinator(None, None, None)
+    first = {
+        "breakfast": {
+            date(2025, 10, 21): MenuDay(date(2025, 10, 21), "A", "K-12", ()),
+            date(2025, 10, 22): MenuDay(date(2025, 10, 22), "B", "K-12", ()),
+        },
+        "lunch": {},
+    }
+    coordinator._update_views(first)
+    kept = coordinator.get_rendered_menu("breakfast", date(2025, 10, 21))
+    replaced = coordinator.get_rendered_menu("breakfast", date(2025, 10, 22))
+
+    second = {
+        "breakfast": {
+            date(2025, 10, 21): first["breakfast"][date(2025, 10, 21)],
+            date(2025, 10, 22): MenuDay(date(2025, 10, 22), "C", "K-12", ()),
+        },
+        "lunch": {},
+    }
+    coordinator._update_views(second)
+
+    assert coordinator.get_rendered_menu("breakfast", date(2025, 10, 21)) is kept
+    assert coordinator.get_rendered_menu("breakfast", date(2025, 10, 22)) is not replaced
+    assert coordinator.get_rendered_menu("breakfast", date(2025, 10, 22)).state == "C"
+    assert coordinator.changed_dates == {
+        "breakfast": frozenset({date(2025, 10, 22)}),
+        "lunch": frozenset(),
+    }
+
+    # Equal days rebuilt by a new fetch are not changes
+    third = {
+        "breakfast": {
+            date(2025, 10, 21): MenuDay(date(2025, 10, 21), "A", "K-12", ()),
+        },
+        "lunch": {},
+    }
+    coordinator._update_views(third)
+
+    assert coordinator.get_rendered_menu("breakfast", date(2025, 10, 21)) is kept
+    assert coordinator.changed_dates["breakfast"] == {date(2025, 10, 22)}
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
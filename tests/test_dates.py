@@ -0,0 +1,27 @@
+"""Tests for LinqConnect menu date parsing."""
+from datetime import date
+
+import pytest
+
+from custom_components.linqconnect.dates import MenuDateParser, parse_menu_date
+
+
+@pytest.mark.parametrize("value", ["10/21/2025", "2025-10-21", "2025-10-21"])
+def test_parse_menu_date_formats(value):
+    """Test both observed date formats parse, including from the cache."""
+    assert parse_menu_date(value) == date(2025, 10, 21)
+
+
+def test_parser_counts_failures(caplog):
+    """Test unparseable dates are counted and only warned about once."""
+    parser = MenuDateParser()
+
+    for value in ("2/3/2026", "21-10-25", "21-10-25", "13/40/2025", "soon", None):
+        parser.parse(value)
+
+    assert parser.parse("2/3/2026") == date(2026, 2, 3)
+    metrics = parser.as_dict()
+    assert metrics["parsed"] == 2
+    assert metrics["failures"] == 5
+    assert metrics["failed_values"] == ["21-10-25", "13/40/2025", "soon", "None"]
+    assert caplog.text.count("Could not parse date: 21-10-25") == 1
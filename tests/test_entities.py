@@ -0,0 +1,156 @@
+"""Tests for the LinqConnect sensor and calendar entities."""
+from datetime import date, datetime, time, timedelta
+from types import SimpleNamespace
+
+from homeassistant.util import dt as dt_util
+
+from custom_components.linqconnect.calendar import LinqConnectCalendar
+from custom_components.linqconnect.const import CONF_CUTOFF_TIME, SENSOR_LUNCH
+from custom_components.linqconnect.coordinator import LinqConnectDataUpdateCoordinator
+from custom_components.linqconnect.models import Category, MenuDay, Nutrient, Recipe
+from custom_components.linqconnect.sensor import LinqConnectMenuSensor
+
+MEALS = ((Category("Main Entrée", (Recipe("Tacos"),)),),)
+
+
+def _menus(days):
+    """Return menu data with a lunch on each of the given days."""
+    return {
+        "breakfast": {},
+        "lunch": {
+            menu_date: MenuDay(menu_date, theme, "K-8 Lunch", MEALS)
+            for menu_date, theme in days.items()
+        },
+    }
+
+
+def _count_writes(entity):
+    """Replace state writes with a counter."""
+    entity.writes = 0
+
+    def write():
+        entity.writes += 1
+
+    entity.async_write_ha_state = write
+    return entity
+
+
+def test_sensor_skips_writes_for_unchanged_days():
+    """Test the sensor only writes state when its date changes."""
+    today = dt_util.now().date()
+    tomorrow = today + timedelta(days=1)
+    coordinator = LinqConnectDataUpdateCoordinator(None, None, None)
+    # A midnight cutoff always shows tomorrow's menu
+    entry = SimpleNamespace(
+        entry_id="test", title="School", options={CONF_CUTOFF_TIME: time(0, 0)}
+    )
+    sensor = _count_writes(LinqConnectMenuSensor(coordinator, entry, SENSOR_LUNCH))
+
+    coordinator._update_views(_menus({tomorrow: "Tacos"}))
+    sensor._handle_coordinator_update()
+    assert sensor.writes == 1
+
+    # Another day changed
+    coordinator._update_views(_menus({tomorrow: "Tacos", today: "Pizza"}))
+    sensor._handle_coordinator_update()
+    assert sensor.writes == 1
+
+    coordinator._update_views(_menus({tomorrow: "Nachos", today: "Pizza"}))
+    sensor._handle_coordinator_update()
+    assert sensor.writes == 2
+
+
+def test_calendar_skips_writes_after_next_event():
+    """Test the calendar ignores changes after its next event."""
+    today = dt_util.now().date()
+    next_day = today + timedelta(days=2)
+    coordinator = LinqConnectDataUpdateCoordinator(None, None, None)
+    entry = SimpleNamespace(entry_id="test", title="School", options={})
+    calendar = _count_writes(LinqConnectCalendar(coordinator, entry, SENSOR_LUNCH))
+
+    coordinator._update_views(_menus({next_day: "Tacos"}))
+    calendar._handle_coordinator_update()
+    assert calendar.writes == 1
+
+    coordinator._update_views(
+        _menus({next_day: "Tacos", next_day + timedelta(days=7): "Pizza"})
+    )
+    calendar._handle_coordinator_update()
+    assert calendar.writes == 1
+
+    # A new day before the next event becomes the next event
+    coordinator._update_views(
+        _menus(
+            {today: "Soup", next_day: "Tacos", next_day + timedelta(days=7): "Pizza"}
+        )
+    )
+    calendar._handle_coordinator_update()
+    assert calendar.writes == 2
+
+
+def test_sensor_rollover_times():
+    """Test the sensor rolls over at the cutoff and then at midnight."""
+    coordinator = LinqConnectDataUpdateCoordinator(None, None, None)
+    entry = SimpleNamespace(
+        entry_id="test", title="School", options={CONF_CUTOFF_TIME: "10:00"}
+    )
+    sensor = LinqConnectMenuSensor(coordinator, entry, SENSOR_LUNCH)
+
+    default_time_zone = dt_util.DEFAULT_TIME_ZONE
+    dt_util.set_default_time_zone(dt_util.get_time_zone("America/Chicago"))
+    try:
+        morning = datetime(2025, 10, 21, 8, 30, tzinfo=dt_util.DEFAULT_TIME_ZONE)
+        cutoff = morning.replace(hour=10, minute=0)
+        midnight = dt_util.start_of_local_day(date(2025, 10, 22))
+
+        assert sensor._next_rollover(morning) == cutoff
+        assert sensor._get_target_date(morning) == date(2025, 10, 21)
+
+        # The rollover callback receives UTC times
+        assert sensor._next_rollover(dt_util.as_utc(cutoff)) == midnight
+        assert sensor._get_target_date(dt_util.as_utc(cutoff)) == date(2025, 10, 22)
+        late = dt_util.as_utc(morning.replace(hour=23))
+        assert late.date() == date(2025, 10, 22)
+        assert sensor._get_target_date(late) == date(2025, 10, 22)
+        assert sensor._next_rollover(late) == midnight
+    finally:
+        dt_util.set_default_time_zone(default_time_zone)
+
+
+def test_sensor_nutrition_attributes():
+    """Test the sensor shows nutrient totals and writes when they change."""
+    today = dt_util.now().date()
+    tomorrow = today + timedelta(days=1)
+    coordinator = LinqConnectDataUpdateCoordinator(None, None, None)
+    entry = SimpleNamespace(
+        entry_id="test", title="School", options={CONF_CUTOFF_TIME: time(0, 0)}
+    )
+    sensor = _count_writes(LinqConnectMenuSensor(coordinator, entry, SENSOR_LUNCH))
+
+    def menus(breakfast_calories):
+        data = _menus({tomorrow: "Tacos"})
+        tacos = Recipe("Tacos", nutrients=(Nutrient("Calories", 400, "kcal"),))
+        eggs = Recipe("Eggs", nutrients=(Nutrient("Calories", breakfast_calories),))
+        data["lunch"][tomorrow] = MenuDay(
+            tomorrow, "Tacos", "K-8 Lunch", ((Category("Main Entrée", (tacos,)),),)
+        )
+        data["breakfast"][tomorrow] = MenuDay(
+            tomorrow, None, "K-12 Breakfast", ((Category("Main Entrée", (eggs,)),),)
+        )
+        return data
+
+    coordinator._update_views(menus(150))
+    sensor._handle_coordinator_update()
+    assert sensor.extra_state_attributes["nutrition"] == {"Calories": 400.0}
+    assert sensor.extra_state_attributes["nutrition_daily"] == {"Calories": 550.0}
+    assert sensor.writes == 1
+    # Nutrient totals are kept out of the recorder
+    assert {
+        name for name in sensor.extra_state_attributes if name.startswith("nutrition")
+    } == sensor._unrecorded_attributes
+
+    # Only breakfast changed, which changes the lunch sensor's daily total
+    coordinator._update_views(menus(200))
+    sensor._handle_coordinator_update()
+    assert sensor.extra_state_attributes["nutrition_daily"] == {"Calories": 600.0}
+    assert sensor.writes == 2
@@ -0,0 +1,115 @@
+"""Tests for the LinqConnect menu indexes."""
+from datetime import date
+
+from custom_components.linqconnect.indexes import (
+    DateIndex,
+    DietIndex,
+    RecipeIndex,
+    TagTable,
+    build_day_tags,
+)
+from custom_components.linqconnect.models import Category, MenuDay, Recipe
+
+
+def test_date_index_range_queries():
+    """Test range queries return only indexed dates, inclusive of both ends."""
+    index = DateIndex(
+        [date(2025, 10, 24), date(2025, 10, 21), date(2025, 11, 3), date(2026, 1, 5)]
+    )
+
+    assert index.between(date(2025, 10, 21), date(2025, 11, 3)) == [
+        date(2025, 10, 21),
+        date(2025, 10, 24),
+        date(2025, 11, 3),
+    ]
+    assert index.between(date(2025, 10, 25), date(2025, 11, 2)) == []
+    assert index.between(date(2020, 1, 1), date(2030, 1, 1))[-1] == date(2026, 1, 5)
+
+
+def test_date_index_next_date():
+    """Test the next date lookup."""
+    index = DateIndex([date(2025, 10, 21), date(2025, 10, 24)])
+
+    assert index.next_on_or_after(date(2025, 10, 21)) == date(2025, 10, 21)
+    assert index.next_on_or_after(date(2025, 10, 22)) == date(2025, 10, 24)
+    assert index.next_on_or_after(date(2025, 10, 25)) is None
+    assert DateIndex([]).next_on_or_after(date(2025, 10, 21)) is None
+
+
+def test_tag_table_masks():
+    """Test tags get one bit each and unknown tags are ignored when querying."""
+    table = TagTable()
+
+    assert table.add(["milk", "egg"]) == 0b11
+    assert table.add(["egg", "soy"]) == 0b110
+    assert table.mask(["soy", "peanut"]) == 0b100
+    assert "peanut" not in table
+    assert len(table) == 3
+
+
+def test_diet_index_safe_days():
+    """Test safe days need a safe recipe in the category, or in every one."""
+    allergens, restrictions = TagTable(), TagTable()
+    pizza = Recipe("Pizza", allergens=("milk", "wheat"))
+    tacos = Recipe("Tacos", allergens=("wheat",), restrictions=("halal",))
+    salad = Recipe("Salad", restrictions=("halal", "vegetarian"))
+    milk = Recipe("Milk", allergens=("milk",), restrictions=("vegetarian",))
+    days = {
+        date(2025, 10, 21): [Category("Main Entrée", (pizza, tacos))],
+        date(2025, 10, 22): [
+            Category("Main Entrée", (salad,)),
+            Category("Milk", (milk,)),
+        ],
+        date(2025, 10, 23): [Category("Main Entrée", (pizza,))],
+    }
+    index = DietIndex(
+        {
+            menu_date: build_day_tags(categories, allergens, restrictions, {})
+            for menu_date, categories in days.items()
+        }
+    )
+
+    def safe(exclude=(), require=(), category="Main Entrée"):
+        return index.safe_days(
+            days, allergens.mask(exclude), restrictions.mask(require), category
+        )
+
+    assert safe(["milk"]) == {
+        date(2025, 10, 21): ["Tacos"],
+        date(2025, 10, 22): ["Salad"],
+    }
+    assert safe(["milk", "wheat"]) == {date(2025, 10, 22): ["Salad"]}
+    assert safe(require=["vegetarian"]) == {date(2025, 10, 22): ["Salad"]}
+    assert safe(["milk"], category=None) == {}
+    assert safe(["wheat"], category=None) == {date(2025, 10, 22): ["Salad", "Milk"]}
+
+
+def test_recipe_index_find():
+    """Test recipes are found by part of their name or by identifier."""
+    pizza = Recipe("Cheese  Pizza", identifier="r1")
+    pepperoni = Recipe("Pepperoni Pizza", identifier="r2")
+    tacos = Recipe("Tacos", identifier="r3")
+
+    def menu(menu_date, *recipes):
+        return MenuDay(menu_date, None, "K-12", ((Category("Main Entrée", recipes),),))
+
+    index = RecipeIndex(
+        {
+            date(2025, 10, 23): menu(date(2025, 10, 23), pepperoni),
+            date(2025, 10, 21): menu(date(2025, 10, 21), pizza, tacos),
+            date(2025, 10, 22): menu(date(2025, 10, 22), tacos),
+        }
+    )
+    start, end = date(2025, 10, 1), date(2025, 10, 31)
+
+    assert index.find("PIZZA", start, end) == {
+        date(2025, 10, 21): ["Cheese  Pizza"],
+        date(2025, 10, 23): ["Pepperoni Pizza"],
+    }
+    assert index.find("cheese pizza", date(2025, 10, 22), end) == {}
+    assert index.find("r3", start, end) == {
+        date(2025, 10, 21): ["Tacos"],
+        date(2025, 10, 22): ["Tacos"],
+    }
+    assert index.find(" ", start, end) == {}
+    assert len(index) == 3
@@ -0,0 +1,166 @@
+"""Tests against the local mock LinqConnect server."""
+import asyncio
+from datetime import date, timedelta
+
+import aiohttp
+import pytest
+
+from custom_components.linqconnect.api import (
+    ApiClientError,
+    CircuitBreaker,
+    CircuitOpenError,
+    LinqConnectApiClient,
+)
+from custom_components.linqconnect.coordinator import LinqConnectDataUpdateCoordinator
+
+from .menu_generator import generate_family_menu, parse_menu_date
+from .mock_server import MOCK_BUILDING_ID, MOCK_DISTRICT_ID, MockLinqConnectServer
+
+# A Monday, so school days are easy to count
+START = date(2025, 10, 20)
+
+
+def _menu_dates(data):
+    """Return every date in a FamilyMenu payload."""
+    return {
+        parse_menu_date(day["Date"])
+        for session in data["FamilyMenuSessions"]
+        for menu_plan in session["MenuPlans"]
+        for day in menu_plan["Days"]
+    }
+
+
+def test_generated_menu_processes():
+    """Test a generated district has the requested size and processes."""
+    payload = generate_family_menu(START, school_days=40, plans_per_session=3)
+    coordinator = LinqConnectDataUpdateCoordinator(None, None, None)
+
+    data = coordinator._process_menu_data(payload)
+
+    assert len(coordinator.available_menu_plans) == 9
+    assert len(data["breakfast"]) == len(data["lunch"]) == 40
+    assert all(menu_date.weekday() < 5 for menu_date in data["lunch"])
+    assert generate_family_menu(START) == generate_family_menu(START)
+
+
+@pytest.mark.asyncio
+async def test_client_gets_requested_window():
+    """Test the mock server filters menus to the requested dates."""
+    payload = generate_family_menu(START, school_days=40)
+    async with MockLinqConnectServer(payload) as server:
+        async with aiohttp.ClientSession() as session:
+            client = LinqConnectApiClient(
+                MOCK_DISTRICT_ID, MOCK_BUILDING_ID, session, api_url=server.url
+            )
+
+            data = await client.async_get_menu(START, START + timedelta(days=6))
+
+            expected = {START + timedelta(days=day) for day in range(5)}
+            assert _menu_dates(data) == expected
+            assert server.requests[0]["startDate"] == "10-20-2025"
+
+
+@pytest.mark.asyncio
+async def test_conditional_request_not_modified():
+    """Test a repeated fetch with the previous response gets a 304."""
+    async with MockLinqConnectServer() as server:
+        async with aiohttp.ClientSession() as session:
+            client = LinqConnectApiClient(
+                MOCK_DISTRICT_ID, MOCK_BUILDING_ID, session, api_url=server.url
+            )
+
+            previous = await client.async_fetch_menu(START, START)
+            response = await client.async_fetch_menu(START, START, previous=previous)
+
+            assert previous.etag and not previous.not_modified
+            assert response.not_modified
+            assert response.sha256 == previous.sha256
+
+
+@pytest.mark.asyncio
+async def test_client_retries_transient_errors():
+    """Test transient failures are retried and client errors are not."""
+    async with MockLinqConnectServer(failures=[503, 500]) as server:
+        async with aiohttp.ClientSession() as session:
+            client = LinqConnectApiClient(
+                MOCK_DISTRICT_ID,
+                MOCK_BUILDING_ID,
+                session,
+                api_url=server.url,
+                backoff_base=0,
+            )
+
+            assert "FamilyMenuSessions" in await client.async_get_menu()
+            assert len(server.requests) == 3
+
+            unknown = LinqConnectApiClient(
+                "other", "school", session, api_url=server.url, backoff_base=0
+            )
+            with pytest.raises(ApiClientError):
+                await unknown.async_get_menu()
+            assert len(server.requests) == 4
+
+
+@pytest.mark.asyncio
+async def test_circuit_breaker_stops_requests():
+    """Test repeated failures open the circuit until the reset timeout."""
+    async with MockLinqConnectServer(failures=[503] * 4) as server:
+        async with aiohttp.ClientSession() as session:
+            breaker = CircuitBreaker(failure_threshold=2, reset_timeout=60)
+            client = LinqConnectApiClient(
+                MOCK_DISTRICT_ID,
+                MOCK_BUILDING_ID,
+                session,
+                api_url=server.url,
+                max_retries=1,
+                backoff_base=0,
+                circuit_breaker=breaker,
+            )
+
+            for _ in range(2):
+                with pytest.raises(ApiClientError):
+                    await client.async_get_menu()
+            assert client.circuit_open
+
+            with pytest.raises(CircuitOpenError):
+                await client.async_get_menu()
+            assert len(server.requests) == 4
+
+            # Let a single trial request through, which closes the circuit
+            breaker._reset_timeout = 0
+            server.latency = 0.05
+            results = await asyncio.gather(
+                *(client.async_get_menu() for _ in range(3)),
+                return_exceptions=True,
+            )
+            assert len(server.requests) == 5
+            assert "FamilyMenuSessions" in results[0]
+            assert all(isinstance(result, CircuitOpenError) for result in results[1:])
+            assert not client.circuit_open
+
+
+@pytest.mark.asyncio
+async def test_coordinator_update_against_server(executor_hass):
+    """Test a coordinator refresh fetches and processes the upcoming menus."""
+    today = date.today()
+    payload = generate_family_menu(today, school_days=60, plans_per_session=1)
+    async with MockLinqConnectServer(payload, latency=0.01) as server:
+        async with aiohttp.ClientSession() as session:
+            client = LinqConnectApiClient(
+                MOCK_DISTRICT_ID, MOCK_BUILDING_ID, session, api_url=server.url
+            )
+            coordinator = LinqConnectDataUpdateCoordinator(
+                executor_hass, client, None
+            )
+
+            data = await coordinator._async_update_data()
+
+    assert len(server.requests) == 1
+    assert data["lunch"]
+    assert set(coordinator.update_timings) == {
+        "total_ms",
+        "fetch_ms",
+        "executor_ms",
+        "event_loop_ms",
+    }
+    assert max(data["lunch"]) <= today + timedelta(days=30)
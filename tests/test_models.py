@@ -0,0 +1,64 @@
+"""Tests for the LinqConnect menu models."""
+from datetime import date
+
+from custom_components.linqconnect.models import (
+    Category,
+    MenuDay,
+    Recipe,
+    render_menu_day,
+)
+
+MENU = MenuDay(
+    date=date(2025, 10, 21),
+    theme="Taco Tuesday",
+    menu_plan="K-8 Lunch",
+    meals=(
+        (
+            Category("Main Entrée", (Recipe("Beef Taco"), Recipe("Bean Burrito"))),
+            Category("Fruit", (Recipe("Apple"),)),
+        ),
+        (Category("Fruit", (Recipe("Pear"),)),),
+    ),
+)
+
+
+def test_render_menu_day_attributes():
+    """Test categories from every meal are merged into sensor attributes."""
+    view = render_menu_day(MENU, "lunch", "Lunch", ["<br>"])
+
+    assert view.state == "Taco Tuesday"
+    assert view.summary == "🍔 Taco Tuesday"
+    assert view.attributes == {
+        "menu_plan": "K-8 Lunch",
+        "theme_day": "Taco Tuesday",
+        "main_entree": ["Beef Taco", "Bean Burrito"],
+        "main_entree_formatted": "Beef Taco, Bean Burrito",
+        "fruit": ["Apple", "Pear"],
+    }
+
+
+def test_render_menu_day_descriptions():
+    """Test descriptions are precomputed and other line breaks still work."""
+    view = render_menu_day(MENU, "breakfast", "Breakfast", ["<br>"])
+
+    assert view.summary == "🥐 Taco Tuesday"
+    assert view.descriptions["<br>"] == (
+        "Main Entrée:<br>  • Beef Taco<br>  • Bean Burrito<br>"
+        "<br>Fruit:<br>  • Apple<br>  • Pear<br>"
+    )
+    assert view.description("\n") == view.descriptions["<br>"].replace("<br>", "\n")
+
+
+def test_render_menu_day_without_theme():
+    """Test days without a theme are summarized with the session name."""
+    menu = MenuDay(
+        date=date(2025, 10, 21),
+        theme=None,
+        menu_plan="Pre-K",
+        meals=((Category("Snack", (Recipe("Crackers"),)),),),
+    )
+
+    view = render_menu_day(menu, "pre_k_snack", "Pre-K Snack", ["<br>"])
+
+    assert view.state == "Menu available"
+    assert view.summary.endswith(" Pre-K Snack")
@@ -0,0 +1,78 @@
+"""Tests for the LinqConnect nutrient totals."""
+from datetime import date, timedelta
+
+from custom_components.linqconnect.models import Category, MenuDay, Nutrient, Recipe
+from custom_components.linqconnect.nutrition import NutrientTable, build_nutrition
+
+START = date(2025, 10, 20)
+
+
+def _recipe(name, calories, sodium=None, sodium_unit="mg"):
+    """Return a recipe with calories and, optionally, sodium."""
+    nutrients = [Nutrient("Calories", calories, "kcal")]
+    if sodium is not None:
+        nutrients.append(Nutrient("Sodium", sodium, sodium_unit))
+    return Recipe(name, nutrients=tuple(nutrients))
+
+
+def _menu(menu_date, *categories):
+    """Return a one meal menu of the given categories."""
+    return MenuDay(menu_date, None, "K-8 Lunch", (tuple(categories),))
+
+
+def test_meal_totals_average_alternatives():
+    """Test each category adds one average serving, in the first seen unit."""
+    table = NutrientTable()
+    menu = _menu(
+        START,
+        Category("Main Entrée", (_recipe("Pizza", 300, 600), _recipe("Salad", 100))),
+        Category("Milk", (_recipe("Milk", 100, 0.1, "g"),)),
+        # A second plan's entrées are more alternatives, not another serving
+        Category("Main Entrée", (_recipe("Tacos", 200, 400),)),
+    )
+
+    assert table.attributes(table.meal_totals(menu)) == {
+        "Calories": 300.0,
+        "Sodium": 600.0,
+    }
+    assert table.units == {"Calories": "kcal", "Sodium": "mg"}
+
+
+def test_build_nutrition_daily_and_rolling_totals():
+    """Test daily totals span meal types and rolling totals span menu days."""
+    table = NutrientTable()
+    lunch = {
+        START + timedelta(days=offset): _menu(
+            START + timedelta(days=offset),
+            Category("Main Entrée", (_recipe(f"Lunch {offset}", 100 * (offset + 1)),)),
+        )
+        for offset in range(7)
+    }
+    breakfast = {
+        START: _menu(START, Category("Main Entrée", (_recipe("Waffles", 50),)))
+    }
+    meal_totals = {"lunch": {START: table.meal_totals(lunch[START])}}
+
+    nutrition = build_nutrition(
+        table, {"breakfast": breakfast, "lunch": lunch}, meal_totals
+    )
+
+    first = nutrition["lunch"][START]
+    assert first["nutrition"] == {"Calories": 100.0}
+    assert first["nutrition_daily"] == {"Calories": 150.0}
+    assert first["nutrition_5_day"] == {"Calories": 1500.0}
+    assert nutrition["lunch"][START + timedelta(days=2)]["nutrition_5_day"] == {
+        "Calories": 2500.0
+    }
+    # Fewer than five days left
+    assert nutrition["lunch"][START + timedelta(days=6)]["nutrition_5_day"] == {
+        "Calories": 700.0
+    }
+    assert set(meal_totals["lunch"]) == set(lunch)
+
+
+def test_build_nutrition_without_nutrients():
+    """Test menus without nutrients get no nutrition attributes."""
+    menu = _menu(START, Category("Main Entrée", (Recipe("Pizza"),)))
+
+    assert build_nutrition(NutrientTable(), {"lunch": {START: menu}}, {}) == {}
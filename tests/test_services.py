@@ -0,0 +1,186 @@
+"""Tests for the LinqConnect services."""
+from datetime import date, datetime
+from types import SimpleNamespace
+
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.core import ServiceCall
+from homeassistant.exceptions import ServiceValidationError
+from homeassistant.util import dt as dt_util
+import pytest
+
+from custom_components.linqconnect.const import DOMAIN, SERVICE_GET_MENU
+from custom_components.linqconnect.coordinator import LinqConnectDataUpdateCoordinator
+from custom_components.linqconnect.models import Category, MenuDay, Recipe
+from custom_components.linqconnect.services import (
+    _menu_response,
+    async_setup_services,
+)
+
+from .menu_generator import generate_family_menu
+
+# A Monday
+START = date(2025, 10, 20)
+
+
+class FakeServices:
+    """Service registry recording handlers and their schemas."""
+
+    def __init__(self):
+        self.handlers = {}
+
+    def async_register(
+        self, domain, service, handler, schema=None, supports_response=None
+    ):
+        self.handlers[service] = (handler, schema)
+
+    async def async_call(self, service, **data):
+        handler, schema = self.handlers[service]
+        return await handler(ServiceCall(DOMAIN, service, schema(data)))
+
+
+class FakeConfigEntries:
+    """Config entries lookup over a fixed set of entries."""
+
+    def __init__(self, *entries):
+        self._entries = {entry.entry_id: entry for entry in entries}
+
+    def async_get_entry(self, entry_id):
+        return self._entries.get(entry_id)
+
+    def async_entries(self, domain):
+        return [entry for entry in self._entries.values() if entry.domain == domain]
+
+
+@pytest.fixture
+def services():
+    """Register the services on a school with two lunch plans."""
+    coordinator = LinqConnectDataUpdateCoordinator(None, None, None)
+    coordinator.data = coordinator._process_menu_data(
+        generate_family_menu(START, school_days=10, plans_per_session=2)
+    )
+    coordinator._update_views(coordinator.data)
+    entry = SimpleNamespace(
+        entry_id="school",
+        title="School",
+        domain=DOMAIN,
+        state=ConfigEntryState.LOADED,
+    )
+    hass = SimpleNamespace(
+        services=FakeServices(),
+        config_entries=FakeConfigEntries(entry),
+        data={DOMAIN: {entry.entry_id: coordinator}},
+    )
+    async_setup_services(hass)
+    return hass.services, coordinator
+
+
+def test_get_menu_response():
+    """Test menu days are returned with matching categories combined."""
+    pizza = Recipe("Pizza", "1 slice", "r1", allergens=("milk",))
+    apple = Recipe("Apple")
+    menu = MenuDay(
+        date(2025, 10, 21),
+        "Pizza Day",
+        "K-12",
+        (
+            (Category("Main Entrée", (pizza,)), Category("Fruit", (apple,))),
+            (Category("Main Entrée", (Recipe("Salad"),)),),
+        ),
+        ("K-12", "Pre-K"),
+    )
+
+    assert _menu_response(menu, "lunch", None, ["Main Entrée"]) == {
+        "date": "2025-10-21",
+        "meal_type": "lunch",
+        "menu_plans": ["K-12", "Pre-K"],
+        "theme": "Pizza Day",
+        "categories": {
+            "Main Entrée": [
+                {
+                    "name": "Pizza",
+                    "serving_size": "1 slice",
+                    "identifier": "r1",
+                    "allergens": ["milk"],
+                },
+                {"name": "Salad", "serving_size": None, "identifier": None},
+            ]
+        },
+    }
+    assert _menu_response(menu, "lunch", ["Pre-K"], None)["categories"] == {
+        "Main Entrée": [{"name": "Salad", "serving_size": None, "identifier": None}]
+    }
+    assert list(_menu_response(menu, "lunch", None, None)["categories"]) == [
+        "Main Entrée",
+        "Fruit",
+    ]
+    assert _menu_response(menu, "lunch", None, ["Milk"]) is None
+
+
+def test_get_menus_reads_processed_data():
+    """Test menus for a range come from the processed data in date order."""
+    coordinator = LinqConnectDataUpdateCoordinator(None, None, None)
+    coordinator.data = coordinator._process_menu_data(
+        generate_family_menu(date(2025, 10, 20), school_days=10, plans_per_session=1)
+    )
+    coordinator._update_views(coordinator.data)
+
+    menus = coordinator.get_menus("lunch", date(2025, 10, 21), date(2025, 10, 27))
+
+    assert [menu.date for menu in menus] == [
+        date(2025, 10, day) for day in (21, 22, 23, 24, 27)
+    ]
+    assert menus[0] is coordinator.data["lunch"][date(2025, 10, 21)]
+    assert coordinator.get_menus("dinner", date(2025, 10, 21), date(2025, 10, 27)) == []
+
+
+@pytest.mark.asyncio
+async def test_get_menu_service_filters(services):
+    """Test the service filters by meal type, plan, category and dates."""
+    services, coordinator = services
+
+    response = await services.async_call(
+        SERVICE_GET_MENU,
+        meal_type="lunch",
+        menu_plan="Lunch Plan 1",
+        category="Main Entrée",
+        start_date="2025-10-21",
+        end_date="2025-10-23",
+    )
+
+    days = response["school"]["days"]
+    assert response["school"]["name"] == "School"
+    assert [day["date"] for day in days] == ["2025-10-21", "2025-10-22", "2025-10-23"]
+    for day in days:
+        menu = coordinator.data["lunch"][date.fromisoformat(day["date"])]
+        assert menu.menu_plans == ["Lunch Plan 0", "Lunch Plan 1"]
+        assert day["menu_plans"] == ["Lunch Plan 1"]
+        assert list(day["categories"]) == ["Main Entrée"]
+        assert day["categories"]["Main Entrée"] == [
+            recipe.as_dict()
+            for category in menu.iter_categories(["Lunch Plan 1"])
+            if category.name == "Main Entrée"
+            for recipe in category.recipes
+        ]
+
+    response = await services.async_call(
+        SERVICE_GET_MENU, menu_plan="Lunch Plan 0", start_date="2025-10-21"
+    )
+    assert [day["meal_type"] for day in response["school"]["days"]] == ["lunch"]
+
+
+@pytest.mark.asyncio
+async def test_get_menu_service_defaults_to_today(services, monkeypatch):
+    """Test the service returns every meal type for today by default."""
+    services, coordinator = services
+    monkeypatch.setattr(
+        dt_util, "now", lambda: datetime(2025, 10, 22, 8, tzinfo=dt_util.UTC)
+    )
+
+    days = (await services.async_call(SERVICE_GET_MENU))["school"]["days"]
+
+    assert {day["date"] for day in days} == {"2025-10-22"}
+    assert [day["meal_type"] for day in days] == coordinator.meal_types
+    assert days[1]["menu_plans"] == ["Lunch Plan 0", "Lunch Plan 1"]
+
+    with pytest.raises(ServiceValidationError):
+        await services.async_call(SERVICE_GET_MENU, config_entry_id="unknown")
@@ -0,0 +1,86 @@
+"""Tests for the LinqConnect menu cache."""
+from datetime import date
+
+import pytest
+
+from custom_components.linqconnect.models import (
+    Category,
+    MenuDay,
+    Nutrient,
+    Recipe,
+    ServingSession,
+)
+from custom_components.linqconnect.store import (
+    LinqConnectMenuStore,
+    build_cache_key,
+    deserialize_menu_data,
+    deserialize_sessions,
+    serialize_menu_data,
+    serialize_sessions,
+)
+
+
+def test_menu_data_round_trip():
+    """Test processed menu data survives serialization."""
+    data = {
+        "breakfast": {
+            date(2025, 10, 21): MenuDay(
+                date=date(2025, 10, 21),
+                theme="Week 1 Tuesday",
+                menu_plan="K-12 Breakfast",
+                meals=(
+                    (
+                        Category(
+                            "Main Entrée",
+                            (
+                                Recipe(
+                                    "Pancakes",
+                                    "3 each",
+                                    "R-1",
+                                    (
+                                        Nutrient("Calories", 210, "kcal"),
+                                        Nutrient("Iron", 1.5),
+                                    ),
+                                    ("a1",),
+                                    ("r1",),
+                                ),
+                            ),
+                        ),
+                    ),
+                ),
+                meal_plans=("K-12 Breakfast",),
+            )
+        },
+        "lunch": {},
+    }
+
+    stored = serialize_menu_data(data)
+
+    assert list(stored["breakfast"]) == ["2025-10-21"]
+    assert deserialize_menu_data(stored) == data
+
+
+def test_sessions_round_trip():
+    """Test serving sessions survive serialization."""
+    sessions = {
+        "lunch": ServingSession("lunch", "School Lunch", "s1"),
+        "snack": ServingSession("snack", "Snack"),
+    }
+
+    assert deserialize_sessions(serialize_sessions(sessions)) == sessions
+
+
+@pytest.mark.asyncio
+async def test_version_1_cache_is_refetched():
+    """Test caches written without serving sessions are dropped on migration."""
+    store = LinqConnectMenuStore(None, "entry", "key")
+
+    assert await store._store._async_migrate_func(1, 1, {"key": "key"}) == {}
+
+
+def test_cache_key_ignores_plan_order():
+    """Test the cache key does not depend on plan selection order."""
+    assert build_cache_key("d", "b", ["K-8 Lunch", "K-12 Breakfast"]) == (
+        build_cache_key("d", "b", ["K-12 Breakfast", "K-8 Lunch"])
+    )
+    assert build_cache_key("d", "b", ["K-8 Lunch"]) != build_cache_key("d", "b", [])